@@ -0,0 +1,101 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.fire_labeling import label_fire_events
+
+# 📁 Config
+TIME_TOLERANCE_HOURS = 1
+SPATIAL_TOLERANCE_DEGREES = 0.25
+SEED = 42
+
+# (hours, n_lat, n_lon, n_events)
+SCALES = [
+    (24 * 7, 21, 15, 200),
+    (24 * 31, 21, 15, 1_000),
+    (24 * 90, 21, 15, 5_000),
+]
+LOOP_MAX_EVENTS = 1_000  # The per-row loop is too slow beyond this
+
+
+def synthetic_grid(hours, n_lat, n_lon):
+    """Builds an hourly t2m cube on a 0.25° Portugal-like grid (descending latitudes, like ERA5)."""
+    times = pd.date_range("2023-01-01", periods=hours, freq="h")
+    lats = 42.0 - 0.25 * np.arange(n_lat)
+    lons = -9.6 + 0.25 * np.arange(n_lon)
+    return xr.DataArray(
+        np.zeros((hours, n_lat, n_lon), dtype=np.float32),
+        coords={"time": times, "latitude": lats, "longitude": lons},
+        dims=("time", "latitude", "longitude"),
+        name="t2m",
+    )
+
+
+def synthetic_fires(grid, n_events, rng):
+    times = grid["time"].values
+    span = (times[-1] - times[0]) / np.timedelta64(1, "s")
+    offsets = rng.uniform(0, span, n_events).astype("timedelta64[s]")
+    return pd.DataFrame({
+        "datetime": pd.to_datetime(times[0] + offsets),
+        "latitude": rng.uniform(grid.latitude.min().item(), grid.latitude.max().item(), n_events),
+        "longitude": rng.uniform(grid.longitude.min().item(), grid.longitude.max().item(), n_events),
+    })
+
+
+def label_fire_events_loop(template, fire_df):
+    """The original per-row labeling loop from label_fire_events_from_modis.py."""
+    fire_label = xr.DataArray(
+        np.zeros(template.shape, dtype=bool),
+        coords=template.coords,
+        dims=template.dims,
+        name="fire_label",
+    )
+    for _, row in fire_df.iterrows():
+        fire_time = pd.to_datetime(row["datetime"]).round("h")
+        time_mask = np.abs((template["time"].values - np.datetime64(fire_time)) / np.timedelta64(1, "h")) <= TIME_TOLERANCE_HOURS
+        if not time_mask.any():
+            continue
+        lat_mask = np.abs(template["latitude"] - row["latitude"]) <= SPATIAL_TOLERANCE_DEGREES
+        lon_mask = np.abs(template["longitude"] - row["longitude"]) <= SPATIAL_TOLERANCE_DEGREES
+        fire_label.loc[dict(
+            time=template["time"].values[time_mask],
+            latitude=template["latitude"].values[lat_mask],
+            longitude=template["longitude"].values[lon_mask]
+        )] = True
+    return fire_label
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(SEED)
+    print(f"{'grid (t×lat×lon)':>20} {'events':>8} {'loop s':>10} {'batched s':>10} {'speedup':>8}")
+
+    for hours, n_lat, n_lon, n_events in SCALES:
+        grid = synthetic_grid(hours, n_lat, n_lon)
+        fires = synthetic_fires(grid, n_events, rng)
+
+        batched, batched_s = timed(
+            label_fire_events, grid, fires, TIME_TOLERANCE_HOURS, SPATIAL_TOLERANCE_DEGREES
+        )
+
+        if n_events <= LOOP_MAX_EVENTS:
+            looped, loop_s = timed(label_fire_events_loop, grid, fires)
+            assert np.array_equal(looped.values, batched.values), "❌ Batched labels differ from the loop"
+            loop_col, speedup_col = f"{loop_s:10.3f}", f"{loop_s / batched_s:7.0f}x"
+        else:
+            loop_col, speedup_col = f"{'skipped':>10}", f"{'-':>8}"
+
+        shape = f"{hours}×{n_lat}×{n_lon}"
+        print(f"{shape:>20} {n_events:>8} {loop_col} {batched_s:10.3f} {speedup_col}")
+
+    print("✅ Batched labels match the per-row loop.")
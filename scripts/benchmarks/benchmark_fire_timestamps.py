@@ -0,0 +1,60 @@
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.fire_timestamps import fire_datetimes
+
+# 📁 Config
+SEED = 42
+SIZES = [10_000, 100_000, 1_000_000]
+APPLY_MAX_ROWS = 10_000  # The row-wise apply path is too slow beyond this
+
+
+def synthetic_detections(n_rows, rng):
+    """acq_date/acq_time columns as they come out of a FIRMS CSV."""
+    stamps = pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24 * 60, n_rows), unit="min")
+    return pd.DataFrame({
+        "acq_date": stamps.strftime("%Y-%m-%d"),
+        "acq_time": stamps.hour * 100 + stamps.minute,
+    })
+
+
+def parse_datetime(row):
+    """The original row-wise parser from prepare_fire_data.py."""
+    time_str = f"{int(row['acq_time']):04d}"
+    return pd.to_datetime(f"{row['acq_date']} {time_str[:2]}:{time_str[2:]}", utc=True)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(SEED)
+    print(f"{'rows':>10} {'apply s':>10} {'vectorized s':>13} {'speedup':>8}")
+
+    for n_rows in SIZES:
+        df = synthetic_detections(n_rows, rng)
+        vectorized, vectorized_s = timed(fire_datetimes, df["acq_date"], df["acq_time"])
+
+        if n_rows <= APPLY_MAX_ROWS:
+            applied, apply_s = timed(df.apply, parse_datetime, axis=1)
+            assert applied.equals(vectorized), "❌ Vectorized timestamps differ from the apply path"
+            apply_col, speedup_col = f"{apply_s:10.3f}", f"{apply_s / vectorized_s:7.0f}x"
+        else:
+            apply_col, speedup_col = f"{'skipped':>10}", f"{'-':>8}"
+
+        print(f"{n_rows:>10} {apply_col} {vectorized_s:13.3f} {speedup_col}")
+
+    print("✅ Vectorized timestamps match the apply path.")
+
+    # A chunk with every acq_date/acq_time missing gives all-NaT instead of failing
+    missing = fire_datetimes(pd.Series([None] * 3, dtype=object), pd.Series([np.nan] * 3))
+    assert missing.isna().all() and len(missing) == 3, "❌ All-missing timestamps should be NaT"
+    print("✅ All-missing acq_date/acq_time parse to NaT.")
@@ -0,0 +1,77 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers import flat_forest
+from helpers.flat_forest import FlatForest
+
+# 📁 Config: the forest train_random_forest.py fits by default, and an unbounded one as the search may pick
+SEED = 42
+N_FEATURES = 20
+TRAIN_ROWS = 20_000
+FORESTS = {
+    "max_depth=12": {"n_estimators": 200, "max_depth": 12, "min_samples_leaf": 5, "class_weight": "balanced"},
+    "max_depth=None": {"n_estimators": 200, "max_depth": None, "min_samples_leaf": 5, "class_weight": "balanced"},
+}
+BATCH_SIZES = [1, 100, 10_000, 500_000]  # One service query up to grid-wide blocks
+N_JOBS = -1
+
+
+def best_of(func, repeats=3):
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - start)
+    return result, min(seconds)
+
+
+def directory_bytes(path):
+    return sum(f.stat().st_size for f in Path(path).iterdir())
+
+
+def benchmark_forest(name, params, rng):
+    X = rng.normal(size=(TRAIN_ROWS, N_FEATURES)).astype(np.float32)
+    y = (X[:, 0] + X[:, 1] ** 2 + rng.normal(0, 1, TRAIN_ROWS) > 1).astype(np.int8)
+    print(f"\n🌳 Fitting a {params['n_estimators']}-tree forest ({name}) on {TRAIN_ROWS} rows...")
+    model = RandomForestClassifier(**params, random_state=SEED, n_jobs=N_JOBS).fit(X, y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_path = Path(tmp) / "random_forest_fire_model.pkl"
+        flat_path = Path(tmp) / "random_forest_fire_model.forest"
+        joblib.dump(model, pickle_path)
+        FlatForest.from_sklearn(model).save(flat_path)
+
+        pickled, pickle_load_s = best_of(lambda: joblib.load(pickle_path))
+        flat, flat_load_s = best_of(lambda: FlatForest.load(flat_path))
+        print(f"\n{'format':>10} {'size MB':>9} {'load s':>9}")
+        print(f"{'pickle':>10} {os.path.getsize(pickle_path) / 1e6:9.1f} {pickle_load_s:9.4f}")
+        print(f"{'flat':>10} {directory_bytes(flat_path) / 1e6:9.1f} {flat_load_s:9.4f}")
+
+        pickled.n_jobs = flat.n_jobs = N_JOBS
+        flat.predict_proba(X[:1])  # Loads (or compiles) the numba kernel outside the timings
+        print(f"\n{'rows':>10} {'sklearn s':>10} {'flat s':>10} {'sklearn µs/row':>15} {'flat µs/row':>12} "
+              f"{'speedup':>8} {'max |Δp|':>10}")
+        for n_rows in BATCH_SIZES:
+            X_test = rng.normal(size=(n_rows, N_FEATURES)).astype(np.float32)
+            expected, sklearn_s = best_of(lambda: pickled.predict_proba(X_test))
+            actual, flat_s = best_of(lambda: flat.predict_proba(X_test))
+            max_diff = np.abs(actual - expected).max()
+            assert max_diff < 1e-9, f"❌ Flat forest probabilities differ from sklearn by {max_diff}"
+            print(f"{n_rows:>10} {sklearn_s:10.4f} {flat_s:10.4f} {1e6 * sklearn_s / n_rows:15.2f} "
+                  f"{1e6 * flat_s / n_rows:12.2f} {sklearn_s / flat_s:7.1f}x {max_diff:10.1e}")
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(SEED)
+    print(f"🧮 Flat forest walk: {'compiled (numba)' if flat_forest.numba is not None else 'NumPy'}")
+    for name, params in FORESTS.items():
+        benchmark_forest(name, params, rng)
+    print("\n✅ Flat forest probabilities match sklearn.")
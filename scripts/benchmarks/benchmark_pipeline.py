@@ -0,0 +1,161 @@
+import csv
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import folium
+import numpy as np
+import xarray as xr
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.augmentation import augment
+from helpers.era5_features import iter_feature_blocks
+from helpers.fire_labeling import label_fire_events
+from helpers.fire_map import add_cell_heatmap, add_fire_markers
+from helpers.firms_ingest import filter_chunk
+from helpers.labeled_cells import ReservoirSample, feature_columns, iter_labeled_blocks
+from helpers.synthetic_data import PORTUGAL_BBOX, synthetic_era5, synthetic_fire_events, synthetic_firms
+from helpers.weather_join import join_weather
+
+# 📁 Config
+SEED = 42
+REPEATS = int(os.environ.get("BENCH_REPEATS", "3"))  # Best of N per case
+HISTORY_PATH = Path("outputs/benchmarks/history.csv")
+
+# scale -> (hours, n_lat, n_lon, fire events, FIRMS rows, training rows per class)
+SCALES = {
+    "small": (24 * 31, 21, 15, 1_000, 20_000, 2_500),
+    "medium": (24 * 91, 21, 15, 5_000, 200_000, 10_000),
+    "large": (24 * 365, 21, 15, 20_000, 1_000_000, 50_000),
+}
+RUN_SCALES = os.environ.get("BENCH_SCALES", "small,medium").split(",")
+RUN_CASES = os.environ.get("BENCH_CASES")  # e.g. "labeling,joining"; all cases by default
+
+TIME_BLOCK_HOURS = 24 * 7
+FEATURE_BLOCK_HOURS = 24 * 31
+FIELDS = ["timestamp", "commit", "case", "scale", "rows", "best_s", "mean_s", "rows_per_s"]
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def build_inputs(hours, n_lat, n_lon, n_events, firms_rows, sample_target):
+    """Synthetic cube, features, labeled cube, fire events and FIRMS rows for one scale."""
+    raw = synthetic_era5(hours, n_lat, n_lon, seed=SEED, time_dim="time")
+    fires = synthetic_fire_events(n_events, raw["time"].values, seed=SEED)
+    features = xr.concat(list(iter_feature_blocks(raw, FEATURE_BLOCK_HOURS)), dim="time")
+    labeled = features.assign(fire_label=label_fire_events(raw["t2m"], fires).astype(np.int8))
+    return {
+        "raw": raw,
+        "fires": fires,
+        "labeled": labeled,
+        "firms": synthetic_firms(firms_rows, seed=SEED),
+        "sample_target": sample_target,
+    }
+
+
+def preprocess(labeled, sample_target):
+    """The streaming core of preprocess_wildfire_data.py: scaler, sampling and augmentation."""
+    feature_cols = feature_columns(labeled)
+    scaler = StandardScaler()
+    fire_blocks = []
+    no_fire = ReservoirSample(sample_target, len(feature_cols), seed=SEED)
+    for X, y in iter_labeled_blocks(labeled, feature_cols, TIME_BLOCK_HOURS):
+        scaler.partial_fit(X)
+        fire_blocks.append(X[y == 1])
+        no_fire.add(X[y == 0])
+    fire_rows = np.concatenate(fire_blocks)
+    X, y = augment(
+        np.concatenate([fire_rows, no_fire.sample()]),
+        np.concatenate([np.ones(len(fire_rows), np.int8), np.zeros(len(no_fire.sample()), np.int8)]),
+        fire_target=sample_target, no_fire_target=sample_target, seed=SEED,
+    )
+    return scaler.transform(X), y
+
+
+def render_map(firms):
+    m = folium.Map(location=[39.5, -8.0], zoom_start=6)
+    add_fire_markers(m, firms, name="Fire Points (clustered)")
+    add_cell_heatmap(m, firms, name="Fire Heatmap", radius=15, blur=10)
+    return m.get_root().render()
+
+
+def cases(inputs):
+    """(name, rows processed, callable) per pipeline step."""
+    raw, fires, labeled, firms = inputs["raw"], inputs["fires"], inputs["labeled"], inputs["firms"]
+    n_cells = raw.sizes["time"] * raw.sizes["latitude"] * raw.sizes["longitude"]
+    target = inputs["sample_target"]
+    X, y = preprocess(labeled, target)
+    yield "firms_filter", len(firms), lambda: filter_chunk(firms, PORTUGAL_BBOX)
+    yield "features", n_cells, lambda: [block for block in iter_feature_blocks(raw, FEATURE_BLOCK_HOURS)]
+    yield "labeling", n_cells, lambda: label_fire_events(raw["t2m"], fires)
+    yield "joining", len(fires), lambda: join_weather(
+        raw, fires["latitude"], fires["longitude"], fires["datetime"].dt.floor("h"), ["t2m", "u10", "v10"]
+    )
+    yield "preprocessing", n_cells, lambda: preprocess(labeled, target)
+    yield "train_random_forest", len(X), lambda: RandomForestClassifier(
+        n_estimators=100, max_depth=12, class_weight="balanced", random_state=SEED, n_jobs=-1
+    ).fit(X, y)
+    yield "train_hist_gradient_boosting", len(X), lambda: HistGradientBoostingClassifier(
+        max_iter=200, class_weight="balanced", random_state=SEED
+    ).fit(X, y)
+    yield "map_rendering", len(firms), lambda: render_map(firms)
+
+
+def timed(func):
+    seconds = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds), float(np.mean(seconds))
+
+
+def previous_best():
+    """Best time per (case, scale) from the last recorded run, for the delta column."""
+    if not HISTORY_PATH.exists():
+        return {}
+    with open(HISTORY_PATH, newline="") as f:
+        return {(row["case"], row["scale"]): float(row["best_s"]) for row in csv.DictReader(f)}
+
+
+if __name__ == "__main__":
+    previous = previous_best()
+    stamp, commit = datetime.now().isoformat(timespec="seconds"), git_commit()
+    results = []
+
+    print(f"{'case':>28} {'scale':>7} {'rows':>10} {'best s':>9} {'rows/s':>12} {'vs last':>8}")
+    for scale in RUN_SCALES:
+        inputs = build_inputs(*SCALES[scale])
+        for case, rows, func in cases(inputs):
+            if RUN_CASES and case not in RUN_CASES.split(","):
+                continue
+            best, mean = timed(func)
+            last = previous.get((case, scale))
+            change = f"{100 * (best / last - 1):+7.0f}%" if last else f"{'-':>8}"
+            print(f"{case:>28} {scale:>7} {rows:>10} {best:9.3f} {rows / best:12.0f} {change}")
+            results.append({
+                "timestamp": stamp, "commit": commit, "case": case, "scale": scale, "rows": rows,
+                "best_s": round(best, 4), "mean_s": round(mean, 4), "rows_per_s": round(rows / best, 1),
+            })
+
+    HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    new_file = not HISTORY_PATH.exists()
+    with open(HISTORY_PATH, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerows(results)
+    print(f"💾 Appended {len(results)} results to {HISTORY_PATH}")
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.feature_grid import FeatureGrid
+from helpers.preprocessing_artifact import load_artifact
+from helpers.risk_inference import load_model
+from helpers.risk_service import RiskService
+
+# 📁 Config: local artifacts only, the same ones serve_fire_risk.py uses
+FEATURES_PATH = Path("data/era5/era5_features.zarr")
+GRID_CACHE_DIR = Path("data/risk/feature_grid")
+MODEL_PATH = Path("randomForestResults/random_forest_fire_model.forest")  # or a .pkl model
+PREPROCESSING_DIR = Path("preprocessed_data")
+
+SEED = 42
+CLIENTS = 64               # Concurrent keep-alive connections
+REQUESTS_PER_CLIENT = 50
+BBOX_EVERY = 20            # Every n-th request is a 1°×1° bbox query instead of a point
+# (label, max_batch_rows, max_wait_ms): one predict per request vs micro-batched
+CONFIGS = [("unbatched", 1, 0.0), ("micro-batched", 4096, 2.0)]
+
+
+def random_queries(grid, n, rng):
+    t = rng.integers(0, len(grid.times), n)
+    lats = rng.uniform(grid.latitudes.min(), grid.latitudes.max(), n)
+    lons = rng.uniform(grid.longitudes.min(), grid.longitudes.max(), n)
+    queries = []
+    for k in range(n):
+        when = str(grid.times[t[k]])[:16]
+        if k % BBOX_EVERY == BBOX_EVERY - 1:
+            queries.append(
+                f"/risk/bbox?lat_min={lats[k] - 0.5:.3f}&lat_max={lats[k] + 0.5:.3f}"
+                f"&lon_min={lons[k] - 0.5:.3f}&lon_max={lons[k] + 0.5:.3f}&time={when}"
+            )
+        else:
+            queries.append(f"/risk?lat={lats[k]:.4f}&lon={lons[k]:.4f}&time={when}")
+    return queries
+
+
+async def client(port, queries, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for query in queries:
+        started = time.perf_counter()
+        writer.write(f"GET {query} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        headers = {}
+        status = await reader.readline()
+        while (line := await reader.readline()) != b"\r\n":
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = json.loads(await reader.readexactly(int(headers["content-length"])))
+        latencies.append(time.perf_counter() - started)
+        if b" 200 " not in status:
+            raise RuntimeError(f"{query} -> {status!r} {body}")
+    writer.close()
+
+
+async def run(service, queries_per_client):
+    server = await service.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    latencies = []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(port, queries, latencies) for queries in queries_per_client))
+    elapsed = time.perf_counter() - started
+    server.close()
+    await server.wait_closed()
+    await service.batcher.stop()
+    return np.array(latencies), elapsed
+
+
+if __name__ == "__main__":
+    model = load_model(MODEL_PATH, n_jobs=1)
+    preprocessing = load_artifact(PREPROCESSING_DIR)
+    feature_cols = list(preprocessing["feature_cols"])
+    grid = FeatureGrid.load_or_build(FEATURES_PATH, GRID_CACHE_DIR, feature_cols)
+
+    rng = np.random.default_rng(SEED)
+    queries = [random_queries(grid, REQUESTS_PER_CLIENT, rng) for _ in range(CLIENTS)]
+    n_requests = CLIENTS * REQUESTS_PER_CLIENT
+    print(f"🔥 {CLIENTS} clients × {REQUESTS_PER_CLIENT} requests ({n_requests} total, 1 in {BBOX_EVERY} bbox)")
+    print(f"{'mode':>14} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'batches':>8} {'rows/batch':>11}")
+
+    for label, max_batch_rows, max_wait_ms in CONFIGS:
+        service = RiskService(model, preprocessing["scaler"], feature_cols, grid, max_batch_rows, max_wait_ms)
+        latencies, elapsed = asyncio.run(run(service, queries))
+        p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99])
+        stats = service.stats()
+        print(f"{label:>14} {n_requests / elapsed:>9,.0f} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f} "
+              f"{stats['batches']:>8} {stats['mean_batch_rows']:>11.1f}")
@@ -0,0 +1,91 @@
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold
+
+from helpers.augmentation import augment
+from helpers.blocked_cv import (
+    cross_validate, sample_labeled_cells, spatial_blocked_folds, summarize_folds, time_blocked_folds
+)
+from helpers.era5_store import open_era5
+from helpers.labeled_cells import feature_columns
+
+# === Configuration ===
+INPUT_FILE = Path("data/dataset/labeled_era5_2023.nc")
+OUTPUT_DIR = Path("crossValidationResults")
+FIRE_SAMPLE = 50_000      # Cells sampled from the cube per class before any augmentation
+NO_FIRE_SAMPLE = 50_000
+TIME_BLOCK_HOURS = 24 * 7
+SEED = 42
+
+N_FOLDS = 5
+GAP_HOURS = 24 * 7        # Longest rolling feature window; purged around each time fold
+SPATIAL_BLOCK_DEGREES = 1.0
+MAX_WORKERS = None        # One process per fold, up to the number of cores
+
+# Augmentation used by preprocess_wildfire_data.py, applied to training folds only
+AUGMENT = {
+    "strategy": "noise", "fire_target": 10_000, "no_fire_target": 10_000,
+    "noise_std_fraction": 0.05, "seed": SEED,
+}
+
+MODELS = {
+    "random_forest": {"n_estimators": 200, "max_depth": 12, "min_samples_leaf": 5,
+                      "class_weight": "balanced", "random_state": SEED, "n_jobs": 1},
+    "logistic": {"max_iter": 1000, "class_weight": "balanced", "random_state": SEED},
+}
+
+
+def main():
+    # === Sample cells with their coordinates ===
+    print(f"📂 Opening labeled dataset lazily: {INPUT_FILE}")
+    ds = open_era5(INPUT_FILE)
+    feature_cols = feature_columns(ds)
+    print("🧪 Feature columns:", feature_cols)
+
+    X, y, coords = sample_labeled_cells(ds, feature_cols, FIRE_SAMPLE, NO_FIRE_SAMPLE, TIME_BLOCK_HOURS, SEED)
+    hours, latitudes, longitudes = coords[:, 0], coords[:, 1], coords[:, 2]
+    print(f"🔥 Sampled {int(y.sum())} fire and {int((y == 0).sum())} no-fire cells")
+
+    schemes = {
+        "time_blocked": time_blocked_folds(hours, N_FOLDS, gap_hours=GAP_HOURS),
+        "spatial_blocked": spatial_blocked_folds(latitudes, longitudes, N_FOLDS, SPATIAL_BLOCK_DEGREES),
+    }
+
+    # The old approach for reference: augment everything, then split rows at random
+    X_leaky, y_leaky = augment(X, y, **AUGMENT)
+    leaky_folds = list(StratifiedKFold(N_FOLDS, shuffle=True, random_state=SEED).split(X_leaky, y_leaky))
+
+    # === Evaluate folds in parallel ===
+    results = []
+    started = time.perf_counter()
+    for model_name, params in MODELS.items():
+        for scheme, folds in schemes.items():
+            print(f"🧮 {model_name} / {scheme}: {len(folds)} folds in parallel...")
+            fold_results = cross_validate(X, y, folds, model_name, params, augment=AUGMENT, max_workers=MAX_WORKERS)
+            results.append(fold_results.assign(scheme=scheme))
+
+        print(f"🧮 {model_name} / random_split_after_augmentation (leaky baseline)...")
+        fold_results = cross_validate(X_leaky, y_leaky, leaky_folds, model_name, params, max_workers=MAX_WORKERS)
+        results.append(fold_results.assign(scheme="random_split_after_augmentation"))
+    elapsed = time.perf_counter() - started
+
+    results = pd.concat(results, ignore_index=True)
+    summary = summarize_folds(results)
+
+    # === Save Outputs ===
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    results.to_csv(OUTPUT_DIR / "cv_folds.csv", index=False)
+    summary.to_csv(OUTPUT_DIR / "cv_summary.csv", index=False)
+
+    print(f"\n📊 Cross-validation summary ({elapsed:.1f}s wall clock):\n")
+    columns = ["scheme", "model", "roc_auc_mean", "roc_auc_std", "pr_auc_mean", "f1_mean", "fit_seconds_mean"]
+    print(summary[columns].to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    print(f"\n💾 Per-fold results: {OUTPUT_DIR / 'cv_folds.csv'}")
+    print(f"💾 Summary: {OUTPUT_DIR / 'cv_summary.csv'}")
+
+
+if __name__ == "__main__":  # cross_validate starts worker processes
+    main()
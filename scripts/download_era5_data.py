@@ -1,9 +1,7 @@
 import os
-import time
-import random
-from datetime import datetime
-import concurrent.futures
-import cdsapi
+
+from helpers.era5_downloader import AdaptiveLimiter, DownloadScheduler
+from helpers.era5_request_planner import plan_requests, summarize_plan
 
 # 📁 Config
 variables = [
@@ -15,66 +13,62 @@ variables = [
     "surface_pressure",
 ]
 
-months = [f"{i:02}" for i in range(1, 13)]
-output_dir = "data/era5/multi"
-os.makedirs(output_dir, exist_ok=True)
-
-MAX_WORKERS = 2  # 🧠 Safe value to avoid CDS API job queue limits
+START_DATE = "2023-01-01"
+END_DATE = "2023-12-31"
 
-def retry_with_backoff(func, max_retries=5, base_delay=60):
-    """Retries a function with exponential backoff on rate-limit errors."""
-    for attempt in range(max_retries):
-        try:
-            return func()
-        except Exception as e:
-            error_str = str(e)
-            if "temporarily limited" in error_str or "429" in error_str:
-                delay = base_delay * (2 ** attempt) + random.uniform(0, 10)
-                print(f"🔁 Backing off for {delay:.1f} seconds (attempt {attempt + 1})")
-                time.sleep(delay)
-            else:
-                raise
+# 🌍 One entry per region: bounding box (N, W, S, E), download folder and merged store
+REGIONS = {
+    "portugal": {
+        "area": [42.0, -9.6, 36.9, -6.1],
+        "output_dir": "data/era5/multi",
+        "store_path": "data/era5/era5_portugal.zarr",
+    },
+}
 
-def download_variable_month(var: str, month: str):
-    year = "2023"
-    filename = f"era5_{var}_{year}_{month}.nc"
-    filepath = os.path.join(output_dir, filename)
+# 🧠 Concurrency starts low and adapts to CDS queue latency and 429s
+INITIAL_WORKERS = 2
+MAX_WORKERS = 6
+TARGET_LATENCY_SECONDS = 15 * 60
 
-    if os.path.exists(filepath):
-        print(f"✅ File already exists: {filename}")
-        return
+# Set ERA5_DRY_RUN=1 to only print the plan; ERA5_FAKE_CDS=1 to run against the local fake client
+DRY_RUN = os.environ.get("ERA5_DRY_RUN") == "1"
+USE_FAKE_CDS = os.environ.get("ERA5_FAKE_CDS") == "1"
 
-    print(f"⬇️  Downloading {filename}...")
 
-    c = cdsapi.Client()
+def client_factory():
+    if USE_FAKE_CDS:
+        from helpers.fake_cds_client import FakeCDSClient
+        return FakeCDSClient()
+    import cdsapi
+    return cdsapi.Client()
 
-    try:
-        retry_with_backoff(lambda: c.retrieve(
-            "reanalysis-era5-single-levels",
-            {
-                "product_type": "reanalysis",
-                "format": "netcdf",
-                "variable": var,
-                "year": year,
-                "month": month,
-                "day": [f"{d:02d}" for d in range(1, 32)],
-                "time": [f"{h:02d}:00" for h in range(24)],
-                "area": [42.0, -9.6, 36.9, -6.1],  # Portugal bounding box
-            },
-            filepath,
-        ))
-        print(f"✅ Saved: {filename}")
-    except Exception as e:
-        print(f"❌ Failed to download {filename}: {e}")
 
-# 🚀 Parallel download with throttling
+# 🚀 Plan, then download in parallel with adaptive throttling
 if __name__ == "__main__":
-    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        tasks = [
-            executor.submit(download_variable_month, var, month)
-            for var in variables
-            for month in months
-        ]
-        concurrent.futures.wait(tasks)
+    failed = []
+    for region, config in REGIONS.items():
+        tasks = plan_requests(
+            START_DATE, END_DATE, config["area"], variables, config["output_dir"],
+            store_path=config["store_path"],
+        )
+        summarize_plan(tasks, label=region)
+        if DRY_RUN or not tasks:
+            continue
+
+        scheduler = DownloadScheduler(
+            config["output_dir"],
+            client_factory,
+            limiter=AdaptiveLimiter(
+                initial=INITIAL_WORKERS, maximum=MAX_WORKERS, target_latency=TARGET_LATENCY_SECONDS
+            ),
+            base_delay=1 if USE_FAKE_CDS else 60,
+        )
+        results = scheduler.run(tasks)
+        failed += [label for label, status in results.items() if status != "ok"]
 
-    print("🎉 All downloads complete!")
+    if DRY_RUN:
+        print("🧾 Dry run only, nothing downloaded.")
+    elif failed:
+        print(f"⚠️  {len(failed)} requests failed; rerun to retry them.")
+    else:
+        print("🎉 All downloads complete!")
@@ -1,48 +1,43 @@
-import cdsapi
 import os
-from concurrent.futures import ThreadPoolExecutor
+
+from helpers.era5_downloader import AdaptiveLimiter, DownloadScheduler
+from helpers.era5_request_planner import plan_requests, summarize_plan
 
 # === Config ===
 ERA5_DIR = "data/era5"
-os.makedirs(ERA5_DIR, exist_ok=True)
 
 VARIABLE = "2m_temperature"
-YEAR = "2023"
-MONTHS = [f"{m:02d}" for m in range(1, 13)]
-THREADS = 4  # Number of parallel threads; can adjust
+START_DATE = "2023-01-01"
+END_DATE = "2023-12-31"
+THREADS = 4  # Upper bound on parallel requests; the scheduler adapts below it
 
 # Portugal bounding box: North, West, South, East
 AREA = [42.0, -9.6, 36.9, -6.0]  # N, W, S, E
 
-def download_month(month):
-    filename = f"{ERA5_DIR}/era5_temperature_{YEAR}_{month}.nc"
-    if os.path.exists(filename):
-        print(f"✅ Already exists: {filename}")
-        return
-
-    print(f"⬇️  Downloading ERA5 data for {YEAR}-{month}...")
-    c = cdsapi.Client()
-
-    try:
-        c.retrieve(
-            "reanalysis-era5-single-levels",
-            {
-                "product_type": "reanalysis",
-                "format": "netcdf",
-                "variable": VARIABLE,
-                "year": YEAR,
-                "month": month,
-                "day": [f"{d:02d}" for d in range(1, 32)],
-                "time": [f"{h:02d}:00" for h in range(24)],
-                "area": AREA,
-            },
-            filename
-        )
-        print(f"✅ Downloaded: {filename}")
-    except Exception as e:
-        print(f"❌ Failed to download {month}: {e}")
+DRY_RUN = os.environ.get("ERA5_DRY_RUN") == "1"
+USE_FAKE_CDS = os.environ.get("ERA5_FAKE_CDS") == "1"
+
+
+def client_factory():
+    if USE_FAKE_CDS:
+        from helpers.fake_cds_client import FakeCDSClient
+        return FakeCDSClient()
+    import cdsapi
+    return cdsapi.Client()
+
 
 # === Run in parallel
 if __name__ == "__main__":
-    with ThreadPoolExecutor(max_workers=THREADS) as executor:
-        executor.map(download_month, MONTHS)
+    tasks = plan_requests(
+        START_DATE, END_DATE, AREA, [VARIABLE], ERA5_DIR,
+        filename_template="era5_temperature_{year}_{month}.nc",
+    )
+    summarize_plan(tasks)
+    if not DRY_RUN:
+        scheduler = DownloadScheduler(
+            ERA5_DIR,
+            client_factory,
+            limiter=AdaptiveLimiter(initial=2, maximum=THREADS),
+            base_delay=1 if USE_FAKE_CDS else 60,
+        )
+        scheduler.run(tasks)
@@ -1,7 +1,8 @@
 import os
-import pandas as pd
 from kaggle.api.kaggle_api_extended import KaggleApi
 
+from helpers.firms_ingest import ingest_firms
+
 # 🌍 Portugal bounding box
 LAT_MIN, LAT_MAX = 36.9, 42.0
 LON_MIN, LON_MAX = -9.6, -6.1
@@ -12,42 +13,46 @@ filename = "MODIS_C6_2020_2023.csv"
 output_dir = "data/fires"
 raw_path = os.path.join(output_dir, filename)
 filtered_path = os.path.join(output_dir, "modis_portugal_2023.csv")
-
-# 🧱 Ensure directory exists
-os.makedirs(output_dir, exist_ok=True)
-
-# 📦 Download from Kaggle if needed
-if not os.path.exists(raw_path):
-    print(f"⬇️ Downloading {filename} from Kaggle...")
-    api = KaggleApi()
-    api.authenticate()
-    api.dataset_download_file(dataset, file_name=filename, path=output_dir, force=True)
-
-    # Unzip
-    zip_path = raw_path + ".zip"
-    if os.path.exists(zip_path):
-        import zipfile
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(output_dir)
-        os.remove(zip_path)
-        print(f"✅ Unzipped to {output_dir}")
+parquet_root = os.path.join(output_dir, "parquet", "modis_portugal")
+
+
+def main():
+    # 🧱 Ensure directory exists
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 📦 Download from Kaggle if needed
+    if not os.path.exists(raw_path):
+        print(f"⬇️ Downloading {filename} from Kaggle...")
+        api = KaggleApi()
+        api.authenticate()
+        api.dataset_download_file(dataset, file_name=filename, path=output_dir, force=True)
+
+        # Unzip
+        zip_path = raw_path + ".zip"
+        if os.path.exists(zip_path):
+            import zipfile
+            with zipfile.ZipFile(zip_path, "r") as zip_ref:
+                zip_ref.extractall(output_dir)
+            os.remove(zip_path)
+            print(f"✅ Unzipped to {output_dir}")
+        else:
+            print("❌ ZIP file not found after download.")
     else:
-        print("❌ ZIP file not found after download.")
-else:
-    print(f"✅ {filename} already exists.")
-
-# 📂 Load & filter
-print("📂 Reading MODIS data...")
-df = pd.read_csv(raw_path, parse_dates=["acq_date"])
-
-# 🎯 Filter by year and Portugal bounding box
-mask = (
-    (df["acq_date"].dt.year == 2023) &
-    (df["latitude"].between(LAT_MIN, LAT_MAX)) &
-    (df["longitude"].between(LON_MIN, LON_MAX))
-)
-df_portugal = df[mask]
-
-# 💾 Save results
-df_portugal.to_csv(filtered_path, index=False)
-print(f"✅ Saved {len(df_portugal)} records to {filtered_path}")
+        print(f"✅ {filename} already exists.")
+
+    # 📂 Filter in chunks into year/month-partitioned Parquet (skipped if already ingested)
+    print("📂 Filtering MODIS data...")
+    df_portugal = ingest_firms(
+        [raw_path],
+        parquet_root,
+        (LAT_MIN, LAT_MAX, LON_MIN, LON_MAX),
+        years=[2023],
+    )
+
+    # 💾 Save results
+    df_portugal.to_csv(filtered_path, index=False)
+    print(f"✅ Saved {len(df_portugal)} records to {filtered_path}")
+
+
+if __name__ == "__main__":  # ingest_firms starts worker processes
+    main()
@@ -0,0 +1,34 @@
+import shutil
+from pathlib import Path
+
+import numpy as np
+from tqdm import tqdm
+
+from helpers.era5_features import HALO_HOURS, iter_feature_blocks
+from helpers.era5_store import append_to_store, open_era5
+from helpers.profiling import profile_stage
+
+# === Configuration ===
+INPUT_PATH = Path("data/era5/era5_portugal.zarr")
+OUTPUT_PATH = Path("data/era5/era5_features.zarr")
+TIME_BLOCK_HOURS = 24 * 31  # Hours computed at once (plus the halo of preceding hours)
+
+print(f"📂 Opening ERA5 cube lazily: {INPUT_PATH}")
+ds = open_era5(INPUT_PATH)
+ds = ds[["t2m", "d2m", "u10", "v10", "tp", "sp"]]
+print(f"📊 {ds.sizes['time']} hours on a {ds.sizes['latitude']}×{ds.sizes['longitude']} grid")
+print(f"🧱 Blocks of {TIME_BLOCK_HOURS} h with a {HALO_HOURS} h halo")
+
+if OUTPUT_PATH.exists():
+    shutil.rmtree(OUTPUT_PATH)
+OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+n_blocks = int(np.ceil(ds.sizes["time"] / TIME_BLOCK_HOURS))
+n_cells = ds.sizes["latitude"] * ds.sizes["longitude"]
+with profile_stage("features", rows_in=ds.sizes["time"] * n_cells) as stage:
+    for features in tqdm(iter_feature_blocks(ds, TIME_BLOCK_HOURS), total=n_blocks, desc="🧮 Features"):
+        append_to_store(features, OUTPUT_PATH)
+        stage.add_rows(rows_out=features.sizes["time"] * n_cells)
+
+print(f"✅ Features: {list(features.data_vars)}")
+print(f"💾 Feature cube saved to: {OUTPUT_PATH}")
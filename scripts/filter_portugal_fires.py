@@ -1,30 +1,34 @@
-import pandas as pd
 import os
 from glob import glob
 
-# Step 1: Find all fire CSVs in the data folder
-fire_files = glob("data/fire_nrt_*.csv")
+from helpers.firms_ingest import ingest_firms
+from helpers.profiling import profile_stage
 
-# Step 2: Load and concatenate them
-dfs = []
-for file in fire_files:
-    print(f"📄 Loading: {file}")
-    df = pd.read_csv(file)
-    dfs.append(df)
+# Portugal bounding box: lat_min, lat_max, lon_min, lon_max
+PORTUGAL_BBOX = (36.95, 42.15, -9.56, -6.19)
+PARQUET_ROOT = "data/fires/parquet/portugal_nrt"
+MAX_WORKERS = 4  # One process per CSV
 
-combined_df = pd.concat(dfs, ignore_index=True)
-print(f"📊 Combined fire records: {len(combined_df)}")
 
-# Step 3: Filter for Portugal bounding box
-pt_df = combined_df[
-    (combined_df.latitude >= 36.95) & (combined_df.latitude <= 42.15) &
-    (combined_df.longitude >= -9.56) & (combined_df.longitude <= -6.19)
-]
+def main():
+    # Step 1: Find all fire CSVs in the data folder
+    fire_files = sorted(glob("data/fire_nrt_*.csv"))
 
-# Step 4: Save filtered data
-output_path = "data/portugal_fires.csv"
-os.makedirs("data", exist_ok=True)
-pt_df.to_csv(output_path, index=False)
+    # Step 2: Filter them chunk by chunk into year/month-partitioned Parquet (cached across runs)
+    with profile_stage("ingest_firms") as stage:
+        pt_df = ingest_firms(fire_files, PARQUET_ROOT, PORTUGAL_BBOX, max_workers=MAX_WORKERS)
+        stage.rows_out = len(pt_df)
+    print(f"📊 Portugal fire records: {len(pt_df)}")
 
-print(f"✅ Filtered {len(pt_df)} fire records for Portugal.")
-print(pt_df.head())
+    # Step 3: Save filtered data
+    output_path = "data/portugal_fires.csv"
+    os.makedirs("data", exist_ok=True)
+    with profile_stage("write_csv", rows_in=len(pt_df)):
+        pt_df.to_csv(output_path, index=False)
+
+    print(f"✅ Filtered {len(pt_df)} fire records for Portugal.")
+    print(pt_df.head())
+
+
+if __name__ == "__main__":  # ingest_firms starts worker processes
+    main()
@@ -1,62 +1,82 @@
+import json
+
+import numpy as np
 import pandas as pd
-import xarray as xr
+import pyarrow as pa
+import pyarrow.parquet as pq
 from tqdm import tqdm
 
+from helpers.dtype_policy import GRID_INDEX_DTYPE, read_fire_csv
+from helpers.fire_index import load_or_build_fire_index
+from helpers.fire_timestamps import fire_datetimes
+from helpers.load_era5_dataset import load_era5_dataset
+from helpers.profiling import profile_stage
+
+OUTPUT_PATH = "data/fire_risk_training_data.parquet"
+ROW_GROUP_HOURS = 24 * 7  # Hours written per Parquet row group
+
+# Cells are stored as int16 ERA5 grid indices; the coordinates they map to are in the file metadata
+FIELDS = [
+    ("datetime_hour", pa.timestamp("ns")),
+    ("lat_idx", pa.int16()),
+    ("lon_idx", pa.int16()),
+    ("temperature", pa.float32()),
+    ("fire_occurred", pa.int8()),
+]
+
 # --- Load ERA5 data ---
-print("📂 Loading ERA5 data from: data/era5")
-era5_files = [f"data/era5/era5_temperature_2023_{month:02d}.nc" for month in range(1, 13)]
-ds_list = [xr.open_dataset(f) for f in era5_files]
-ds = xr.concat(ds_list, dim="time")
+ds = load_era5_dataset("data/era5", pattern="era5_temperature_2023_*.nc")
 
-# Flatten t2m using valid_time
-t2m = ds["t2m"] - 273.15  # Convert Kelvin to Celsius
-valid_times = ds["valid_time"].values
+t2m = ds["t2m_celsius"].transpose("time", "latitude", "longitude")
+valid_times = ds["time"].values
+latitudes = ds["latitude"].values
+longitudes = ds["longitude"].values
 
 print("✅ ERA5 dataset merged.")
 print(f"📊 ERA5 time range:\n{pd.to_datetime(valid_times[0])} → {pd.to_datetime(valid_times[-1])}")
-print(f"📍 Grid: lat {ds.latitude.min().item()} → {ds.latitude.max().item()}, lon {ds.longitude.min().item()} → {ds.longitude.max().item()}")
+print(f"📍 Grid: lat {latitudes.min()} → {latitudes.max()}, lon {longitudes.min()} → {longitudes.max()}")
 
 # --- Load fire data ---
-fires = pd.read_csv("data/portugal_fires.csv")
-fires["datetime"] = pd.to_datetime(
-    fires["acq_date"].astype(str) + " " + fires["acq_time"].astype(str).str.zfill(4),
-    format="%Y-%m-%d %H%M",
-    errors="coerce"
-)
+fires = read_fire_csv("data/portugal_fires.csv")
+fires["datetime"] = fire_datetimes(fires["acq_date"], fires["acq_time"], utc=False)
 fires["datetime_hour"] = fires["datetime"].dt.floor("h")
-fires["lat_rounded"] = fires["latitude"].round(2)
-fires["lon_rounded"] = fires["longitude"].round(2)
-fire_keys = set(zip(fires["datetime_hour"], fires["lat_rounded"], fires["lon_rounded"]))
 
 print("🕒 Sample fire datetimes and coords:")
-print(fires[["datetime_hour", "lat_rounded", "lon_rounded"]].dropna().head())
+print(fires[["datetime_hour", "latitude", "longitude"]].dropna().head())
+
+# Shared (time, lat, lon) grid index of fire cells, reused across runs and scripts
+fire_index = load_or_build_fire_index(
+    "data/portugal_fires.csv", valid_times, latitudes, longitudes, fire_df=fires
+)
 
 # --- Generate training samples ---
 print("\n📦 Generating labeled fire/no-fire samples from ERA5 data...")
 
-records = []
-latitudes = ds["latitude"].values
-longitudes = ds["longitude"].values
+# Per-cell grid index columns for one hour; every hour repeats the same layout
+n_lat, n_lon = len(latitudes), len(longitudes)
+cell_lats = np.repeat(np.arange(n_lat, dtype=GRID_INDEX_DTYPE), n_lon)
+cell_lons = np.tile(np.arange(n_lon, dtype=GRID_INDEX_DTYPE), n_lat)
+
+SCHEMA = pa.schema(FIELDS, metadata={
+    "latitudes": json.dumps(latitudes.round(2).tolist()),
+    "longitudes": json.dumps(longitudes.round(2).tolist()),
+})
+
+n_rows = 0
+with profile_stage("write_parquet") as stage, pq.ParquetWriter(OUTPUT_PATH, SCHEMA) as writer:
+    for start in tqdm(range(0, len(valid_times), ROW_GROUP_HOURS), desc="🕐 Writing row groups"):
+        stop = min(start + ROW_GROUP_HOURS, len(valid_times))
+        n_hours = stop - start
+
+        block = pa.table({
+            "datetime_hour": np.repeat(valid_times[start:stop].astype("datetime64[ns]"), n_lat * n_lon),
+            "lat_idx": np.tile(cell_lats, n_hours),
+            "lon_idx": np.tile(cell_lons, n_hours),
+            "temperature": t2m.isel(time=slice(start, stop)).values.astype(np.float32).ravel(),
+            "fire_occurred": fire_index.mask(start, stop).ravel().astype(np.int8),
+        }, schema=SCHEMA)
+        writer.write_table(block)
+        n_rows += block.num_rows
+    stage.rows_out = n_rows
 
-# Determine shape and flatten t2m to align with valid_time
-flat_t2m = t2m.stack(valid_time_flat=("time", "valid_time"))
-
-for i, timestamp in enumerate(tqdm(valid_times, desc="🕐 Processing hours")):
-    # Get temperature slice for this timestamp
-    try:
-        temp_data = flat_t2m.sel(valid_time=timestamp)
-    except KeyError:
-        continue  # In case the timestamp isn't found, skip
-
-    df_temp = temp_data.to_dataframe(name="temperature").reset_index()
-    df_temp["datetime_hour"] = pd.to_datetime(timestamp)
-    df_temp["lat_rounded"] = df_temp["latitude"].round(2)
-    df_temp["lon_rounded"] = df_temp["longitude"].round(2)
-    df_temp["key"] = list(zip(df_temp["datetime_hour"], df_temp["lat_rounded"], df_temp["lon_rounded"]))
-    df_temp["fire_occurred"] = df_temp["key"].isin(fire_keys).astype(int)
-    records.append(df_temp[["datetime_hour", "lat_rounded", "lon_rounded", "temperature", "fire_occurred"]])
-
-# Combine and save
-df_all = pd.concat(records, ignore_index=True)
-df_all.to_csv("data/fire_risk_training_data.csv", index=False)
-print("✅ Saved training data to: data/fire_risk_training_data.csv")
+print(f"✅ Saved {n_rows} training rows to: {OUTPUT_PATH}")
@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from helpers.synthetic_data import synthetic_era5, synthetic_firms, write_era5_months
+
+# === Configuration ===
+# Writes the raw inputs every pipeline stage expects, so the whole pipeline (and its
+# profiling reports) can run offline. Run it from an empty working directory.
+OUTPUT_ROOT = Path(os.environ.get("SYNTHETIC_DATA_ROOT", "data"))
+SCALE = os.environ.get("SYNTHETIC_SCALE", "small")
+OVERWRITE = os.environ.get("SYNTHETIC_OVERWRITE") == "1"
+SEED = 42
+
+# scale -> (months of 2023, n_lat, n_lon, FIRMS rows)
+SCALES = {
+    "small": (3, 21, 15, 50_000),
+    "medium": (12, 21, 15, 500_000),
+    "large": (12, 42, 30, 5_000_000),  # 0.125° grid
+}
+FIRMS_SHARDS = 4  # data/fire_nrt_*.csv files, like the Kaggle download
+
+months, n_lat, n_lon, firms_rows = SCALES[SCALE]
+era5_dir = OUTPUT_ROOT / "era5"
+if (era5_dir / "multi").exists() and not OVERWRITE:
+    raise SystemExit(f"❌ {era5_dir / 'multi'} already exists; set SYNTHETIC_OVERWRITE=1 to replace it")
+
+# === ERA5 ===
+start = pd.Timestamp("2023-01-01")
+hours = int((start + pd.DateOffset(months=months) - start) / pd.Timedelta(hours=1))
+print(f"🌡️  Synthetic ERA5: {hours} hours × {n_lat}×{n_lon} cells ({SCALE})")
+ds = synthetic_era5(hours, n_lat, n_lon, seed=SEED)
+
+paths = write_era5_months(ds, era5_dir / "multi", per_variable=True)
+print(f"💾 {len(paths)} per-variable monthly files in {era5_dir / 'multi'}")
+paths = write_era5_months(ds, era5_dir, per_variable=False)
+print(f"💾 {len(paths)} monthly temperature files in {era5_dir}")
+
+# join_fire_with_weather.py reads a single-day file (1 August when the record covers it)
+day = ds.sel(valid_time="2023-08-01" if months >= 8 else "2023-01-01")
+day.to_netcdf(era5_dir / "portugal_2023-08-01.nc")
+
+# === FIRMS ===
+print(f"🔥 Synthetic FIRMS: {firms_rows} detections")
+firms = synthetic_firms(firms_rows, end=f"2023-{months:02d}-28", seed=SEED)
+for shard, rows in enumerate(np.array_split(np.arange(len(firms)), FIRMS_SHARDS)):
+    firms.iloc[rows].to_csv(OUTPUT_ROOT / f"fire_nrt_{shard}.csv", index=False)
+
+(OUTPUT_ROOT / "fires").mkdir(parents=True, exist_ok=True)
+firms.to_csv(OUTPUT_ROOT / "fires" / "modis_2023_Portugal.csv", index=False)
+
+print(f"✅ Synthetic inputs written under {OUTPUT_ROOT}/")
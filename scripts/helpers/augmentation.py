@@ -0,0 +1,77 @@
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+
+
+def _undersample(rows, target, rng):
+    return rows[rng.choice(len(rows), min(target, len(rows)), replace=False)]
+
+
+def _resample(rows, target, rng):
+    return rows[rng.integers(0, len(rows), target)] if len(rows) else rows
+
+
+def _feature_std(rows):
+    return rows.std(axis=0, ddof=1) if len(rows) > 1 else np.zeros(rows.shape[1])
+
+
+def noise_oversample(fire, fire_target, rng, noise_std_fraction=0.05, **_):
+    """Fires resampled with replacement, jittered by Gaussian noise at a fraction of each feature's std.
+
+    The whole noise matrix comes from one draw, scaled by the per-feature std vector.
+    """
+    rows = _resample(fire, fire_target, rng)
+    return rows + rng.normal(0.0, _feature_std(fire) * noise_std_fraction, size=rows.shape)
+
+
+def smote_oversample(fire, fire_target, rng, k_neighbors=5, **_):
+    """SMOTE-style: originals plus points interpolated between a fire and one of its k nearest fires.
+
+    Neighbours are found on standardized features so no single unit (e.g. Pa) dominates.
+    """
+    if len(fire) >= fire_target:
+        return _undersample(fire, fire_target, rng)
+    if len(fire) < 2:
+        return _resample(fire, fire_target, rng)
+
+    std = _feature_std(fire)
+    scaled = (fire - fire.mean(axis=0)) / np.where(std > 0, std, 1)
+    k = min(k_neighbors, len(fire) - 1)
+    neighbors = NearestNeighbors(n_neighbors=k + 1).fit(scaled).kneighbors(scaled, return_distance=False)[:, 1:]
+
+    n_new = fire_target - len(fire)
+    base = rng.integers(0, len(fire), n_new)
+    partner = neighbors[base, rng.integers(0, k, n_new)]
+    gap = rng.random((n_new, 1))
+    synthetic = fire[base] + gap * (fire[partner] - fire[base])
+    return np.concatenate([fire, synthetic])
+
+
+def class_weight_only(fire, fire_target, rng, **_):
+    """No synthetic fires; the models' class_weight="balanced" makes up the imbalance instead."""
+    return fire
+
+
+STRATEGIES = {
+    "noise": noise_oversample,
+    "smote": smote_oversample,
+    "class_weight": class_weight_only,
+}
+
+
+def augment(X, y, strategy="noise", fire_target=10_000, no_fire_target=10_000, seed=42, **options):
+    """Balances (X, y) with one of STRATEGIES and undersamples no-fire rows; returns a shuffled (X, y).
+
+    Every random draw comes from one np.random.Generator seeded with `seed`, so runs are
+    reproducible. Options (noise_std_fraction, k_neighbors) are passed to the strategy.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"❌ Unknown augmentation strategy '{strategy}', expected one of {sorted(STRATEGIES)}")
+    rng = np.random.default_rng(seed)
+    fire_rows = STRATEGIES[strategy](X[y == 1], fire_target, rng, **options)
+    no_fire_rows = _undersample(X[y == 0], no_fire_target, rng)
+
+    X_out = np.concatenate([fire_rows, no_fire_rows])
+    y_out = np.concatenate([np.ones(len(fire_rows), np.int8), np.zeros(len(no_fire_rows), np.int8)])
+    order = rng.permutation(len(X_out))
+    return X_out[order], y_out[order]
+
@@ -1,7 +1,7 @@
 import pandas as pd
 
 # Load full dataset
-df = pd.read_csv("data/fire_risk_training_data.csv")
+df = pd.read_parquet("data/fire_risk_training_data.parquet")
 
 # Split into fire and no-fire
 fires = df[df["fire_occurred"] == 1]
@@ -0,0 +1,131 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import (
+    average_precision_score, brier_score_loss, f1_score, precision_score, recall_score, roc_auc_score
+)
+from sklearn.preprocessing import StandardScaler
+
+from helpers.augmentation import augment as augment_rows
+from helpers.labeled_cells import ReservoirSample, iter_labeled_blocks
+
+# Built inside each worker from (name, params), so only plain data crosses the process boundary
+MODELS = {
+    "random_forest": RandomForestClassifier,
+    "logistic": LogisticRegression,
+    "hist_gradient_boosting": HistGradientBoostingClassifier,
+}
+
+
+def sample_labeled_cells(ds, feature_cols, fire_size, no_fire_size, time_block, seed=42):
+    """Uniform samples of fire and no-fire cells streamed from the cube, with their coordinates.
+
+    Returns X (rows, features), y (rows,) and coords (rows, 3) of [hour index, lat, lon].
+    """
+    n_cols = len(feature_cols) + 3
+    fire = ReservoirSample(fire_size, n_cols, seed=seed)
+    no_fire = ReservoirSample(no_fire_size, n_cols, seed=seed + 1)
+    for X, y, coords in iter_labeled_blocks(ds, feature_cols, time_block, with_coords=True):
+        rows = np.hstack([X, coords])
+        fire.add(rows[y == 1])
+        no_fire.add(rows[y == 0])
+
+    rows = np.concatenate([fire.sample(), no_fire.sample()])
+    y = np.concatenate([np.ones(len(fire.sample()), np.int8), np.zeros(len(no_fire.sample()), np.int8)])
+    return rows[:, :-3], y, rows[:, -3:]
+
+
+def time_blocked_folds(hours, n_folds, gap_hours=0):
+    """Contiguous time blocks as test folds; training rows within `gap_hours` of the block are purged.
+
+    The gap keeps hours that share rolling-window features (or sit next to a labeled fire)
+    from landing on both sides of the split.
+    """
+    edges = np.linspace(hours.min(), hours.max() + 1, n_folds + 1)
+    folds = []
+    for k in range(n_folds):
+        start, stop = edges[k], edges[k + 1]
+        test = (hours >= start) & (hours < stop)
+        train = (hours < start - gap_hours) | (hours >= stop + gap_hours)
+        folds.append((np.flatnonzero(train), np.flatnonzero(test)))
+    return folds
+
+
+def spatial_blocked_folds(latitudes, longitudes, n_folds, block_degrees=1.0, buffer_blocks=1):
+    """Square spatial blocks grouped into contiguous west-to-east folds.
+
+    Training rows in blocks touching a test block (within `buffer_blocks`) are purged, so
+    neighbouring cells with near-identical weather never sit on both sides of the split.
+    """
+    block_i = np.floor(latitudes / block_degrees).astype(np.int64)
+    block_j = np.floor(longitudes / block_degrees).astype(np.int64)
+    blocks, block_of_row = np.unique(np.column_stack([block_j, block_i]), axis=0, return_inverse=True)
+    block_of_row = block_of_row.ravel()
+    # np.unique sorts by longitude block first, so equal-size runs form contiguous bands
+    fold_of_block = np.arange(len(blocks)) * n_folds // len(blocks)
+
+    folds = []
+    for k in range(n_folds):
+        test_blocks = blocks[fold_of_block == k]
+        # Chebyshev distance in blocks from every block to the nearest test block
+        distance = np.abs(blocks[:, None, :] - test_blocks[None, :, :]).max(axis=2).min(axis=1)
+        test = np.flatnonzero(fold_of_block[block_of_row] == k)
+        train = np.flatnonzero(distance[block_of_row] > buffer_blocks)
+        folds.append((train, test))
+    return folds
+
+
+def evaluate_fold(args):
+    """Fits one fold: augment and scale the training rows only, score the untouched test rows."""
+    fold, model_name, params, X, y, train, test, augment = args
+    X_train, y_train = X[train], y[train]
+    if augment is not None:
+        X_train, y_train = augment_rows(X_train, y_train, **augment)
+
+    started = time.perf_counter()
+    scaler = StandardScaler().fit(X_train)
+    model = MODELS[model_name](**params).fit(scaler.transform(X_train), y_train)
+    fit_seconds = time.perf_counter() - started
+
+    y_test = y[test]
+    prob = model.predict_proba(scaler.transform(X[test]))[:, 1]
+    pred = (prob >= 0.5).astype(np.int8)
+    both_classes = len(np.unique(y_test)) == 2
+    return {
+        "fold": fold,
+        "model": model_name,
+        "train_rows": len(X_train),
+        "test_rows": len(test),
+        "test_fire_rows": int(y_test.sum()),
+        "roc_auc": roc_auc_score(y_test, prob) if both_classes else np.nan,
+        "pr_auc": average_precision_score(y_test, prob) if both_classes else np.nan,
+        "precision": precision_score(y_test, pred, zero_division=0),
+        "recall": recall_score(y_test, pred, zero_division=0),
+        "f1": f1_score(y_test, pred, zero_division=0),
+        "brier": brier_score_loss(y_test, prob),
+        "fit_seconds": fit_seconds,
+    }
+
+
+def cross_validate(X, y, folds, model_name, params, augment=None, max_workers=None):
+    """Evaluates every fold in a process pool; returns one row of metrics per fold."""
+    tasks = []
+    for k, (train, test) in enumerate(folds):
+        if len(train) == 0 or len(test) == 0:
+            print(f"⚠️  Fold {k} has {len(train)} training and {len(test)} test rows, skipping it")
+            continue
+        tasks.append((k, model_name, params, X, y, train, test, augment))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return pd.DataFrame(list(executor.map(evaluate_fold, tasks)))
+
+
+def summarize_folds(results):
+    """Mean ± std of each metric per scheme and model."""
+    metrics = ["roc_auc", "pr_auc", "precision", "recall", "f1", "brier", "fit_seconds"]
+    summary = results.groupby(["scheme", "model"])[metrics].agg(["mean", "std"])
+    summary.columns = [f"{metric}_{stat}" for metric, stat in summary.columns]
+    return summary.reset_index()
@@ -1,6 +1,6 @@
 import pandas as pd
 
-df = pd.read_csv("data/fire_risk_training_data.csv")
+df = pd.read_parquet("data/fire_risk_training_data.parquet")
 
 print("🔥 Fire vs No-Fire label counts:")
 print(df["fire_occurred"].value_counts())
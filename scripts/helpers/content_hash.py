@@ -0,0 +1,25 @@
+import hashlib
+from pathlib import Path
+
+
+def _files(path):
+    path = Path(path)
+    return [path] if path.is_file() else sorted(p for p in path.rglob("*") if p.is_file())
+
+
+def stat_key(path):
+    """Size + mtime of a file, or of every file under a directory store (e.g. Zarr)."""
+    path = Path(path)
+    return [[str(p.relative_to(path.parent)), p.stat().st_size, p.stat().st_mtime_ns] for p in _files(path)]
+
+
+def content_hash(path, chunk_size=1 << 20):
+    """SHA-256 over the bytes of a file, or over every file (and its relative path) in a directory."""
+    path = Path(path)
+    digest = hashlib.sha256()
+    for file in _files(path):
+        digest.update(str(file.relative_to(path.parent)).encode())
+        with open(file, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# Raw FIRMS (MODIS and VIIRS) columns with compact dtypes. confidence mixes MODIS 0-100 and
+# VIIRS l/n/h, and acq_time comes as 930, "0930" or "09:30", so both are read as strings
+FIRMS_DTYPES = {
+    "latitude": "float32",
+    "longitude": "float32",
+    "brightness": "float32",
+    "bright_ti4": "float32",
+    "bright_ti5": "float32",
+    "scan": "float32",
+    "track": "float32",
+    "acq_date": "string",
+    "acq_time": "string",
+    "satellite": "category",
+    "instrument": "category",
+    "confidence": "string",
+    "version": "category",
+    "bright_t31": "float32",
+    "frp": "float32",
+    "daynight": "category",
+    "type": "Int8",
+}
+
+LABEL_COLUMNS = ("fire", "fire_label", "fire_occurred")
+CATEGORICAL_COLUMNS = ("satellite", "instrument", "daynight", "version")
+GRID_INDEX_DTYPE = np.int16  # ERA5 over Portugal is a few dozen cells per axis
+
+
+def compact_frame(df):
+    """Applies the dtype policy to a DataFrame at a stage boundary.
+
+    float32 for weather/coordinate floats, int8 labels, categorical satellite/instrument-style
+    strings, int8 numeric confidence (categorical when it is VIIRS letters) and the smallest
+    integer type for other integer columns.
+    """
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if col in LABEL_COLUMNS:
+            df[col] = series.astype(np.int8)
+        elif col in CATEGORICAL_COLUMNS:
+            df[col] = series.astype("category")
+        elif col == "confidence":
+            numeric = pd.to_numeric(series, errors="coerce")
+            if numeric.notna().all() and numeric.between(0, 100).all():
+                df[col] = numeric.astype(np.int8)
+            else:
+                df[col] = series.astype("category")
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = series.astype(np.float32)
+        elif pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+    return df
+
+
+def compact_dataset(ds, label_vars=LABEL_COLUMNS):
+    """float32 data variables and int8 labels for an ERA5 xarray Dataset."""
+    for name, var in ds.data_vars.items():
+        if name in label_vars:
+            ds[name] = var.astype(np.int8)
+        elif np.issubdtype(var.dtype, np.floating) and var.dtype != np.float32:
+            ds[name] = var.astype(np.float32)
+    return ds
+
+
+def read_fire_csv(path, **kwargs):
+    """pd.read_csv for FIRMS-derived CSVs with the compact dtypes applied on the way in."""
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {
+        col: dtype for col, dtype in FIRMS_DTYPES.items()
+        if col in header and col not in ("confidence", "acq_time")  # Validated after reading
+    }
+    return compact_frame(pd.read_csv(path, dtype=dtypes, **kwargs))
+
+
+def naive_frame(df):
+    """The same frame with pandas' default dtypes (float64, int64, object), as a baseline."""
+    upcast = {}
+    for col in df.columns:
+        dtype = df[col].dtype
+        if pd.api.types.is_float_dtype(dtype):
+            upcast[col] = np.float64
+        elif pd.api.types.is_integer_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            upcast[col] = np.int64
+        elif isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(dtype):
+            upcast[col] = object
+    return df.astype(upcast)
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def dataset_frame_bytes(ds, compact=True, label_vars=LABEL_COLUMNS):
+    """Bytes of `ds` flattened to one row per cell, without loading it.
+
+    compact=False counts float64 values and int64 labels, as `ds.to_dataframe()` on the raw
+    record would; compact=True counts the policy dtypes.
+    """
+    n_cells = int(np.prod([ds.sizes[dim] for dim in ("time", "latitude", "longitude")]))
+    per_row = 0
+    for name, var in ds.data_vars.items():
+        if name in label_vars:
+            per_row += 1 if compact else 8
+        elif np.issubdtype(var.dtype, np.number) or var.dtype == bool:
+            per_row += 4 if compact else 8
+    # (time, lat, lon) index: datetime64 + two float coordinates, or int16 grid indices
+    per_row += 8 + (2 * np.dtype(GRID_INDEX_DTYPE).itemsize if compact else 16)
+    return n_cells * per_row
+
+
+def memory_report(stages):
+    """Per-stage table of naive vs compact bytes; `stages` maps name -> (rows, naive_bytes, compact_bytes)."""
+    report = pd.DataFrame(
+        [(name, rows, naive, compact) for name, (rows, naive, compact) in stages.items()],
+        columns=["stage", "rows", "naive_mb", "compact_mb"],
+    )
+    report["naive_mb"] /= 1e6
+    report["compact_mb"] /= 1e6
+    report["reduction_pct"] = 100 * (1 - report["compact_mb"] / report["naive_mb"])
+    return report
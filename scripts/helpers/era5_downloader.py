@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import xarray as xr
+
+DATASET = "reanalysis-era5-single-levels"
+PORTUGAL_AREA = [42.0, -9.6, 36.9, -6.1]  # N, W, S, E
+
+# CDS long name -> variable name inside the NetCDF it returns
+ERA5_SHORT_NAMES = {
+    "2m_temperature": "t2m",
+    "2m_dewpoint_temperature": "d2m",
+    "10m_u_component_of_wind": "u10",
+    "10m_v_component_of_wind": "v10",
+    "total_precipitation": "tp",
+    "surface_pressure": "sp",
+}
+
+# Variables that CDS can return together in a single NetCDF. Accumulated fields (tp) come
+# back with a different step type, which CDS splits into a zip, so they get their own request.
+BATCH_GROUPS = [
+    ["2m_temperature", "2m_dewpoint_temperature", "10m_u_component_of_wind",
+     "10m_v_component_of_wind", "surface_pressure"],
+    ["total_precipitation"],
+]
+
+RATE_LIMIT_MARKERS = ("temporarily limited", "429", "too many requests")
+
+# The netCDF4/HDF5 libraries are not thread-safe; serialize every NetCDF read/write
+NETCDF_LOCK = threading.Lock()
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_rate_limited(error):
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in RATE_LIMIT_MARKERS)
+
+
+def batch_variables(variables, groups=BATCH_GROUPS):
+    """Splits `variables` into the largest groups CDS accepts in one request."""
+    batches = []
+    remaining = list(variables)
+    for group in groups:
+        batch = [var for var in remaining if var in group]
+        if batch:
+            batches.append(batch)
+            remaining = [var for var in remaining if var not in batch]
+    batches.extend([var] for var in remaining)
+    return batches
+
+
+def _as_set(value):
+    return {value} if isinstance(value, str) else set(value)
+
+
+def covers(recorded, request):
+    """True if the `recorded` CDS request includes every day and time step of `request`."""
+    return all(
+        _as_set(request.get(key, [])) <= _as_set(recorded.get(key, []))
+        for key in ("day", "time")
+    )
+
+
+class DownloadManifest:
+    """JSON record of completed downloads with their byte size and SHA-256.
+
+    A file only counts as downloaded if it is in the manifest and its size still matches,
+    so a truncated or half-written file is never mistaken for a finished one. Given a
+    `request`, the recorded request must also cover its days and times, so a month that
+    was downloaded for part of its days is fetched again when the range grows.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def is_complete(self, target, verify_checksum=False, request=None):
+        entry = self.entries.get(os.path.basename(target))
+        if entry is None or not os.path.exists(target):
+            return False
+        if os.path.getsize(target) != entry["bytes"]:
+            return False
+        if request is not None and not covers(entry["request"], request):
+            return False
+        return not verify_checksum or file_sha256(target) == entry["sha256"]
+
+    def record(self, target, request):
+        entry = {
+            "bytes": os.path.getsize(target),
+            "sha256": file_sha256(target),
+            "request": request,
+            "completed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        with self.lock:
+            self.entries[os.path.basename(target)] = entry
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.part"
+        with open(tmp_path, "w") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit: +1 slot after a fast request, -1 after a slow one, halved on a 429."""
+
+    def __init__(self, initial=2, minimum=1, maximum=8, target_latency=15 * 60):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.active = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        with self.condition:
+            while self.active >= self.limit:
+                self.condition.wait()
+            self.active += 1
+
+    def release(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    def on_success(self, latency):
+        with self.condition:
+            if latency <= self.target_latency:
+                self.limit = min(self.maximum, self.limit + 1)
+            else:
+                self.limit = max(self.minimum, self.limit - 1)
+            self.condition.notify_all()
+
+    def on_rate_limited(self):
+        with self.condition:
+            self.limit = max(self.minimum, self.limit // 2)
+
+
+class DownloadScheduler:
+    """Runs ERA5 download tasks with a manifest, atomic renames and adaptive concurrency.
+
+    `client_factory` builds one CDS client per worker thread (`cdsapi.Client` in production,
+    `FakeCDSClient` for local runs).
+    """
+
+    def __init__(self, output_dir, client_factory, manifest_path=None, limiter=None,
+                 max_retries=5, base_delay=60, dataset=DATASET, verify_checksums=False):
+        self.output_dir = output_dir
+        self.client_factory = client_factory
+        self.manifest = DownloadManifest(manifest_path or os.path.join(output_dir, "manifest.json"))
+        self.limiter = limiter or AdaptiveLimiter()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.dataset = dataset
+        self.verify_checksums = verify_checksums
+        self.local = threading.local()
+        os.makedirs(output_dir, exist_ok=True)
+
+    def client(self):
+        if not hasattr(self.local, "client"):
+            self.local.client = self.client_factory()
+        return self.local.client
+
+    def pending(self, tasks):
+        return [
+            task for task in tasks
+            if not all(
+                self.manifest.is_complete(t, self.verify_checksums, request=task["request"])
+                for t in task["targets"].values()
+            )
+        ]
+
+    def run(self, tasks):
+        """Downloads every task whose targets are not all in the manifest. Returns {label: status}."""
+        self._remove_stale_partials()
+        todo = self.pending(tasks)
+        print(f"📋 {len(tasks) - len(todo)} of {len(tasks)} requests already complete")
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.limiter.maximum) as executor:
+            futures = {executor.submit(self._run_task, task): task for task in todo}
+            for future in as_completed(futures):
+                label = ", ".join(os.path.basename(t) for t in futures[future]["targets"].values())
+                try:
+                    future.result()
+                    results[label] = "ok"
+                except Exception as e:
+                    print(f"❌ Failed to download {label}: {e}")
+                    results[label] = f"failed: {e}"
+        return results
+
+    def _remove_stale_partials(self):
+        """Deletes .part files left behind by an interrupted run; they are never resumed as complete."""
+        for name in os.listdir(self.output_dir):
+            if name.endswith(".part"):
+                os.remove(os.path.join(self.output_dir, name))
+
+    def _run_task(self, task):
+        request, targets = task["request"], task["targets"]
+        tmp_path = os.path.join(
+            self.output_dir, f".{os.path.basename(next(iter(targets.values())))}.{threading.get_ident()}.part"
+        )
+
+        for attempt in range(self.max_retries):
+            self.limiter.acquire()
+            try:
+                started = time.monotonic()
+                print(f"⬇️  Requesting {list(targets)} for {request['year']}-{request['month']} (limit {self.limiter.limit})")
+                self.client().retrieve(self.dataset, request, tmp_path)
+                self.limiter.on_success(time.monotonic() - started)
+                break
+            except Exception as e:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                if not is_rate_limited(e) or attempt == self.max_retries - 1:
+                    raise
+                self.limiter.on_rate_limited()
+                delay = self.base_delay * (2 ** attempt) + random.uniform(0, 10)
+                print(f"🔁 Rate limited, backing off for {delay:.1f} seconds (attempt {attempt + 1})")
+            finally:
+                self.limiter.release()
+            time.sleep(delay)
+
+        self._publish(tmp_path, targets, request)
+
+    def _publish(self, tmp_path, targets, request):
+        """Moves a finished download into place, splitting batched files into one file per variable."""
+        if len(targets) == 1:
+            target = next(iter(targets.values()))
+            os.replace(tmp_path, target)
+            self.manifest.record(target, request)
+            print(f"✅ Saved: {os.path.basename(target)}")
+            return
+
+        with NETCDF_LOCK, xr.open_dataset(tmp_path) as ds:
+            for var, target in targets.items():
+                part_path = f"{target}.part"
+                ds[[ERA5_SHORT_NAMES[var]]].to_netcdf(part_path)
+                os.replace(part_path, target)
+                self.manifest.record(target, request)
+                print(f"✅ Saved: {os.path.basename(target)}")
+        os.remove(tmp_path)
@@ -0,0 +1,110 @@
+import numpy as np
+import xarray as xr
+
+# Trailing windows in hourly steps; the store is assumed to be a contiguous hourly record
+PRECIP_WINDOWS = {"tp_24h": 24, "tp_72h": 72, "tp_7d": 24 * 7}
+TEMPERATURE_MAX_WINDOW = 24
+RAIN_THRESHOLD_M = 0.0002  # 0.2 mm in one hour counts as rain
+HALO_HOURS = max(max(PRECIP_WINDOWS.values()), TEMPERATURE_MAX_WINDOW) - 1
+
+
+def relative_humidity(t2m, d2m):
+    """Relative humidity (%) from 2 m temperature and dew point in Kelvin (Magnus formula)."""
+    t, td = t2m - 273.15, d2m - 273.15
+    rh = 100 * np.exp(17.625 * td / (243.04 + td)) / np.exp(17.625 * t / (243.04 + t))
+    return rh.clip(0, 100)
+
+
+def wind_speed(u10, v10):
+    return np.hypot(u10, v10)
+
+
+def wind_direction(u10, v10):
+    """Meteorological wind direction: degrees the wind blows from, clockwise from north."""
+    return (270 - np.degrees(np.arctan2(v10, u10))) % 360
+
+
+def instantaneous_features(ds):
+    """Features that only need the current hour."""
+    return xr.Dataset({
+        "rh": relative_humidity(ds["t2m"], ds["d2m"]).assign_attrs(units="%", long_name="Relative humidity"),
+        "wind_speed": wind_speed(ds["u10"], ds["v10"]).assign_attrs(units="m s**-1", long_name="10 m wind speed"),
+        "wind_dir": wind_direction(ds["u10"], ds["v10"]).assign_attrs(
+            units="degrees", long_name="10 m wind direction (from)"
+        ),
+    })
+
+
+def rolling_features(ds):
+    """Trailing-window precipitation sums and maximum temperature over a loaded block.
+
+    Windows are partial (min_periods=1) at the start of the block; callers pass HALO_HOURS
+    of extra history in front and then drop it, so every kept hour sees its full window.
+    """
+    features = {
+        name: ds["tp"].rolling(time=hours, min_periods=1).sum().assign_attrs(
+            units="m", long_name=f"Total precipitation over the previous {hours} h"
+        )
+        for name, hours in PRECIP_WINDOWS.items()
+    }
+    features["t2m_max_24h"] = ds["t2m"].rolling(time=TEMPERATURE_MAX_WINDOW, min_periods=1).max().assign_attrs(
+        units="K", long_name=f"Maximum 2 m temperature over the previous {TEMPERATURE_MAX_WINDOW} h"
+    )
+    return xr.Dataset(features)
+
+
+class DaysSinceRain:
+    """Days since the last rainy hour per cell, carried across consecutive time blocks.
+
+    Unlike the windowed features this has unbounded memory, so instead of a halo the index
+    of each cell's last rainy hour is kept between blocks. Cells that have not rained yet
+    count from the start of the record.
+    """
+
+    def __init__(self, shape):
+        self.last_rain = np.zeros(shape, dtype=np.int64)  # Global hour index
+        self.offset = 0
+
+    def update(self, tp):
+        """tp: (time, lat, lon) DataArray for the next block; returns days since rain per hour."""
+        n_hours = tp.sizes["time"]
+        hours = np.arange(self.offset, self.offset + n_hours)[:, None, None]
+        rained = tp.values > RAIN_THRESHOLD_M
+
+        last = np.where(rained, hours, -1)
+        last = np.maximum(np.maximum.accumulate(last, axis=0), self.last_rain[None])
+        self.last_rain = last[-1]
+        self.offset += n_hours
+
+        return xr.DataArray(
+            ((hours - last) / 24).astype(np.float32),
+            coords=tp.coords,
+            dims=tp.dims,
+            name="days_since_rain",
+            attrs={"units": "days", "long_name": f"Days since the last hour with tp > {RAIN_THRESHOLD_M} m"},
+        )
+
+
+def iter_feature_blocks(ds, time_block):
+    """Yields the raw variables plus every derived feature for consecutive time blocks.
+
+    Each block is loaded together with HALO_HOURS of preceding hours, so rolling windows are
+    exact across block boundaries while memory stays bounded by time_block + HALO_HOURS.
+    """
+    ds = ds.transpose("time", "latitude", "longitude")
+    days_since_rain = DaysSinceRain((ds.sizes["latitude"], ds.sizes["longitude"]))
+
+    for start in range(0, ds.sizes["time"], time_block):
+        stop = min(start + time_block, ds.sizes["time"])
+        halo_start = max(start - HALO_HOURS, 0)
+        window = ds.isel(time=slice(halo_start, stop)).load()
+
+        rolling = rolling_features(window).isel(time=slice(start - halo_start, None))
+        block = window.isel(time=slice(start - halo_start, None))
+        features = xr.merge([
+            block,
+            instantaneous_features(block),
+            rolling,
+            days_since_rain.update(block["tp"]).to_dataset(),
+        ])
+        yield features.astype(np.float32)
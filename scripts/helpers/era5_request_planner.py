@@ -0,0 +1,110 @@
+import calendar
+import os
+
+import numpy as np
+import pandas as pd
+
+from helpers.era5_downloader import DownloadManifest, batch_variables
+from helpers.era5_store import stored_times
+
+# CDS rejects requests above a per-request item count (variables x time steps)
+MAX_FIELDS_PER_REQUEST = 60_000
+GRID_STEP_DEGREES = 0.25  # Native ERA5 single-level resolution
+HOURS = [f"{h:02d}:00" for h in range(24)]
+
+
+def month_days(start, end):
+    """Yields (year, month, [days]) for every calendar month touched by [start, end], valid days only."""
+    start, end = pd.Timestamp(start).date(), pd.Timestamp(end).date()
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        first = start.day if (year, month) == (start.year, start.month) else 1
+        last = end.day if (year, month) == (end.year, end.month) else calendar.monthrange(year, month)[1]
+        yield year, month, list(range(first, last + 1))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def months_in_store(store_path):
+    """(year, month) pairs whose every hour is already in the merged Zarr store."""
+    times = stored_times(store_path) if store_path else np.array([], dtype="datetime64[ns]")
+    if times.size == 0:
+        return set()
+    counts = pd.Series(1, index=pd.DatetimeIndex(times)).groupby(lambda t: (t.year, t.month)).count()
+    return {
+        (year, month) for (year, month), n in counts.items()
+        if n >= calendar.monthrange(year, month)[1] * 24
+    }
+
+
+def grid_points(area, step=GRID_STEP_DEGREES):
+    north, west, south, east = area
+    return (int(round((north - south) / step)) + 1) * (int(round((east - west) / step)) + 1)
+
+
+def _already_downloaded(manifest, target, days):
+    return manifest.is_complete(target, request={"day": [f"{d:02d}" for d in days], "time": HOURS})
+
+
+def plan_requests(start, end, area, variables, output_dir, store_path=None,
+                  filename_template="era5_{var}_{year}_{month}.nc",
+                  max_fields=MAX_FIELDS_PER_REQUEST):
+    """Plans the CDS requests needed to cover [start, end] over `area` for `variables`.
+
+    One request per month and variable batch, with only the real days of the month. A
+    (variable, month) is skipped if its file is already in the download manifest with the
+    requested days, or if the whole month is already merged into `store_path`. Batches that
+    would exceed `max_fields` are split by variable.
+    """
+    manifest = DownloadManifest(os.path.join(output_dir, "manifest.json"))
+    merged_months = months_in_store(store_path)
+
+    tasks = []
+    for year, month, days in month_days(start, end):
+        if (year, month) in merged_months:
+            continue
+
+        targets = {
+            var: os.path.join(output_dir, filename_template.format(var=var, year=year, month=f"{month:02d}"))
+            for var in variables
+        }
+        missing = [var for var in variables if not _already_downloaded(manifest, targets[var], days)]
+
+        for group in batch_variables(missing):
+            steps = len(days) * len(HOURS)
+            if steps > max_fields:
+                raise ValueError(f"❌ One variable for {year}-{month:02d} is {steps} fields, over the {max_fields} limit")
+            size = max(1, max_fields // steps)
+            for i in range(0, len(group), size):
+                batch = group[i:i + size]
+                tasks.append({
+                    "request": {
+                        "product_type": "reanalysis",
+                        "format": "netcdf",
+                        "variable": batch if len(batch) > 1 else batch[0],
+                        "year": f"{year}",
+                        "month": f"{month:02d}",
+                        "day": [f"{d:02d}" for d in days],
+                        "time": HOURS,
+                        "area": list(area),
+                    },
+                    "targets": {var: targets[var] for var in batch},
+                })
+    return tasks
+
+
+def summarize_plan(tasks, label=""):
+    """Prints request count, field count and approximate download volume of a plan."""
+    fields = 0
+    volume = 0
+    for task in tasks:
+        request = task["request"]
+        n_fields = len(task["targets"]) * len(request["day"]) * len(request["time"])
+        fields += n_fields
+        volume += n_fields * grid_points(request["area"]) * 4  # float32 per grid point
+
+    prefix = f"[{label}] " if label else ""
+    print(f"🧾 {prefix}{len(tasks)} requests, {fields:,} fields, ~{volume / 1e6:,.1f} MB uncompressed")
+    for task in tasks:
+        request = task["request"]
+        print(f"   {request['year']}-{request['month']} days {request['day'][0]}–{request['day'][-1]}: {list(task['targets'])}")
+    return {"requests": len(tasks), "fields": fields, "bytes": volume}
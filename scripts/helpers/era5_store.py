@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+import xarray as xr
+
+TIME_CHUNK_HOURS = 24 * 31  # One month of hourly steps per chunk
+
+
+def normalize_time_dim(ds):
+    """Renames ERA5's `valid_time` dimension to `time` so every stage sees the same name."""
+    if "valid_time" in ds.dims and "time" not in ds.dims:
+        ds = ds.rename({"valid_time": "time"})
+    return ds
+
+
+def is_zarr_store(path):
+    return str(path).rstrip("/").endswith(".zarr")
+
+
+def open_era5(path, chunks=None):
+    """Opens an ERA5 Zarr store or NetCDF file lazily (dask-backed, nothing is read yet)."""
+    if chunks is None:
+        chunks = {}
+    if is_zarr_store(path):
+        ds = xr.open_zarr(path, chunks=chunks)
+    else:
+        ds = xr.open_dataset(path, chunks=chunks)
+    return normalize_time_dim(ds)
+
+
+def stored_times(store_path):
+    """Returns the time coordinate already written to a Zarr store (empty if it doesn't exist)."""
+    if not os.path.exists(store_path):
+        return np.array([], dtype="datetime64[ns]")
+    return xr.open_zarr(store_path)["time"].values
+
+
+def append_to_store(ds, store_path, time_chunk=TIME_CHUNK_HOURS):
+    """Writes `ds` to a chunked Zarr store, appending along `time` if the store already exists.
+
+    Blocks are written chunk by chunk, so only one time chunk per variable is ever in memory.
+    """
+    ds = normalize_time_dim(ds)
+    ds = ds.chunk({"time": time_chunk, "latitude": -1, "longitude": -1})
+
+    # Chunk/compression hints inherited from the source NetCDF files clash with the Zarr layout
+    for name in ds.variables:
+        ds[name].encoding = {
+            key: value for key, value in ds[name].encoding.items()
+            if key in ("units", "calendar", "dtype", "_FillValue", "scale_factor", "add_offset")
+        }
+
+    existing = stored_times(store_path)
+    if existing.size == 0:
+        ds.to_zarr(store_path, mode="w")
+        return
+
+    if ds["time"].values.min() <= existing.max():
+        raise ValueError(
+            f"❌ Cannot append {ds['time'].values.min()} to {store_path}: "
+            f"store already runs up to {existing.max()}"
+        )
+    ds.to_zarr(store_path, append_dim="time")
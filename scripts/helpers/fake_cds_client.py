@@ -0,0 +1,67 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from helpers.era5_downloader import ERA5_SHORT_NAMES, NETCDF_LOCK
+
+
+class FakeCDSClient:
+    """Local stand-in for `cdsapi.Client` that writes synthetic ERA5 NetCDF files.
+
+    It sleeps `latency` seconds per request and answers with a 429-style error whenever
+    more than `max_parallel` requests are in flight, so the scheduler's retry and
+    adaptive-concurrency paths can be exercised without CDS credentials.
+    """
+
+    in_flight = 0
+    lock = threading.Lock()
+
+    def __init__(self, latency=0.05, max_parallel=4, grid_step=0.25, seed=0):
+        self.latency = latency
+        self.max_parallel = max_parallel
+        self.grid_step = grid_step
+        self.rng = np.random.default_rng(seed)
+        self.requests = []
+
+    def retrieve(self, name, request, target=None):
+        with FakeCDSClient.lock:
+            if FakeCDSClient.in_flight >= self.max_parallel:
+                raise Exception("429 Client Error: Too Many Requests (temporarily limited)")
+            FakeCDSClient.in_flight += 1
+        try:
+            self.requests.append((name, request))
+            time.sleep(self.latency)
+            with NETCDF_LOCK:
+                self._dataset(request).to_netcdf(target)
+        finally:
+            with FakeCDSClient.lock:
+                FakeCDSClient.in_flight -= 1
+
+    def _dataset(self, request):
+        north, west, south, east = request["area"]
+        lats = np.arange(north, south - 1e-9, -self.grid_step)
+        lons = np.arange(west, east + 1e-9, self.grid_step)
+
+        # Like CDS, silently drop days that don't exist in the month
+        days_in_month = pd.Period(f"{request['year']}-{request['month']}").days_in_month
+        days = [int(d) for d in request["day"] if int(d) <= days_in_month]
+        hours = [int(h[:2]) for h in request["time"]]
+        times = pd.DatetimeIndex([
+            pd.Timestamp(int(request["year"]), int(request["month"]), d, h)
+            for d in days for h in hours
+        ])
+
+        variables = request["variable"]
+        if isinstance(variables, str):
+            variables = [variables]
+        shape = (len(times), len(lats), len(lons))
+        return xr.Dataset(
+            {
+                ERA5_SHORT_NAMES[var]: (("valid_time", "latitude", "longitude"), self.rng.random(shape, dtype=np.float32))
+                for var in variables
+            },
+            coords={"valid_time": times, "latitude": lats, "longitude": lons},
+        )
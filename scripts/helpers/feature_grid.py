@@ -0,0 +1,124 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from helpers.content_hash import stat_key
+from helpers.era5_store import open_era5
+from helpers.weather_join import nearest_index
+
+GRID_FILE = "features.npy"
+META_FILE = "grid.json"
+BUILD_BLOCK_HOURS = 24 * 31
+
+
+class FeatureGrid:
+    """ERA5 features as one memory-mapped (time, lat, lon, feature) float32 array.
+
+    Features are the last axis, so a point lookup reads one contiguous run of bytes and
+    only the pages that queries touch are ever loaded.
+    """
+
+    def __init__(self, values, times, latitudes, longitudes, feature_cols):
+        self.values = values
+        self.times = times
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.feature_cols = list(feature_cols)
+
+    @classmethod
+    def build(cls, source_path, cache_dir, feature_cols, block_hours=BUILD_BLOCK_HOURS):
+        """Copies `feature_cols` of an ERA5 store into the grid layout, one time block at a time."""
+        cache_dir = Path(cache_dir)
+        tmp_dir = cache_dir.with_name(cache_dir.name + ".part")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        ds = open_era5(source_path)[list(feature_cols)].transpose("time", "latitude", "longitude")
+        shape = (ds.sizes["time"], ds.sizes["latitude"], ds.sizes["longitude"], len(feature_cols))
+        values = np.lib.format.open_memmap(tmp_dir / GRID_FILE, mode="w+", dtype=np.float32, shape=shape)
+        for start in range(0, shape[0], block_hours):
+            block = ds.isel(time=slice(start, start + block_hours)).load()
+            values[start:start + block_hours] = np.stack([block[col].values for col in feature_cols], axis=-1)
+        values.flush()
+        del values
+
+        meta = {
+            "source": str(source_path),
+            "source_stat": stat_key(source_path),
+            "feature_cols": list(feature_cols),
+            "times": ds["time"].values.astype("datetime64[ns]").astype(np.int64).tolist(),
+            "latitudes": ds["latitude"].values.tolist(),
+            "longitudes": ds["longitude"].values.tolist(),
+        }
+        with open(tmp_dir / META_FILE, "w") as f:
+            json.dump(meta, f)
+
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        os.replace(tmp_dir, cache_dir)
+        return cls.load(cache_dir)
+
+    @classmethod
+    def load(cls, cache_dir):
+        cache_dir = Path(cache_dir)
+        with open(cache_dir / META_FILE) as f:
+            meta = json.load(f)
+        return cls(
+            np.load(cache_dir / GRID_FILE, mmap_mode="r"),
+            np.array(meta["times"], dtype=np.int64).view("datetime64[ns]"),
+            np.array(meta["latitudes"]),
+            np.array(meta["longitudes"]),
+            meta["feature_cols"],
+        )
+
+    @classmethod
+    def load_or_build(cls, source_path, cache_dir, feature_cols):
+        """Reuses the cached grid unless the source store or the feature list changed."""
+        meta_path = Path(cache_dir) / META_FILE
+        if meta_path.exists():
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta["feature_cols"] == list(feature_cols) and meta["source_stat"] == stat_key(source_path):
+                print(f"✅ Reusing feature grid: {cache_dir}")
+                return cls.load(cache_dir)
+        print(f"🧱 Building feature grid from {source_path} into {cache_dir}...")
+        return cls.build(source_path, cache_dir, feature_cols)
+
+    def time_indices(self, times):
+        """Index of each time's hour in the grid, -1 outside the record or for missing times."""
+        hours = pd.to_datetime(pd.Series(times), utc=True).dt.tz_localize(None).dt.floor("h")
+        hours = hours.to_numpy("datetime64[ns]")
+        index = np.clip(np.searchsorted(self.times, hours), 0, len(self.times) - 1)
+        return np.where(self.times[index] == hours, index, -1)
+
+    def lookup(self, latitudes, longitudes, times):
+        """(rows, features) matrix at the nearest cell and hour of each point, plus a validity mask."""
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        t = self.time_indices(times)
+        i = nearest_index(self.latitudes, latitudes)
+        j = nearest_index(self.longitudes, longitudes)
+
+        valid = (t >= 0) & self.contains(latitudes, longitudes)
+        X = np.full((len(t), len(self.feature_cols)), np.nan, dtype=np.float32)
+        X[valid] = self.values[t[valid], i[valid], j[valid]]
+        return X, valid & ~np.isnan(X).any(axis=1)
+
+    def contains(self, latitudes, longitudes):
+        """True for points within half a cell of the grid's extent."""
+        half_lat = np.abs(np.diff(self.latitudes)).min() / 2 if len(self.latitudes) > 1 else 0
+        half_lon = np.abs(np.diff(self.longitudes)).min() / 2 if len(self.longitudes) > 1 else 0
+        return (
+            (latitudes >= self.latitudes.min() - half_lat) & (latitudes <= self.latitudes.max() + half_lat)
+            & (longitudes >= self.longitudes.min() - half_lon) & (longitudes <= self.longitudes.max() + half_lon)
+        )
+
+    def cells_in_bbox(self, lat_min, lat_max, lon_min, lon_max):
+        """(lat, lon) arrays of every grid cell centre inside the box."""
+        lats = self.latitudes[(self.latitudes >= lat_min) & (self.latitudes <= lat_max)]
+        lons = self.longitudes[(self.longitudes >= lon_min) & (self.longitudes <= lon_max)]
+        lat_grid, lon_grid = np.meshgrid(lats, lons, indexing="ij")
+        return lat_grid.ravel(), lon_grid.ravel()
@@ -0,0 +1,176 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from helpers.fire_labeling import cover_boxes
+from helpers.weather_join import nearest_index
+
+DEFAULT_INDEX_DIR = "data/fires/fire_index"
+
+
+class FireIndex:
+    """Fire detections binned onto an ERA5 (time, lat, lon) grid.
+
+    Each occupied cell is stored once as an int64 key `(t * n_lat + y) * n_lon + x` in a
+    sorted array, so membership is a binary search and time ranges are contiguous slices.
+    Grid axes are kept in their original (ERA5) order.
+    """
+
+    def __init__(self, keys, times, latitudes, longitudes):
+        self.keys = np.asarray(keys, dtype=np.int64)
+        self.times = np.asarray(times, dtype="datetime64[ns]")
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        self.shape = (len(self.times), len(self.latitudes), len(self.longitudes))
+        self.source = ""
+
+    @classmethod
+    def from_events(cls, event_times, event_lats, event_lons, times, latitudes, longitudes):
+        """Bins detections to their hour and nearest grid cell; detections off the grid are dropped."""
+        times = np.asarray(times, dtype="datetime64[ns]")
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+
+        hours = pd.to_datetime(pd.Series(event_times), utc=True).dt.tz_localize(None).dt.floor("h")
+        hours = hours.values.astype("datetime64[ns]")
+        event_lats = np.asarray(event_lats, dtype=np.float64)
+        event_lons = np.asarray(event_lons, dtype=np.float64)
+        valid = ~(np.isnat(hours) | np.isnan(event_lats) | np.isnan(event_lons))
+        hours, event_lats, event_lons = hours[valid], event_lats[valid], event_lons[valid]
+
+        # Exact hour match on the time axis
+        time_order = np.argsort(times)
+        pos = np.clip(np.searchsorted(times[time_order], hours), 0, len(times) - 1)
+        t = time_order[pos]
+        on_grid = times[t] == hours
+
+        # Nearest cell in space, within half a grid step of the grid extent
+        y = nearest_index(latitudes, event_lats)
+        x = nearest_index(longitudes, event_lons)
+        for axis, idx, values in ((latitudes, y, event_lats), (longitudes, x, event_lons)):
+            half_step = np.abs(np.diff(np.sort(axis))).min() / 2 if len(axis) > 1 else np.inf
+            on_grid &= np.abs(axis[idx] - values) <= half_step
+
+        index = cls(np.empty(0, dtype=np.int64), times, latitudes, longitudes)
+        index.keys = np.unique(index.encode(t[on_grid], y[on_grid], x[on_grid]))
+        return index
+
+    @classmethod
+    def from_fire_df(cls, fire_df, times, latitudes, longitudes):
+        return cls.from_events(
+            fire_df["datetime"], fire_df["latitude"], fire_df["longitude"],
+            times, latitudes, longitudes,
+        )
+
+    def __len__(self):
+        return len(self.keys)
+
+    def encode(self, t, y, x):
+        _, n_lat, n_lon = self.shape
+        return (np.asarray(t, dtype=np.int64) * n_lat + y) * n_lon + x
+
+    def decode(self, keys):
+        _, n_lat, n_lon = self.shape
+        t, rest = np.divmod(keys, n_lat * n_lon)
+        y, x = np.divmod(rest, n_lon)
+        return t, y, x
+
+    def contains(self, t, y, x):
+        """Vectorized membership test for grid index triples."""
+        keys = self.encode(t, y, x)
+        if len(self.keys) == 0:
+            return np.zeros(np.shape(keys), dtype=bool)
+        pos = np.clip(np.searchsorted(self.keys, keys), 0, len(self.keys) - 1)
+        return self.keys[pos] == keys
+
+    def time_range(self, start, stop):
+        """(t, y, x) of every fire cell with start <= t < stop."""
+        _, n_lat, n_lon = self.shape
+        lo, hi = np.searchsorted(self.keys, [start * n_lat * n_lon, stop * n_lat * n_lon])
+        return self.decode(self.keys[lo:hi])
+
+    def mask(self, start=0, stop=None):
+        """Dense boolean (time, lat, lon) block of fire cells for time indices [start, stop)."""
+        stop = self.shape[0] if stop is None else stop
+        block = np.zeros((stop - start,) + self.shape[1:], dtype=bool)
+        t, y, x = self.time_range(start, stop)
+        block[t - start, y, x] = True
+        return block
+
+    def neighborhood_mask(self, time_radius=0, lat_radius=0, lon_radius=0):
+        """Boolean cube of every cell within ±radius grid steps of a fire cell on each axis."""
+        t, y, x = self.decode(self.keys)
+        bounds = [
+            (np.clip(idx - radius, 0, n), np.clip(idx + radius + 1, 0, n))
+            for idx, radius, n in zip((t, y, x), (time_radius, lat_radius, lon_radius), self.shape)
+        ]
+        return cover_boxes(self.shape, *bounds)
+
+    def matches_grid(self, times, latitudes, longitudes):
+        return (
+            np.array_equal(self.times, np.asarray(times, dtype="datetime64[ns]"))
+            and np.array_equal(self.latitudes, np.asarray(latitudes, dtype=np.float64))
+            and np.array_equal(self.longitudes, np.asarray(longitudes, dtype=np.float64))
+        )
+
+    def save(self, path, source=""):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            keys=self.keys,
+            times=self.times,
+            latitudes=self.latitudes,
+            longitudes=self.longitudes,
+            source=np.array(source),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            index = cls(data["keys"], data["times"], data["latitudes"], data["longitudes"])
+            index.source = str(data["source"])
+        return index
+
+
+def source_fingerprint(path):
+    """Cheap identity of a fire CSV/Parquet: path, size and modification time."""
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def grid_key(times, latitudes, longitudes):
+    """Short digest of the grid axes, so indexes for different grids get different files."""
+    digest = hashlib.sha256()
+    for axis, dtype in ((times, "datetime64[ns]"), (latitudes, np.float64), (longitudes, np.float64)):
+        digest.update(np.ascontiguousarray(axis, dtype=dtype).tobytes())
+    return digest.hexdigest()[:12]
+
+
+def default_index_path(fire_path, times, latitudes, longitudes, index_dir=DEFAULT_INDEX_DIR):
+    """One index file per fire source and grid: <index_dir>/<fire file stem>-<grid key>.npz."""
+    stem = os.path.splitext(os.path.basename(fire_path))[0]
+    return os.path.join(index_dir, f"{stem}-{grid_key(times, latitudes, longitudes)}.npz")
+
+
+def load_or_build_fire_index(fire_path, times, latitudes, longitudes, fire_df=None, index_path=None):
+    """Loads the persisted index if it was built from the same fire file onto the same grid, else rebuilds it."""
+    source = source_fingerprint(fire_path)
+    if index_path is None:
+        index_path = default_index_path(fire_path, times, latitudes, longitudes)
+    if os.path.exists(index_path):
+        index = FireIndex.load(index_path)
+        if index.source == source and index.matches_grid(times, latitudes, longitudes):
+            print(f"✅ Reusing fire index: {index_path} ({len(index)} cells)")
+            return index
+
+    print(f"🗂️  Building fire index from {fire_path}...")
+    if fire_df is None:
+        fire_df = pd.read_csv(fire_path, parse_dates=["datetime"])
+    index = FireIndex.from_fire_df(fire_df, times, latitudes, longitudes)
+    index.save(index_path, source=source)
+    print(f"💾 Saved fire index: {index_path} ({len(index)} cells)")
+    return index
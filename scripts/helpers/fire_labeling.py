@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+def _window_bounds(coords, centers, tolerance):
+    """Returns [start, stop) index ranges of sorted `coords` within ±tolerance of each center."""
+    start = np.searchsorted(coords, centers - tolerance, side="left")
+    stop = np.searchsorted(coords, centers + tolerance, side="right")
+
+    # Searchsorted on shifted values can disagree with |coord - center| <= tolerance
+    # by one float ulp at the window edges, so nudge each bound by one step.
+    n = len(coords)
+    before = np.clip(start - 1, 0, n - 1)
+    start = np.where((start > 0) & (np.abs(coords[before] - centers) <= tolerance), start - 1, start)
+    first = np.clip(start, 0, n - 1)
+    start = np.where((start < n) & (np.abs(coords[first] - centers) > tolerance), start + 1, start)
+
+    after = np.clip(stop, 0, n - 1)
+    stop = np.where((stop < n) & (np.abs(coords[after] - centers) <= tolerance), stop + 1, stop)
+    last = np.clip(stop - 1, 0, n - 1)
+    stop = np.where((stop > 0) & (np.abs(coords[last] - centers) > tolerance), stop - 1, stop)
+
+    return start, stop
+
+
+def _sorted_axis(values):
+    """Returns ascending coordinate values and the permutation that restores the original order."""
+    order = np.argsort(values, kind="stable")
+    if np.array_equal(order, np.arange(len(values))):
+        return values, None
+    return values[order], np.argsort(order, kind="stable")
+
+
+def cover_boxes(shape, *bounds):
+    """Boolean (time, lat, lon) mask of the union of boxes given as ([start], [stop]) index arrays per axis.
+
+    All boxes are scattered into a 3-D difference array (inclusion-exclusion over the 8
+    corners) and turned into coverage counts with three in-place cumulative sums.
+    """
+    (t0, t1), (y0, y1), (x0, x1) = bounds
+    diff = np.zeros(tuple(n + 1 for n in shape), dtype=np.int32)
+    for ti, tsign in ((t0, 1), (t1, -1)):
+        for yi, ysign in ((y0, 1), (y1, -1)):
+            for xi, xsign in ((x0, 1), (x1, -1)):
+                np.add.at(diff, (ti, yi, xi), tsign * ysign * xsign)
+
+    for axis in range(3):
+        np.cumsum(diff, axis=axis, out=diff)
+    return diff[:-1, :-1, :-1] > 0
+
+
+def label_fire_events(
+    template,
+    fire_df,
+    time_tolerance_hours=1,
+    spatial_tolerance_degrees=0.25,
+    time_dim="time",
+    lat_dim="latitude",
+    lon_dim="longitude",
+):
+    """Labels every ERA5 cell within the time/space tolerance of a fire event in one batched pass.
+
+    Each event covers a box of (time, lat, lon) index ranges and all boxes are painted at
+    once with `cover_boxes`, so the cost is O(events + grid) instead of O(events x grid).
+    """
+    events = fire_df[["datetime", "latitude", "longitude"]].dropna()
+    event_times = pd.to_datetime(events["datetime"], utc=True).dt.tz_localize(None).dt.round("h")
+
+    times, time_restore = _sorted_axis(template[time_dim].values.astype("datetime64[ns]").astype(np.int64))
+    lats, lat_restore = _sorted_axis(template[lat_dim].values.astype(np.float64))
+    lons, lon_restore = _sorted_axis(template[lon_dim].values.astype(np.float64))
+
+    tolerance_ns = int(time_tolerance_hours * 3600 * 1e9)
+    t0, t1 = _window_bounds(times, event_times.values.astype("datetime64[ns]").astype(np.int64), tolerance_ns)
+    y0, y1 = _window_bounds(lats, events["latitude"].to_numpy(np.float64), spatial_tolerance_degrees)
+    x0, x1 = _window_bounds(lons, events["longitude"].to_numpy(np.float64), spatial_tolerance_degrees)
+
+    # Events whose window misses the grid on any axis label nothing
+    hit = (t0 < t1) & (y0 < y1) & (x0 < x1)
+    t0, t1, y0, y1, x0, x1 = (a[hit] for a in (t0, t1, y0, y1, x0, x1))
+
+    labels = cover_boxes((len(times), len(lats), len(lons)), (t0, t1), (y0, y1), (x0, x1))
+
+    # Back to the template's coordinate order (ERA5 latitudes are descending)
+    if time_restore is not None:
+        labels = labels[time_restore]
+    if lat_restore is not None:
+        labels = labels[:, lat_restore]
+    if lon_restore is not None:
+        labels = labels[:, :, lon_restore]
+
+    fire_label = xr.DataArray(
+        labels,
+        coords={
+            time_dim: template[time_dim],
+            lat_dim: template[lat_dim],
+            lon_dim: template[lon_dim],
+        },
+        dims=(time_dim, lat_dim, lon_dim),
+        name="fire_label",
+    )
+    fire_label = fire_label.broadcast_like(template).transpose(*template.dims)
+    return fire_label.assign_coords(template.coords).rename("fire_label")
@@ -0,0 +1,159 @@
+import json
+
+import numpy as np
+import pandas as pd
+import folium
+from folium.plugins import FastMarkerCluster, HeatMap
+
+CONFIDENCE_LEVELS = ["unknown", "low", "nominal", "high"]
+CONFIDENCE_COLORS = ["gray", "yellow", "orange", "red"]
+
+# Above this many detections a marker layer shows one marker per grid cell instead of one per fire
+MAX_MARKER_POINTS = 50_000
+MARKER_CELL_DEGREES = 0.01
+HEAT_CELL_DEGREES = 0.05
+
+
+def confidence_codes(confidence):
+    """Index into CONFIDENCE_LEVELS for MODIS (0-100) and VIIRS (l/n/h or low/nominal/high) values."""
+    text = confidence.astype(str).str.lower().str.strip()
+    codes = text.map({"l": 1, "low": 1, "n": 2, "nominal": 2, "h": 3, "high": 3})
+    numeric = pd.to_numeric(confidence, errors="coerce")
+    numeric_codes = pd.Series(
+        np.select([numeric < 30, numeric < 80, numeric <= 100], [1, 2, 3], default=0),
+        index=confidence.index,
+    )
+    return codes.fillna(numeric_codes.where(numeric.notna(), 0)).astype(np.int8)
+
+
+def aggregate_cells(df, cell_degrees, extra=None):
+    """Snaps detections to `cell_degrees` cells and returns one row per cell with its count."""
+    cells = pd.DataFrame({
+        "latitude": (df["latitude"] / cell_degrees).round() * cell_degrees,
+        "longitude": (df["longitude"] / cell_degrees).round() * cell_degrees,
+    })
+    agg = {"count": ("latitude", "size")}
+    for column, how in (extra or {}).items():
+        cells[column] = df[column].to_numpy()
+        agg[column] = (column, how)
+    return cells.groupby(["latitude", "longitude"], as_index=False).agg(**agg)
+
+
+def _confidence_codes(df):
+    """confidence_codes of the frame's confidence column; all 0 ("unknown") when there is none."""
+    return confidence_codes(df["confidence"]) if "confidence" in df else np.zeros(len(df), np.int8)
+
+
+def marker_payload(df):
+    """Compact per-detection rows [lat, lon, confidence, brightness, day, satellite] plus lookup tables.
+
+    Strings are replaced by small integer codes and dates by a day offset, so each marker
+    costs a few bytes of JSON instead of an HTML popup.
+    """
+    dates = pd.to_datetime(df["acq_date"], errors="coerce")
+    base_date = dates.min()
+    days = ((dates - base_date).dt.days.fillna(-1)).astype(np.int32)
+    satellite_codes, satellites = pd.factorize(df.get("satellite", pd.Series("n/a", index=df.index)).astype(str))
+    brightness = df["brightness"].round(1) if "brightness" in df else pd.Series(np.nan, index=df.index)
+
+    rows = np.column_stack([
+        df["latitude"].round(4),
+        df["longitude"].round(4),
+        _confidence_codes(df),
+        brightness.fillna(-1),
+        days,
+        satellite_codes,
+    ]).tolist()
+    lookups = {
+        "levels": CONFIDENCE_LEVELS,
+        "colors": CONFIDENCE_COLORS,
+        "satellites": list(satellites),
+        "baseDate": base_date.strftime("%Y-%m-%d") if pd.notna(base_date) else None,
+    }
+    return rows, lookups
+
+
+def _point_callback(lookups):
+    return f"""
+    var lookups = {json.dumps(lookups)};
+    var callback = function (row) {{
+        var level = lookups.levels[row[2]];
+        var date = "n/a";
+        if (lookups.baseDate !== null && row[4] >= 0) {{
+            var d = new Date(lookups.baseDate + "T00:00:00Z");
+            d.setUTCDate(d.getUTCDate() + row[4]);
+            date = d.toISOString().slice(0, 10);
+        }}
+        var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {{
+            radius: 4, color: lookups.colors[row[2]], fill: true, fillOpacity: 0.7
+        }});
+        marker.bindPopup(function () {{
+            return "<b>Confidence:</b> " + level.charAt(0).toUpperCase() + level.slice(1) + "<br>" +
+                   "<b>Brightness:</b> " + (row[3] < 0 ? "n/a" : row[3]) + "<br>" +
+                   "<b>Date:</b> " + date + "<br>" +
+                   "<b>Satellite:</b> " + lookups.satellites[row[5]];
+        }}, {{maxWidth: 300}});
+        return marker;
+    }};
+    """
+
+
+def _cell_callback():
+    return f"""
+    var colors = {json.dumps(CONFIDENCE_COLORS)};
+    var callback = function (row) {{
+        var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {{
+            radius: Math.min(4 + Math.log(row[2]), 12), color: colors[row[3]], fill: true, fillOpacity: 0.7
+        }});
+        marker.bindPopup(function () {{ return "<b>Detections in cell:</b> " + row[2]; }});
+        return marker;
+    }};
+    """
+
+
+def add_fire_markers(parent, df, name, show=True, max_points=MAX_MARKER_POINTS):
+    """Adds a client-side clustered marker layer; switches to per-cell markers for large inputs."""
+    if len(df) <= max_points:
+        rows, lookups = marker_payload(df)
+        callback = _point_callback(lookups)
+    else:
+        df = df.assign(confidence_code=_confidence_codes(df))
+        cells = aggregate_cells(df, MARKER_CELL_DEGREES, extra={"confidence_code": "max"})
+        rows = cells[["latitude", "longitude", "count", "confidence_code"]].round(4).values.tolist()
+        callback = _cell_callback()
+        name = f"{name} (per {MARKER_CELL_DEGREES}° cell)"
+    return FastMarkerCluster(rows, callback=callback, name=name, show=show).add_to(parent)
+
+
+def add_cell_heatmap(parent, df, name="Fire Heatmap", cell_degrees=HEAT_CELL_DEGREES, **kwargs):
+    """HeatMap over detection counts pre-aggregated to grid cells.
+
+    Leaflet.heat saturates at a weight of 1, so cell counts are log-scaled into (0, 1].
+    """
+    cells = aggregate_cells(df.dropna(subset=["latitude", "longitude"]), cell_degrees)
+    cells["weight"] = np.log1p(cells["count"]) / np.log1p(max(cells["count"].max(), 1))
+    points = cells[["latitude", "longitude", "weight"]].round(4).values.tolist()
+    return HeatMap(points, name=name, **kwargs).add_to(parent)
+
+
+def add_time_sliced_markers(parent, df, freq="M"):
+    """One toggleable marker layer per period (e.g. month); only the latest is shown on load."""
+    periods = pd.to_datetime(df["acq_date"], errors="coerce").dt.to_period(freq)
+    groups = list(df.groupby(periods, sort=True))
+    for i, (period, group) in enumerate(groups):
+        add_fire_markers(parent, group, name=f"Fires {period}", show=i == len(groups) - 1)
+    return len(groups)
+
+
+def confidence_legend():
+    return folium.Element("""
+<div style="position: fixed;
+     bottom: 50px; left: 50px; width: 150px; height: 120px;
+     border:2px solid grey; z-index:9999; font-size:14px;
+     background-color:white; padding: 10px;">
+     <b>Confidence Level</b><br>
+     🔴 High<br>
+     🟠 Nominal<br>
+     🟡 Low
+</div>
+""")
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+NS_PER_MINUTE = 60 * 10**9
+
+
+def acq_time_minutes(acq_time):
+    """Minutes after midnight for FIRMS acq_time values, NaN where the value is not a valid time.
+
+    Accepts every variant seen across MODIS and VIIRS files: integers (930), zero-padded
+    strings ("0930"), colon-separated strings ("09:30") and floats read from CSV (930.0).
+    Only the distinct values are parsed, then broadcast back to the column.
+    """
+    codes, uniques = pd.factorize(pd.Series(acq_time), use_na_sentinel=True)
+    if len(uniques) == 0:  # Every value missing
+        return np.full(len(codes), np.nan)
+    text = pd.Series(uniques).astype(str).str.strip().str.replace(":", "", regex=False)
+    hhmm = pd.to_numeric(text, errors="coerce").to_numpy(np.float64)
+
+    hours, minutes = np.divmod(hhmm, 100)
+    valid = (hhmm >= 0) & (hhmm == np.floor(hhmm)) & (hours < 24) & (minutes < 60)
+    unique_minutes = np.where(valid, hours * 60 + minutes, np.nan)
+    return np.where(codes >= 0, unique_minutes[np.maximum(codes, 0)], np.nan)
+
+
+def acq_date_days(acq_date):
+    """datetime64[ns] midnight of each FIRMS acq_date (strings or datetimes), NaT if unparseable."""
+    acq_date = pd.Series(acq_date)
+    if pd.api.types.is_datetime64_any_dtype(acq_date):
+        if acq_date.dt.tz is not None:
+            acq_date = acq_date.dt.tz_convert("UTC").dt.tz_localize(None)
+        return acq_date.dt.normalize().to_numpy("datetime64[ns]")
+
+    codes, uniques = pd.factorize(acq_date, use_na_sentinel=True)
+    if len(uniques) == 0:  # Every value missing
+        return np.full(len(codes), np.datetime64("NaT"), dtype="datetime64[ns]")
+    unique_days = pd.to_datetime(pd.Series(uniques).astype(str), format="%Y-%m-%d", errors="coerce")
+    unique_days = unique_days.to_numpy("datetime64[ns]")
+    days = unique_days[np.maximum(codes, 0)]
+    days[codes < 0] = np.datetime64("NaT")
+    return days
+
+
+def fire_datetimes(acq_date, acq_time, utc=True):
+    """UTC detection timestamps built from acq_date + acq_time with whole-column integer arithmetic."""
+    days = acq_date_days(acq_date).astype(np.int64)
+    minutes = acq_time_minutes(acq_time)
+
+    missing = (days == np.iinfo(np.int64).min) | np.isnan(minutes)
+    ns = days + np.nan_to_num(minutes).astype(np.int64) * NS_PER_MINUTE
+    ns[missing] = np.iinfo(np.int64).min  # NaT
+
+    index = acq_date.index if isinstance(acq_date, pd.Series) else None
+    result = pd.Series(ns.view("datetime64[ns]"), index=index)
+    return result.dt.tz_localize("UTC") if utc else result
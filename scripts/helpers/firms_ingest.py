@@ -0,0 +1,165 @@
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from helpers.dtype_policy import FIRMS_DTYPES
+from helpers.fire_timestamps import acq_time_minutes
+
+# VIIRS reports confidence as l/n/h instead of MODIS' 0-100; map it onto the same scale
+VIIRS_CONFIDENCE = {"l": 0, "low": 0, "n": 50, "nominal": 50, "h": 100, "high": 100}
+
+CHUNK_ROWS = 1_000_000
+MANIFEST_NAME = "_ingested.json"
+INGEST_VERSION = 2  # Bump when the Parquet schema or parsing changes, so old partitions are rebuilt
+
+
+def confidence_score(confidence):
+    """Numeric 0-100 confidence for MODIS (already numeric) and VIIRS (l/n/h) detections."""
+    numeric = pd.to_numeric(confidence, errors="coerce")
+    letters = confidence.str.lower().map(VIIRS_CONFIDENCE)
+    return numeric.fillna(letters)
+
+
+def normalized_acq_time(acq_time):
+    """acq_time as HHMM integers (nullable Int16), whichever of 930 / "0930" / "09:30" the file uses."""
+    minutes = acq_time_minutes(acq_time)
+    hhmm = np.floor_divide(minutes, 60) * 100 + np.mod(minutes, 60)
+    return pd.array(np.where(np.isnan(hhmm), pd.NA, hhmm), dtype="Int16")
+
+
+def filter_chunk(chunk, bbox, years=None, min_confidence=None):
+    """Applies the bounding-box, year and confidence filters to one CSV chunk.
+
+    Rows whose acq_date can't be parsed are dropped (and counted) rather than failing the file.
+    """
+    lat_min, lat_max, lon_min, lon_max = bbox
+    mask = chunk["latitude"].between(lat_min, lat_max) & chunk["longitude"].between(lon_min, lon_max)
+    chunk = chunk[mask]
+
+    dates = pd.to_datetime(chunk["acq_date"].astype("string").str.strip(), format="%Y-%m-%d", errors="coerce")
+    bad_dates = dates.isna()
+    if bad_dates.any():
+        print(f"⚠️  Dropped {int(bad_dates.sum())} rows with an unparseable acq_date")
+        chunk, dates = chunk[~bad_dates], dates[~bad_dates]
+    if years is not None:
+        keep = dates.dt.year.isin(list(years))
+        chunk, dates = chunk[keep], dates[keep]
+    if min_confidence is not None:
+        keep = confidence_score(chunk["confidence"]) >= min_confidence
+        chunk, dates = chunk[keep], dates[keep]
+
+    chunk = chunk.copy()
+    if "acq_time" in chunk:
+        chunk["acq_time"] = normalized_acq_time(chunk["acq_time"])
+    chunk["year"] = dates.dt.year.astype("int16")
+    chunk["month"] = dates.dt.month.astype("int8")
+    return chunk
+
+
+def _fingerprint(path, bbox, years, min_confidence):
+    stat = os.stat(path)
+    return {
+        "version": INGEST_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "bbox": list(bbox),
+        "years": sorted(years) if years is not None else None,
+        "min_confidence": min_confidence,
+    }
+
+
+def _remove_outputs(output_root, stem):
+    for path in glob.glob(os.path.join(output_root, "year=*", "month=*", f"{stem}-*.parquet")):
+        os.remove(path)
+
+
+def ingest_csv(path, output_root, bbox, years=None, min_confidence=None, chunk_rows=CHUNK_ROWS):
+    """Streams one FIRMS CSV through the filters into year/month-partitioned Parquet. Returns rows kept."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    _remove_outputs(output_root, stem)
+
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {col: dtype for col, dtype in FIRMS_DTYPES.items() if col in header}
+
+    n_rows = 0
+    reader = pd.read_csv(path, dtype=dtypes, chunksize=chunk_rows)  # Every column, known ones compacted
+    for i, chunk in enumerate(reader):
+        chunk = filter_chunk(chunk, bbox, years, min_confidence)
+        if chunk.empty:
+            continue
+        pq.write_to_dataset(
+            pa.Table.from_pandas(chunk, preserve_index=False),
+            root_path=output_root,
+            partition_cols=["year", "month"],
+            basename_template=f"{stem}-{i:05d}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        n_rows += len(chunk)
+    return n_rows
+
+
+def _ingest_task(args):
+    path, output_root, bbox, years, min_confidence = args
+    return path, ingest_csv(path, output_root, bbox, years, min_confidence)
+
+
+def ingest_firms(csv_paths, output_root, bbox, years=None, min_confidence=None, max_workers=None):
+    """Filters many FIRMS CSVs into one partitioned Parquet dataset, one process per file.
+
+    Files whose size, mtime, filter settings and ingest version match the last run are
+    skipped, so repeat runs only touch new or changed CSVs.
+    """
+    os.makedirs(output_root, exist_ok=True)
+    manifest_path = os.path.join(output_root, MANIFEST_NAME)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    todo = []
+    for path in csv_paths:
+        key = os.path.abspath(path)
+        if manifest.get(key, {}).get("fingerprint") == _fingerprint(path, bbox, years, min_confidence):
+            print(f"✅ Already ingested: {path}")
+        else:
+            todo.append(path)
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            tasks = [(path, output_root, bbox, years, min_confidence) for path in todo]
+            for path, n_rows in executor.map(_ingest_task, tasks):
+                print(f"📄 Ingested {path}: {n_rows} records kept")
+                manifest[os.path.abspath(path)] = {
+                    "fingerprint": _fingerprint(path, bbox, years, min_confidence),
+                    "rows": n_rows,
+                }
+
+        tmp_path = f"{manifest_path}.part"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    return read_fires(output_root, csv_paths)
+
+
+def read_fires(output_root, sources=None, years=None):
+    """Loads the partitioned fire Parquet as one DataFrame, optionally only some source CSVs or years."""
+    files = sorted(glob.glob(os.path.join(output_root, "year=*", "month=*", "*.parquet")))
+    if sources is not None:
+        stems = {os.path.splitext(os.path.basename(p))[0] for p in sources}
+        files = [f for f in files if os.path.basename(f).rsplit("-", 2)[0] in stems]
+    if years is not None:
+        files = [f for f in files if int(f.split("year=")[1].split(os.sep)[0]) in years]
+    if not files:
+        dtypes = {**FIRMS_DTYPES, "acq_time": "Int16"}  # Normalized by filter_chunk
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in dtypes.items()})
+
+    df = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+    categories = {col: "category" for col, dtype in FIRMS_DTYPES.items() if dtype == "category" and col in df}
+    return df.astype(categories)
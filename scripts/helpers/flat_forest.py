@@ -0,0 +1,273 @@
+import json
+import os
+import shutil
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+FORMAT_VERSION = 1
+META_FILE = "forest.json"
+ARRAYS = ("left", "feature", "threshold", "missing_right", "value", "roots")
+BATCH_ROWS = 512  # NumPy walk: rows walked through every tree at once; keeps the index arrays in cache
+COMPILED_BATCH_ROWS = 16_384  # Compiled walk: rows per thread task
+WALK_BLOCK = 64  # Compiled walk: rows stepped together through one tree, so their node loads overlap
+LEAF_CHECK_LEVELS = 4  # Levels between dropping (row, tree) pairs that have reached a leaf
+SETTLE_FRACTION = 0.25  # NumPy walk: only compact once this share of pairs is done...
+MIN_SETTLE_PAIRS = 8192  # ...and enough pairs remain for compaction to outweigh its per-call overhead
+
+
+def _floor_float32(threshold):
+    """Largest float32 <= each float64 threshold.
+
+    sklearn compares float32 features with float64 thresholds; for a float32 x,
+    x <= t exactly when x <= floor32(t), so float32 thresholds give identical splits.
+    """
+    rounded = threshold.astype(np.float32)
+    return np.where(rounded > threshold, np.nextafter(rounded, np.float32(-np.inf)), rounded).astype(np.float32)
+
+
+def _flatten_tree(tree):
+    """One fitted sklearn tree in breadth-first order with siblings adjacent (right = left + 1).
+
+    Leaves point to themselves with an infinite threshold, so walking past a leaf stays on it.
+    """
+    n_nodes = tree.node_count
+    children_left, children_right = tree.children_left, tree.children_right
+    new_id = np.zeros(n_nodes, dtype=np.int64)
+    next_id = 1
+    queue = deque([0])
+    while queue:
+        node = queue.popleft()
+        if children_left[node] >= 0:
+            new_id[children_left[node]] = next_id
+            new_id[children_right[node]] = next_id + 1
+            next_id += 2
+            queue.extend((children_left[node], children_right[node]))
+
+    old_id = np.argsort(new_id)
+    is_leaf = children_left[old_id] < 0
+    left = np.where(is_leaf, np.arange(n_nodes), new_id[np.maximum(children_left[old_id], 0)])
+    value = tree.value[old_id, 0, :]
+    missing_left = getattr(tree, "missing_go_to_left", np.ones(n_nodes, dtype=np.uint8))[old_id]
+    return {
+        "left": left,
+        "feature": np.where(is_leaf, 0, tree.feature[old_id]),
+        "threshold": np.where(is_leaf, np.inf, tree.threshold[old_id]),
+        "missing_right": ~is_leaf & (missing_left == 0),
+        "value": value / value.sum(axis=1, keepdims=True),
+    }
+
+
+def _walk_forest(X, left, feature, threshold, missing_right, value, roots, max_depth, has_missing, out):
+    """Adds every tree's leaf probabilities for each row of X into out (rows, classes).
+
+    Tree by tree, blocks of WALK_BLOCK rows step down one level at a time without branching
+    (leaves loop back to themselves). Every LEAF_CHECK_LEVELS levels, rows that have reached
+    a leaf are swapped out of the block, so deep, unbalanced trees stop costing max_depth steps.
+    """
+    n_rows, n_features = X.shape
+    flat_X = X.ravel()
+    node = np.empty(WALK_BLOCK, np.int32)
+    offset = np.empty(WALK_BLOCK, np.int64)
+    for tree in range(roots.shape[0]):
+        for start in range(0, n_rows, WALK_BLOCK):
+            m = min(WALK_BLOCK, n_rows - start)
+            for k in range(m):
+                node[k] = roots[tree]
+                offset[k] = (start + k) * n_features
+            level = 0
+            while m > 0 and level < max_depth:
+                steps = min(LEAF_CHECK_LEVELS, max_depth - level)
+                for _ in range(steps):
+                    for k in range(m):
+                        nd = node[k]
+                        x = flat_X[offset[k] + feature[nd]]
+                        go_right = x > threshold[nd]
+                        if has_missing:
+                            go_right |= (x != x) & missing_right[nd]
+                        node[k] = left[nd] + go_right
+                level += steps
+                k = 0
+                while k < m:
+                    nd = node[k]
+                    if left[nd] == nd:
+                        row = offset[k] // n_features
+                        for c in range(value.shape[0]):
+                            out[row, c] += value[c, nd]
+                        m -= 1
+                        node[k], offset[k] = node[m], offset[m]
+                    else:
+                        k += 1
+            for k in range(m):
+                row = offset[k] // n_features
+                for c in range(value.shape[0]):
+                    out[row, c] += value[c, node[k]]
+
+
+if numba is not None:
+    _walk_forest = numba.njit(nogil=True, cache=True, error_model="numpy")(_walk_forest)
+
+
+class FlatForest:
+    """A fitted RandomForestClassifier as contiguous node arrays, scored with vectorized NumPy.
+
+    With numba installed, rows are scored by a compiled walk (_walk_forest) that is faster
+    than sklearn's on batches of any size. Without it, every row walks every tree one level
+    per step as a handful of NumPy gathers, which still beats sklearn's per-tree overhead on
+    small batches. Saved as .npy files that load memory-mapped, which makes opening a model
+    near-instant.
+    """
+
+    def __init__(self, arrays, classes, n_features, max_depth, feature_cols=None, n_jobs=1):
+        self.left = arrays["left"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.missing_right = arrays["missing_right"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.classes_ = np.asarray(classes)
+        self.n_features_in_ = n_features
+        self.max_depth = max_depth
+        self.feature_cols = feature_cols
+        self.n_jobs = n_jobs
+        self._intp_nodes = None  # (left, feature) as intp for the NumPy walk, built on first use
+
+    @classmethod
+    def from_sklearn(cls, model, feature_cols=None):
+        trees = [_flatten_tree(estimator.tree_) for estimator in model.estimators_]
+        sizes = np.array([len(tree["left"]) for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        if sizes.sum() >= np.iinfo(np.int32).max:
+            raise ValueError(f"❌ Forest has {sizes.sum()} nodes, too many for int32 node indices")
+
+        arrays = {
+            "left": np.concatenate([tree["left"] + offset for tree, offset in zip(trees, offsets)]).astype(np.int32),
+            "feature": np.concatenate([tree["feature"] for tree in trees]).astype(np.int32),
+            "threshold": _floor_float32(np.concatenate([tree["threshold"] for tree in trees])),
+            "missing_right": np.concatenate([tree["missing_right"] for tree in trees]),
+            # One contiguous row of leaf probabilities per class
+            "value": np.ascontiguousarray(np.concatenate([tree["value"] for tree in trees]).T),
+            "roots": offsets.astype(np.int32),
+        }
+        max_depth = max(estimator.tree_.max_depth for estimator in model.estimators_)
+        if feature_cols is None and hasattr(model, "feature_names_in_"):
+            feature_cols = list(model.feature_names_in_)
+        return cls(arrays, model.classes_, model.n_features_in_, max_depth, feature_cols, getattr(model, "n_jobs", 1))
+
+    def save(self, path):
+        """Writes one .npy per array plus forest.json, swapped into place when complete."""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".part")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+        for name in ARRAYS:
+            np.save(tmp_path / f"{name}.npy", getattr(self, name))
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "classes": self.classes_.tolist(),
+            "n_features": int(self.n_features_in_),
+            "n_trees": len(self.roots),
+            "n_nodes": len(self.left),
+            "max_depth": int(self.max_depth),
+            "feature_cols": self.feature_cols,
+        }
+        with open(tmp_path / META_FILE, "w") as f:
+            json.dump(meta, f, indent=2)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        path = Path(path)
+        with open(path / META_FILE) as f:
+            meta = json.load(f)
+        if meta["format_version"] != FORMAT_VERSION:
+            raise ValueError(
+                f"❌ {path} is flat forest format {meta['format_version']}, expected {FORMAT_VERSION}; re-export it"
+            )
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r" if mmap else None) for name in ARRAYS}
+        return cls(arrays, meta["classes"], meta["n_features"], meta["max_depth"], meta["feature_cols"])
+
+    def _predict_batch(self, X, left, feature):
+        """NumPy walk of one batch: all (row, tree) pairs step down together, tree-major.
+
+        `left` and `feature` are the node arrays as intp, which np.take uses without converting.
+        """
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        has_missing = np.isnan(flat_X).any()
+
+        node = np.repeat(self.roots.astype(np.intp), n_rows)
+        offset = np.tile(np.arange(n_rows, dtype=np.intp) * n_features, len(self.roots))
+        out = np.zeros((len(self.value), n_rows))
+        level = 0
+        while len(node):
+            for _ in range(min(LEAF_CHECK_LEVELS, self.max_depth - level)):
+                x = np.take(flat_X, offset + np.take(feature, node, mode="clip"), mode="clip")
+                go_right = x > np.take(self.threshold, node, mode="clip")
+                if has_missing:
+                    go_right |= np.isnan(x) & np.take(self.missing_right, node, mode="clip")
+                node = np.take(left, node, mode="clip")
+                node += go_right
+            level += LEAF_CHECK_LEVELS
+
+            # Settle pairs that have reached a leaf and keep walking the rest, once enough have
+            if level >= self.max_depth:
+                done = np.ones(len(node), dtype=bool)
+            elif len(node) < MIN_SETTLE_PAIRS:
+                continue
+            else:
+                done = np.take(left, node, mode="clip") == node
+                if done.mean() < SETTLE_FRACTION:
+                    continue
+            rows = offset[done] // n_features
+            for class_out, class_value in zip(out, self.value):
+                class_out += np.bincount(rows, weights=np.take(class_value, node[done]), minlength=n_rows)
+            node, offset = node[~done], offset[~done]
+        return (out / len(self.roots)).T
+
+    def _predict_compiled(self, X):
+        out = np.zeros((len(X), len(self.classes_)))
+        _walk_forest(
+            X, np.asarray(self.left), np.asarray(self.feature), np.asarray(self.threshold),
+            np.asarray(self.missing_right), np.asarray(self.value), np.asarray(self.roots),
+            int(self.max_depth), bool(np.isnan(X).any()), out,
+        )
+        return out / len(self.roots)
+
+    def predict_proba(self, X):
+        """Class probabilities averaged over trees, equal to sklearn's up to float rounding."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"❌ Expected (rows, {self.n_features_in_}) features, got shape {X.shape}")
+
+        if numba is not None:
+            predict_batch, batch_rows = self._predict_compiled, COMPILED_BATCH_ROWS
+        else:
+            if self._intp_nodes is None:
+                self._intp_nodes = (self.left.astype(np.intp), self.feature.astype(np.intp))
+            predict_batch = partial(self._predict_batch, left=self._intp_nodes[0], feature=self._intp_nodes[1])
+            batch_rows = BATCH_ROWS
+        batches = [X[start:start + batch_rows] for start in range(0, len(X), batch_rows)]
+        n_jobs = os.cpu_count() if self.n_jobs in (None, -1) else max(int(self.n_jobs), 1)
+        if n_jobs == 1 or len(batches) < 2:
+            results = [predict_batch(batch) for batch in batches]
+        else:
+            # Both walks release the GIL (NumPy gathers, nogil kernel), so threads score batches in parallel
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                results = list(executor.map(predict_batch, batches))
+        if not results:
+            return np.empty((0, len(self.classes_)))
+        return np.concatenate(results)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
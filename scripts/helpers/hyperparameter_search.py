@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.stats import loguniform, randint
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import HalvingRandomSearchCV
+
+# Each model: estimator, sampled parameters, and the resource successive halving grows per round.
+# Forests start with a few trees and only the best configs get more; logistic grows its sample.
+SEARCH_SPACES = {
+    "random_forest": {
+        "estimator": lambda seed: RandomForestClassifier(random_state=seed, n_jobs=1),
+        "params": {
+            "max_depth": [6, 8, 12, 16, None],
+            "min_samples_leaf": randint(1, 20),
+            "max_features": ["sqrt", "log2", 0.5, None],
+            "max_samples": [None, 0.5, 0.8],
+            "class_weight": ["balanced", "balanced_subsample", None],
+        },
+        "resource": "n_estimators",
+        "min_resources": 25,
+        "max_resources": 400,
+    },
+    "logistic": {
+        "estimator": lambda seed: LogisticRegression(solver="liblinear", max_iter=1000, random_state=seed),
+        "params": {
+            "C": loguniform(1e-3, 1e2),
+            "penalty": ["l1", "l2"],
+            "class_weight": ["balanced", None],
+        },
+        "resource": "n_samples",
+        "min_resources": "exhaust",
+        "max_resources": "auto",
+    },
+}
+
+
+def memmap_matrix(X, folder):
+    """Dumps X once and reopens it read-only memory-mapped, so every worker reads the same pages."""
+    path = os.path.join(folder, "X.mmap")
+    joblib.dump(np.ascontiguousarray(X), path)
+    return joblib.load(path, mmap_mode="r")
+
+
+def run_search(model, X, y, n_candidates=32, factor=3, cv=3, scoring="roc_auc", n_jobs=-1, random_state=42):
+    """Successive-halving random search for one of SEARCH_SPACES, fitting candidates in parallel."""
+    space = SEARCH_SPACES[model]
+    search = HalvingRandomSearchCV(
+        space["estimator"](random_state),
+        space["params"],
+        n_candidates=n_candidates,
+        factor=factor,
+        resource=space["resource"],
+        min_resources=space["min_resources"],
+        max_resources=space["max_resources"],
+        cv=cv,
+        scoring=scoring,
+        n_jobs=n_jobs,
+        random_state=random_state,
+        refit=False,  # Callers refit best_params_ on their own (named) training frame
+    )
+    with tempfile.TemporaryDirectory(prefix="search-") as folder:
+        search.fit(memmap_matrix(X, folder), np.asarray(y))
+    return search
+
+
+def leaderboard(search, model):
+    """One row per (candidate, round); candidates that survived the most rounds come first."""
+    results = pd.DataFrame(search.cv_results_)
+    board = pd.DataFrame({
+        "model": model,
+        "iter": results["iter"],
+        "n_resources": results["n_resources"],
+        "mean_test_score": results["mean_test_score"],
+        "std_test_score": results["std_test_score"],
+        "mean_fit_time": results["mean_fit_time"],
+        "params": [json.dumps(p, default=str, sort_keys=True) for p in results["params"]],
+    })
+    return board.sort_values(["iter", "mean_test_score"], ascending=[False, False], ignore_index=True)
+
+
+def write_leaderboard(boards, path):
+    """Writes the final-round results of every model, best score first, plus every round below."""
+    board = pd.concat(boards, ignore_index=True)
+    final = board.groupby("model")["iter"].transform("max") == board["iter"]
+    board = pd.concat([
+        board[final].sort_values("mean_test_score", ascending=False),
+        board[~final].sort_values(["iter", "mean_test_score"], ascending=[False, False]),
+    ], ignore_index=True)
+    board.insert(0, "rank", range(1, len(board) + 1))
+    board.to_csv(path, index=False)
+    return board
@@ -0,0 +1,74 @@
+import numpy as np
+
+LABEL_VAR = "fire_label"
+TIME_BLOCK_HOURS = 24 * 7
+
+
+def feature_columns(ds, label_var=LABEL_VAR):
+    """Numeric data variables of a labeled ERA5 dataset, in dataset order, minus the label."""
+    return [
+        name for name, var in ds.data_vars.items()
+        if name != label_var and np.issubdtype(var.dtype, np.number)
+    ]
+
+
+def iter_labeled_blocks(ds, feature_cols, time_block=TIME_BLOCK_HOURS, label_var=LABEL_VAR, with_coords=False):
+    """Yields (X, y) arrays for consecutive time blocks of the cube, with NaN rows dropped.
+
+    Only one block of `time_block` hours is loaded at a time, so memory is bounded by the
+    block size rather than the length of the record. With `with_coords`, also yields a
+    (rows, 3) array of [hour index, latitude, longitude] per row.
+    """
+    ds = ds[feature_cols + [label_var]].transpose("time", "latitude", "longitude")
+    lat_grid, lon_grid = np.meshgrid(ds["latitude"].values, ds["longitude"].values, indexing="ij")
+
+    for start in range(0, ds.sizes["time"], time_block):
+        block = ds.isel(time=slice(start, start + time_block)).load()
+        X = np.stack([block[col].values.ravel() for col in feature_cols], axis=1)
+        y = block[label_var].values.ravel().astype(np.int8)
+
+        valid = ~np.isnan(X).any(axis=1)
+        if not with_coords:
+            yield X[valid], y[valid]
+            continue
+
+        n_hours = block.sizes["time"]
+        coords = np.column_stack([
+            np.repeat(np.arange(start, start + n_hours), lat_grid.size),
+            np.tile(lat_grid.ravel(), n_hours),
+            np.tile(lon_grid.ravel(), n_hours),
+        ])
+        yield X[valid], y[valid], coords[valid]
+
+
+class ReservoirSample:
+    """Uniform fixed-size sample over a stream of row blocks (vectorized Algorithm R)."""
+
+    def __init__(self, size, n_features, seed=42):
+        self.size = size
+        self.rows = np.empty((size, n_features), dtype=np.float64)
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+
+    def add(self, block):
+        # Fill the reservoir first
+        n_fill = min(max(self.size - self.seen, 0), len(block))
+        self.rows[self.seen:self.seen + n_fill] = block[:n_fill]
+        self.seen += n_fill
+        rest = block[n_fill:]
+        if len(rest) == 0:
+            return
+
+        # Row j of the stream replaces a random slot with probability size / (j + 1)
+        stream_idx = self.seen + np.arange(len(rest))
+        slots = self.rng.integers(0, stream_idx + 1)
+        keep = slots < self.size
+        slots, rows = slots[keep], rest[keep]
+
+        # When two rows hit the same slot the later one wins
+        last = len(slots) - 1 - np.unique(slots[::-1], return_index=True)[1]
+        self.rows[slots[last]] = rows[last]
+        self.seen += len(rest)
+
+    def sample(self):
+        return self.rows[:min(self.seen, self.size)]
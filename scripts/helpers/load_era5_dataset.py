@@ -1,23 +1,115 @@
-import xarray as xr
-import os
 import glob
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import xarray as xr
+
+from helpers.era5_store import TIME_CHUNK_HOURS, normalize_time_dim
+
+INDEX_FILE = ".era5_index.json"
+
+# Derived variables added as lazy expressions: source -> (name, units, conversion)
+UNIT_CONVERSIONS = {
+    "t2m": ("t2m_celsius", "degC", lambda v: v - 273.15),
+    "d2m": ("d2m_celsius", "degC", lambda v: v - 273.15),
+    "tp": ("tp_mm", "mm", lambda v: v * 1000),
+}
+
+# Datasets already opened by this process, keyed on the files' names, sizes and mtimes
+_OPENED = {}
+
+
+def file_signature(files):
+    return [[os.path.basename(f), os.stat(f).st_size, os.stat(f).st_mtime_ns] for f in files]
+
+
+def _describe(path):
+    with xr.open_dataset(path, chunks={}) as ds:
+        ds = normalize_time_dim(ds)
+        return {
+            "file": os.path.basename(path),
+            "variables": sorted(ds.data_vars),
+            "start": str(ds["time"].values[0]),
+            "hours": int(ds.sizes["time"]),
+        }
+
+
+def build_index(directory, files, max_workers=8):
+    """Groups files by the variables they hold and orders each group by time; saved next to the files."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        described = list(executor.map(_describe, files))
+
+    groups = {}
+    for entry in sorted(described, key=lambda e: e["start"]):
+        groups.setdefault(",".join(entry["variables"]), []).append(entry)
+    index = {"signature": file_signature(files), "groups": groups}
+
+    tmp_path = os.path.join(directory, INDEX_FILE + ".part")
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, INDEX_FILE))
+    return index
+
+
+def load_index(directory, files):
+    """The saved index if it still describes exactly these files, else a freshly built one."""
+    path = os.path.join(directory, INDEX_FILE)
+    if os.path.exists(path):
+        with open(path) as f:
+            index = json.load(f)
+        if index["signature"] == file_signature(files):
+            return index
+    return build_index(directory, files)
+
+
+def _open_group(directory, entries):
+    paths = [os.path.join(directory, entry["file"]) for entry in entries]
+    # Order and layout come from the index, so skip coordinate inference and alignment checks
+    return xr.open_mfdataset(
+        paths,
+        combine="nested",
+        concat_dim="time",
+        preprocess=normalize_time_dim,
+        chunks={},
+        parallel=True,
+        data_vars="minimal",
+        coords="minimal",
+        compat="override",
+        join="override",
+    )
+
 
-def load_era5_dataset(directory="data/era5"):
-    print(f"📂 Loading ERA5 data from: {directory}")
+def load_era5_dataset(directory="data/era5", pattern="era5_temperature_2023_*.nc",
+                      time_chunk=TIME_CHUNK_HOURS, conversions=UNIT_CONVERSIONS, verbose=True):
+    """Opens monthly (and per-variable) ERA5 NetCDF files as one lazy, dask-backed Dataset.
 
-    files = sorted(glob.glob(os.path.join(directory, "era5_temperature_2023_*.nc")))
+    Files are opened in parallel and combined along a normalized `time` dimension, chunked
+    `time_chunk` hours at a time; unit conversions are lazy expressions, so nothing is read
+    until values are used. The file layout is cached in `.era5_index.json`, which skips
+    coordinate inference, but every file is still opened once per process; the opened Dataset
+    is memoized in-process and each call gets its own shallow copy.
+    """
+    files = sorted(glob.glob(os.path.join(directory, pattern)))
     if not files:
-        raise FileNotFoundError("❌ No ERA5 NetCDF files found.")
+        raise FileNotFoundError(f"❌ No ERA5 NetCDF files matching {pattern} in {directory}")
 
-    print(f"📄 Found {len(files)} files.")
-    for f in files:
-        print(f"  - {os.path.basename(f)}")
+    key = (os.path.abspath(directory), pattern, time_chunk, tuple(conversions or ()),
+           json.dumps(file_signature(files)))
+    if key in _OPENED:
+        return _OPENED[key].copy()  # Callers may add or drop variables on what they get
 
-    ds_list = [xr.open_dataset(f) for f in files]
-    combined = xr.concat(ds_list, dim="time")
+    index = load_index(directory, files)
+    groups = [_open_group(directory, entries) for entries in index["groups"].values()]
+    ds = xr.merge(groups, compat="override", join="exact") if len(groups) > 1 else groups[0]
+    ds = ds.chunk({"time": time_chunk, "latitude": -1, "longitude": -1})
 
-    # Convert from Kelvin to Celsius
-    combined["t2m_celsius"] = combined["t2m"] - 273.15
+    for source, (name, units, convert) in (conversions or {}).items():
+        if source in ds:
+            ds[name] = convert(ds[source]).assign_attrs(units=units)
 
-    print(f"✅ ERA5 dataset merged. Time range: {combined.time.values[0]} → {combined.time.values[-1]}")
-    return combined
+    if verbose:
+        print(f"📂 ERA5: {len(files)} files from {directory}, variables {sorted(ds.data_vars)}")
+        print(f"✅ Time range: {ds['time'].values[0]} → {ds['time'].values[-1]} ({ds.sizes['time']} hours)")
+    _OPENED[key] = ds
+    return ds.copy()
@@ -0,0 +1,61 @@
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import roc_auc_score
+
+
+def metrics_path(model_path):
+    """Metrics sidecar next to a saved model: model.pkl -> model.metrics.json."""
+    return Path(model_path).with_suffix(".metrics.json")
+
+
+def save_metrics(model_path, **metrics):
+    """Writes the trainer's metrics (fit_seconds, roc_auc, ...) next to the saved model."""
+    path = metrics_path(model_path)
+    tmp_path = path.with_name(path.name + ".part")
+    with open(tmp_path, "w") as f:
+        json.dump(metrics, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_metrics(model_path):
+    """Metrics saved by the model's trainer, or {} for models trained before they were recorded."""
+    path = metrics_path(model_path)
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def predict_throughput(model, X, n_rows=1_000_000):
+    """Rows/sec of predict_proba over `n_rows` rows (X tiled), roughly one week of the ERA5 grid."""
+    reps = max(1, int(np.ceil(n_rows / len(X))))
+    X_big = pd.concat([X] * reps, ignore_index=True) if isinstance(X, pd.DataFrame) else np.tile(X, (reps, 1))
+    X_big = X_big[:n_rows]
+    started = time.perf_counter()
+    model.predict_proba(X_big)
+    return len(X_big) / (time.perf_counter() - started)
+
+
+def compare_models(models, X_test, y_test, fit_seconds=None, n_rows=1_000_000):
+    """Side-by-side fit time, predict throughput and test ROC AUC for fitted models {name: model}.
+
+    Fit times are the ones recorded when each model was trained ({name: seconds}); models are
+    not refitted here, and a missing time is reported as NaN.
+    """
+    fit_seconds = fit_seconds or {}
+    rows = []
+    for name, model in models.items():
+        print(f"⏱️  Benchmarking {name}...")
+        rows.append({
+            "model": name,
+            "fit_seconds": fit_seconds.get(name, np.nan),
+            "predict_rows_per_sec": predict_throughput(model, X_test, n_rows),
+            "roc_auc": roc_auc_score(y_test, model.predict_proba(X_test)[:, 1]),
+        })
+    return pd.DataFrame(rows).sort_values("roc_auc", ascending=False, ignore_index=True)
@@ -0,0 +1,239 @@
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from glob import glob
+from pathlib import Path
+
+from helpers.content_hash import content_hash, stat_key
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+MANIFEST_VERSION = 1
+
+
+class Stage:
+    """One pipeline script with the files it reads (paths or globs) and the files it writes."""
+
+    def __init__(self, name, script, inputs=(), outputs=(), params=None):
+        self.name = name
+        self.script = Path(script)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.params = params or {}
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, {str(self.script)!r})"
+
+
+def script_params(script):
+    """Module-level constants with literal values (FIRE_TARGET, confidence_threshold, ...)."""
+    tree = ast.parse(Path(script).read_text())
+    params = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            try:
+                params[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                continue
+    return params
+
+
+def helper_modules(script):
+    """Source files of the helpers.* modules a script imports, followed transitively."""
+    seen, todo = set(), [Path(script)]
+    while todo:
+        tree = ast.parse(todo.pop().read_text())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.module and node.module.startswith("helpers."):
+                path = SCRIPTS_DIR / (node.module.replace(".", os.sep) + ".py")
+                if path.exists() and path not in seen:
+                    seen.add(path)
+                    todo.append(path)
+    return sorted(seen)
+
+
+def _json_hash(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class Pipeline:
+    """Runs stages in dependency order, concurrently where possible, skipping cached ones.
+
+    A stage's cache key hashes its script and helper sources, its literal config constants,
+    its declared params and the bytes of every input. Inputs written by another stage make it
+    a dependency. Content hashes are reused while a file's size and mtime are unchanged, so a
+    cache check does not reread unchanged inputs.
+    """
+
+    def __init__(self, stages, manifest_path=".pipeline/manifest.json", max_workers=2, workdir="."):
+        self.stages = {stage.name: stage for stage in stages}
+        self.manifest_path = Path(manifest_path)
+        self.max_workers = max_workers
+        self.workdir = Path(workdir)
+        self._lock = threading.Lock()
+        self.manifest = {"version": MANIFEST_VERSION, "stages": {}, "hashes": {}}
+        if self.manifest_path.exists():
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                self.manifest = manifest
+
+    def _expand(self, patterns):
+        paths = []
+        for pattern in patterns:
+            matches = sorted(glob(str(self.workdir / pattern)))
+            paths.extend(matches if matches else [str(self.workdir / pattern)])
+        return paths
+
+    def dependencies(self, stage):
+        """Names of the stages whose outputs this stage reads."""
+        inputs = {os.path.normpath(p) for p in stage.inputs}
+        return sorted(
+            other.name for other in self.stages.values()
+            if other is not stage and inputs & {os.path.normpath(p) for p in other.outputs}
+        )
+
+    def _hash(self, path):
+        """Content hash of a file or directory, cached on its stat signature."""
+        stat = stat_key(path)
+        with self._lock:
+            cached = self.manifest["hashes"].get(path)
+        if cached is not None and cached["stat"] == stat:
+            return cached["hash"]
+        digest = content_hash(path)
+        with self._lock:
+            self.manifest["hashes"][path] = {"stat": stat, "hash": digest}
+        return digest
+
+    def fingerprint(self, stage):
+        """Returns (key, params); raises FileNotFoundError for missing inputs."""
+        script = SCRIPTS_DIR / stage.script
+        params = {**script_params(script), **stage.params}
+        inputs = {}
+        for path in self._expand(stage.inputs):
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"input {path} of stage '{stage.name}' does not exist")
+            inputs[path] = self._hash(path)
+        code = {str(p.relative_to(SCRIPTS_DIR)): content_hash(p) for p in [script, *helper_modules(script)]}
+        return _json_hash({"code": code, "params": params, "inputs": inputs}), params
+
+    def is_cached(self, stage, key):
+        record = self.manifest["stages"].get(stage.name)
+        if record is None or record["key"] != key:
+            return False
+        # Outputs must still be the ones this run produced, not deleted or edited by hand
+        return all(
+            os.path.exists(path) and stat_key(path) == stat
+            for path, stat in record["outputs"].items()
+        )
+
+    def _changed_params(self, stage, params):
+        old = self.manifest["stages"].get(stage.name, {}).get("params", {})
+        return sorted(name for name in set(old) | set(params) if old.get(name) != params.get(name))
+
+    def _run_stage(self, stage, force=False, dry_run=False):
+        key, params = self.fingerprint(stage)
+        if not force and self.is_cached(stage, key):
+            return "cached", 0.0
+
+        changed = self._changed_params(stage, params) if stage.name in self.manifest["stages"] else []
+        reason = f" (changed: {', '.join(changed)})" if changed else ""
+        print(f"▶️  {stage.name}: running {stage.script}{reason}", flush=True)
+        if dry_run:
+            return "would run", 0.0
+
+        started = time.perf_counter()
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(SCRIPTS_DIR), os.environ.get("PYTHONPATH")]))}
+        log_path = self.manifest_path.parent / "logs" / f"{stage.name}.log"
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, "w") as log:
+            result = subprocess.run(
+                [sys.executable, str(SCRIPTS_DIR / stage.script)],
+                cwd=self.workdir, env=env, stdout=log, stderr=subprocess.STDOUT,
+            )
+        elapsed = time.perf_counter() - started
+        if result.returncode != 0:
+            raise RuntimeError(f"stage '{stage.name}' exited with {result.returncode}, see {log_path}")
+
+        paths = self._expand(stage.outputs)
+        missing = [path for path in paths if not os.path.exists(path)]
+        if missing:
+            with self._lock:
+                self.manifest["stages"].pop(stage.name, None)
+            raise RuntimeError(f"stage '{stage.name}' did not write {', '.join(missing)}, see {log_path}")
+
+        outputs = {path: stat_key(path) for path in paths}
+        with self._lock:
+            self.manifest["stages"][stage.name] = {"key": key, "params": params, "outputs": outputs}
+            self._save_manifest()
+        return "ran", elapsed
+
+    def _save_manifest(self):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".part")
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2, default=str)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _selected(self, targets):
+        """Targets plus everything upstream of them; all stages when targets is empty."""
+        if not targets:
+            return set(self.stages)
+        selected, todo = set(), list(targets)
+        while todo:
+            name = todo.pop()
+            if name not in self.stages:
+                raise KeyError(f"unknown stage '{name}', expected one of {sorted(self.stages)}")
+            if name not in selected:
+                selected.add(name)
+                todo.extend(self.dependencies(self.stages[name]))
+        return selected
+
+    def run(self, targets=None, force=False, dry_run=False):
+        """Runs the selected stages; returns {stage name: status}."""
+        selected = self._selected(targets)
+        deps = {name: set(self.dependencies(self.stages[name])) & selected for name in selected}
+        status = {}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while len(status) < len(selected):
+                progressed = len(status)
+                for name in sorted(selected - set(status) - set(running.values())):
+                    if any(status.get(dep) in ("failed", "blocked") for dep in deps[name]):
+                        status[name] = "blocked"
+                        print(f"⏭️  {name}: skipped, an upstream stage failed")
+                    elif all(dep in status for dep in deps[name]):
+                        # Dry runs cannot refresh upstream outputs, so downstream stages of a pending stage would run too
+                        if dry_run and any(status[dep] == "would run" for dep in deps[name]):
+                            status[name] = "would run"
+                            print(f"▶️  {name}: running {self.stages[name].script} (upstream changed)")
+                            continue
+                        running[executor.submit(self._run_stage, self.stages[name], force, dry_run)] = name
+                if not running:
+                    if progressed == len(status):
+                        raise ValueError(f"dependency cycle among stages {sorted(selected - set(status))}")
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        status[name], elapsed = future.result()
+                    except (RuntimeError, FileNotFoundError) as e:
+                        status[name] = "failed"
+                        print(f"❌ {name}: {e}")
+                        continue
+                    if status[name] == "cached":
+                        print(f"✅ {name}: cached")
+                    elif status[name] == "ran":
+                        print(f"✅ {name}: done in {elapsed:.1f}s")
+
+        with self._lock:
+            self._save_manifest()
+        return status
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import joblib
+
+from helpers.content_hash import content_hash, stat_key
+
+ARTIFACT_VERSION = 2  # 2: float32 features and int8 labels (compact_frame)
+BUNDLE_NAME = "preprocessing.joblib"
+METADATA_NAME = "preprocessing.json"
+OUTPUT_FILES = ("train.parquet", "test.parquet")
+
+
+def config_hash(config):
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def read_metadata(output_dir):
+    path = Path(output_dir) / METADATA_NAME
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def input_fingerprint(input_path, previous=None):
+    """Content hash of the input, reusing the previous hash when size and mtime are unchanged."""
+    stat = stat_key(input_path)
+    if previous is not None and previous.get("input_stat") == stat:
+        return previous["input_hash"], stat
+    return content_hash(input_path), stat
+
+
+def is_cache_hit(output_dir, input_path, config):
+    """True if the saved artifact was built by this version from the same input bytes and config."""
+    metadata = read_metadata(output_dir)
+    if metadata is None or metadata.get("version") != ARTIFACT_VERSION:
+        return False
+    if metadata.get("config_hash") != config_hash(config):
+        return False
+    if not all((Path(output_dir) / name).exists() for name in OUTPUT_FILES + (BUNDLE_NAME,)):
+        return False
+    input_hash, _ = input_fingerprint(input_path, metadata)
+    return input_hash == metadata.get("input_hash")
+
+
+def save_artifact(output_dir, scaler, feature_cols, dtypes, input_path, config):
+    """Writes the scaler bundle and a JSON sidecar describing it (both replaced atomically)."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    input_hash, input_stat = input_fingerprint(input_path, read_metadata(output_dir))
+
+    metadata = {
+        "version": ARTIFACT_VERSION,
+        "feature_cols": list(feature_cols),
+        "dtypes": {col: str(dtype) for col, dtype in dtypes.items()},
+        "input_path": str(input_path),
+        "input_hash": input_hash,
+        "input_stat": input_stat,
+        "config": config,
+        "config_hash": config_hash(config),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+    bundle_tmp = output_dir / f"{BUNDLE_NAME}.part"
+    joblib.dump({**metadata, "scaler": scaler}, bundle_tmp)
+    os.replace(bundle_tmp, output_dir / BUNDLE_NAME)
+
+    metadata_tmp = output_dir / f"{METADATA_NAME}.part"
+    with open(metadata_tmp, "w") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(metadata_tmp, output_dir / METADATA_NAME)
+    return metadata
+
+
+def load_artifact(output_dir):
+    """Loads the scaler bundle saved by preprocessing: scaler, ordered feature_cols, dtypes, hashes."""
+    bundle = joblib.load(Path(output_dir) / BUNDLE_NAME)
+    if bundle.get("version") != ARTIFACT_VERSION:
+        raise ValueError(
+            f"❌ Preprocessing artifact in {output_dir} is version {bundle.get('version')}, "
+            f"expected {ARTIFACT_VERSION}; rerun preprocess_wildfire_data.py"
+        )
+    return bundle
+
+
+def read_feature_cols(output_dir):
+    """Ordered feature columns from the JSON sidecar, falling back to the scaler bundle."""
+    metadata = read_metadata(output_dir)
+    if metadata is not None:
+        return metadata["feature_cols"]
+    if not (Path(output_dir) / BUNDLE_NAME).exists():
+        raise FileNotFoundError(
+            f"❌ No preprocessing artifact in {output_dir}; rerun preprocess_wildfire_data.py"
+        )
+    return load_artifact(output_dir)["feature_cols"]
@@ -0,0 +1,296 @@
+import atexit
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", "outputs/profiles"))
+ENABLED = os.environ.get("PROFILE", "1") != "0"
+FLAMEGRAPH = os.environ.get("PROFILE_FLAMEGRAPH") == "1"  # Also write sampled stacks per stage
+SAMPLE_SECONDS = 0.01 if FLAMEGRAPH else 0.05  # RSS (and stack) sampling interval
+
+RUNS_CSV = "runs.csv"
+CSV_FIELDS = [
+    "run_id", "script", "stage", "wall_s", "cpu_s", "peak_rss_mb", "rss_delta_mb",
+    "rows_in", "rows_out", "rows_per_s", "bytes_read", "bytes_written",
+]
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+_sampled_peak = 0  # Highest RSS seen by any stage sampler, for peak_rss() without `resource`
+
+
+def current_rss():
+    """Resident set size in bytes, from /proc or psutil; None where neither is available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    return None
+
+
+def peak_rss():
+    """Peak RSS of the process in bytes; off POSIX, the highest sampled RSS (None if never measured)."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KiB on Linux
+    return max(_sampled_peak, current_rss() or 0) or None
+
+
+def _max_rss(*values):
+    values = [v for v in values if v is not None]
+    return max(values) if values else None
+
+
+def io_counters():
+    """(bytes read, bytes written) through read/write syscalls, from /proc/self/io; (None, None) elsewhere.
+
+    Memory-mapped reads (np.load(mmap_mode=...), Zarr via mmap) don't show up here.
+    """
+    try:
+        with open("/proc/self/io") as f:
+            counters = dict(line.split(": ") for line in f.read().splitlines())
+        return int(counters["rchar"]), int(counters["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def cpu_seconds():
+    """CPU time of this process (all threads) plus any subprocesses it has waited for."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class _Sampler(threading.Thread):
+    """Polls RSS, and optionally the profiled thread's stack, while a stage runs."""
+
+    def __init__(self, thread_id, stacks):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.stacks = Counter() if stacks else None
+        self.peak = current_rss()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(SAMPLE_SECONDS):
+            self.peak = _max_rss(self.peak, current_rss())
+            if self.stacks is not None:
+                frame = sys._current_frames().get(self.thread_id)
+                if frame is not None:
+                    self.stacks[_folded(frame)] += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self.peak = _max_rss(self.peak, current_rss())
+        global _sampled_peak
+        _sampled_peak = _max_rss(_sampled_peak, self.peak)
+
+
+def _folded(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{Path(code.co_filename).name}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StageRecord:
+    """Measurements for one stage; set rows_in/rows_out (or call add_rows) inside the block."""
+
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.wall_s = self.cpu_s = None
+        self.peak_rss_mb = self.rss_delta_mb = None
+        self.bytes_read = self.bytes_written = None
+        self.stacks = None
+
+    def add_rows(self, rows_in=0, rows_out=0):
+        self.rows_in = (self.rows_in or 0) + rows_in
+        self.rows_out = (self.rows_out or 0) + rows_out
+
+    def as_row(self):
+        rows = self.rows_out if self.rows_out is not None else self.rows_in
+        return {
+            "stage": self.name,
+            "wall_s": round(self.wall_s, 4),
+            "cpu_s": round(self.cpu_s, 4),
+            "peak_rss_mb": _round(self.peak_rss_mb, 1),
+            "rss_delta_mb": _round(self.rss_delta_mb, 1),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rows_per_s": round(rows / self.wall_s, 1) if rows and self.wall_s > 0 else None,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+        }
+
+
+def _round(value, digits):
+    return None if value is None else round(value, digits)
+
+
+class RunReport:
+    """Stage records of one script run, written as JSON plus a row per stage in runs.csv at exit."""
+
+    def __init__(self, script=None, output_dir=PROFILE_DIR):
+        self.script = script or Path(sys.argv[0]).stem or "interactive"
+        self.output_dir = Path(output_dir)
+        self.started = datetime.now()
+        self.run_id = f"{self.script}-{self.started:%Y%m%dT%H%M%S}-{os.getpid()}"
+        self.stages = []
+        self._registered = False
+
+    def add(self, record):
+        self.stages.append(record)
+        if not self._registered:
+            atexit.register(self.write)
+            self._registered = True
+
+    def previous_wall_times(self):
+        """Wall time per stage from this script's last recorded run, for run-over-run deltas."""
+        path = self.output_dir / RUNS_CSV
+        if not path.exists():
+            return {}
+        with open(path, newline="") as f:
+            rows = [row for row in csv.DictReader(f) if row["script"] == self.script]
+        if not rows:
+            return {}
+        last_run = rows[-1]["run_id"]
+        return {row["stage"]: float(row["wall_s"]) for row in rows if row["run_id"] == last_run}
+
+    def write(self):
+        if not self.stages:
+            return None
+        previous = self.previous_wall_times()
+        rows = [{"run_id": self.run_id, "script": self.script, **record.as_row()} for record in self.stages]
+
+        run_dir = self.output_dir / self.script
+        run_dir.mkdir(parents=True, exist_ok=True)
+        report = {
+            "run_id": self.run_id,
+            "script": self.script,
+            "argv": sys.argv,
+            "started": self.started.isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "total_wall_s": round(sum(record.wall_s for record in self.stages), 4),
+            "process_peak_rss_mb": _round(_megabytes(peak_rss()), 1),
+            "stages": rows,
+        }
+        json_path = run_dir / f"{self.run_id}.json"
+        json_path.write_text(json.dumps(report, indent=2))
+
+        csv_path = self.output_dir / RUNS_CSV
+        new_file = not csv_path.exists()
+        with open(csv_path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+
+        for record in self.stages:
+            if record.stacks:
+                folded_path = run_dir / f"{self.run_id}.{record.name}.folded"
+                folded_path.write_text("".join(f"{stack} {n}\n" for stack, n in record.stacks.items()))
+
+        print(f"\n⏱️  Profile of {self.script} ({report['total_wall_s']:.2f}s):")
+        for row in rows:
+            change = ""
+            if row["stage"] in previous and previous[row["stage"]] > 0:
+                change = f" ({100 * (row['wall_s'] / previous[row['stage']] - 1):+.0f}% vs last run)"
+            peak = "n/a" if row["peak_rss_mb"] is None else f"{row['peak_rss_mb']:.1f}"
+            print(f"   {row['stage']:<24} {row['wall_s']:>9.2f}s wall {row['cpu_s']:>9.2f}s cpu "
+                  f"{peak:>8} MB peak{change}")
+        print(f"💾 Profile report: {json_path}")
+        return json_path
+
+
+def _megabytes(n_bytes):
+    return None if n_bytes is None else n_bytes / 1e6
+
+
+_run = None
+
+
+def current_run():
+    global _run
+    if _run is None:
+        _run = RunReport()
+    return _run
+
+
+@contextmanager
+def profile_stage(name, rows_in=None):
+    """Times the block and records it in this run's report.
+
+    Records wall and CPU time, peak and net RSS, bytes read/written and any rows the block
+    reports through the yielded StageRecord. With PROFILE_FLAMEGRAPH=1 the calling thread's
+    stack is also sampled into a `.folded` file (flamegraph.pl / speedscope input).
+    """
+    record = StageRecord(name, rows_in)
+    if not ENABLED:
+        yield record
+        return
+
+    sampler = _Sampler(threading.get_ident(), stacks=FLAMEGRAPH)
+    rss_before = current_rss()
+    read_before, written_before = io_counters()
+    cpu_before = cpu_seconds()
+    started = time.perf_counter()
+    sampler.start()
+    try:
+        yield record
+    finally:
+        record.wall_s = time.perf_counter() - started
+        record.cpu_s = cpu_seconds() - cpu_before
+        sampler.stop()
+        record.peak_rss_mb = _megabytes(sampler.peak)
+        rss_after = current_rss()
+        if rss_before is not None and rss_after is not None:
+            record.rss_delta_mb = (rss_after - rss_before) / 1e6
+        read_after, written_after = io_counters()
+        if read_before is not None and read_after is not None:
+            record.bytes_read = read_after - read_before
+            record.bytes_written = written_after - written_before
+        record.stacks = sampler.stacks
+        current_run().add(record)
+
+
+def profiled(name=None):
+    """Decorator form of profile_stage; rows_out is the row count of a returned DataFrame or array."""
+
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_stage(name or func.__name__) as record:
+                result = func(*args, **kwargs)
+                if getattr(result, "ndim", 0) >= 1:
+                    record.rows_out = result.shape[0]
+                return result
+
+        return wrapper
+
+    return decorate
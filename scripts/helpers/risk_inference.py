@@ -0,0 +1,54 @@
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from helpers.flat_forest import META_FILE, FlatForest
+
+
+def load_model(path, n_jobs=None):
+    """A flat forest export directory (memory-mapped) or a joblib-pickled sklearn model."""
+    path = Path(path)
+    model = FlatForest.load(path) if (path / META_FILE).exists() else joblib.load(path)
+    if n_jobs is not None and hasattr(model, "n_jobs"):
+        model.n_jobs = n_jobs
+    return model
+
+
+def feature_matrix(block, feature_cols):
+    """(cells, features) matrix of one loaded (time, lat, lon) block, in training column order."""
+    return np.stack([block[col].values.ravel() for col in feature_cols], axis=1)
+
+
+def predict_rows(model, scaler, feature_cols, X):
+    """Fire probability for a (rows, features) matrix without NaNs, scaled as in training."""
+    X_scaled = pd.DataFrame(scaler.transform(X), columns=feature_cols)
+    return model.predict_proba(X_scaled)[:, 1]
+
+
+def predict_risk_block(model, scaler, feature_cols, block, batch_rows=1_000_000):
+    """Fire probability for every cell of a time block, NaN where any feature is missing.
+
+    Applies the preprocessing scaler exactly as in training, then `predict_proba` in
+    batches of `batch_rows` so very wide grids don't spike memory.
+    """
+    block = block[feature_cols].transpose("time", "latitude", "longitude").load()
+    X = feature_matrix(block, feature_cols)
+    valid = ~np.isnan(X).any(axis=1)
+
+    probability = np.full(len(X), np.nan, dtype=np.float32)
+    valid_rows = np.flatnonzero(valid)
+    for start in range(0, len(valid_rows), batch_rows):
+        rows = valid_rows[start:start + batch_rows]
+        probability[rows] = predict_rows(model, scaler, feature_cols, X[rows])
+
+    shape = tuple(block.sizes[dim] for dim in ("time", "latitude", "longitude"))
+    return xr.DataArray(
+        probability.reshape(shape),
+        coords={"time": block["time"], "latitude": block["latitude"], "longitude": block["longitude"]},
+        dims=("time", "latitude", "longitude"),
+        name="fire_risk",
+        attrs={"long_name": "Predicted fire probability", "units": "1"},
+    )
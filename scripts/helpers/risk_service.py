@@ -0,0 +1,187 @@
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from helpers.risk_inference import predict_rows
+
+MAX_BATCH_ROWS = 4096
+MAX_WAIT_MS = 2.0
+MAX_BBOX_CELLS = 10_000
+
+
+class MicroBatcher:
+    """Coalesces concurrent predict requests into one `predict_fn` call per batch.
+
+    The first request of a batch waits at most `max_wait_ms` for others to join (or until
+    `max_batch_rows` rows are queued); the merged matrix is scored once in a worker thread
+    and each caller gets back its own slice.
+    """
+
+    def __init__(self, predict_fn, max_batch_rows=MAX_BATCH_ROWS, max_wait_ms=MAX_WAIT_MS):
+        self.predict_fn = predict_fn
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.rows = 0
+        self._worker = None
+
+    def start(self):
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+
+    async def predict(self, X):
+        if len(X) == 0:
+            return np.empty(0, dtype=np.float32)
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((X, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        n_rows = len(batch[0][0])
+        deadline = time.perf_counter() + self.max_wait
+        while n_rows < self.max_batch_rows:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            n_rows += len(item[0])
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            X = np.concatenate([X for X, _ in batch])
+            try:
+                probability = await loop.run_in_executor(None, self.predict_fn, X)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError(f"prediction failed: {e}"))
+                continue
+
+            self.batches += 1
+            self.rows += len(X)
+            offset = 0
+            for X_part, future in batch:
+                if not future.done():
+                    future.set_result(probability[offset:offset + len(X_part)])
+                offset += len(X_part)
+
+
+class RiskService:
+    """Point and bounding-box fire risk queries over a FeatureGrid with a loaded model."""
+
+    def __init__(self, model, scaler, feature_cols, grid, max_batch_rows=MAX_BATCH_ROWS, max_wait_ms=MAX_WAIT_MS):
+        if list(grid.feature_cols) != list(feature_cols):
+            raise ValueError(f"❌ Feature grid columns {grid.feature_cols} do not match the model's {feature_cols}")
+        self.grid = grid
+        self.batcher = MicroBatcher(
+            lambda X: predict_rows(model, scaler, feature_cols, X), max_batch_rows, max_wait_ms
+        )
+
+    async def risk_at(self, latitudes, longitudes, times):
+        """Probability per point, None where the point is off the grid/record or has missing features."""
+        X, valid = self.grid.lookup(latitudes, longitudes, times)
+        probability = await self.batcher.predict(X[valid])
+        result = np.full(len(valid), np.nan)
+        result[valid] = probability
+        return [None if np.isnan(p) else round(float(p), 6) for p in result]
+
+    async def point(self, params):
+        lat, lon, when = float(params["lat"]), float(params["lon"]), params["time"]
+        (risk,) = await self.risk_at([lat], [lon], [when])
+        return {"lat": lat, "lon": lon, "time": when, "risk": risk}
+
+    async def bbox(self, params):
+        lat_min, lat_max = float(params["lat_min"]), float(params["lat_max"])
+        lon_min, lon_max = float(params["lon_min"]), float(params["lon_max"])
+        when = params["time"]
+        lats, lons = self.grid.cells_in_bbox(lat_min, lat_max, lon_min, lon_max)
+        if len(lats) > MAX_BBOX_CELLS:
+            raise ValueError(f"bbox covers {len(lats)} cells, the limit is {MAX_BBOX_CELLS}")
+        risks = await self.risk_at(lats, lons, [when] * len(lats))
+        cells = [{"lat": float(a), "lon": float(b), "risk": r} for a, b, r in zip(lats, lons, risks)]
+        return {"time": when, "cells": cells}
+
+    def stats(self):
+        batches = self.batcher.batches
+        return {
+            "batches": batches,
+            "rows": self.batcher.rows,
+            "mean_batch_rows": self.batcher.rows / batches if batches else 0.0,
+        }
+
+    async def handle(self, method, target):
+        """Routes one request; returns (status, JSON-able body)."""
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if method != "GET":
+            return 405, {"error": "only GET is supported"}
+        routes = {"/risk": self.point, "/risk/bbox": self.bbox}
+        try:
+            if url.path == "/health":
+                return 200, {"status": "ok", **self.stats()}
+            if url.path not in routes:
+                return 404, {"error": f"unknown path {url.path}", "paths": ["/risk", "/risk/bbox", "/health"]}
+            return 200, await routes[url.path](params)
+        except KeyError as e:
+            return 400, {"error": f"missing query parameter {e}"}
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except RuntimeError as e:
+            return 500, {"error": str(e)}
+
+    async def _serve_connection(self, reader, writer):
+        """Minimal HTTP/1.1 with keep-alive: GET requests with query strings, JSON responses."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    status, body = 400, {"error": "malformed request line"}
+                    version = "HTTP/1.0"
+                else:
+                    status, body = await self.handle(method, target)
+
+                payload = json.dumps(body).encode()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host, port):
+        """Starts the batcher and the HTTP server; returns the asyncio Server."""
+        self.batcher.start()
+        return await asyncio.start_server(self._serve_connection, host, port)
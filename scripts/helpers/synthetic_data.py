@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from helpers.era5_downloader import ERA5_SHORT_NAMES
+
+# ERA5 over Portugal: 0.25° cells, latitudes descending like CDS returns them
+NORTH, WEST = 42.0, -9.6
+GRID_STEP = 0.25
+PORTUGAL_BBOX = (36.95, 42.15, -9.56, -6.19)  # lat_min, lat_max, lon_min, lon_max
+
+FIRMS_COLUMNS = [
+    "latitude", "longitude", "brightness", "scan", "track", "acq_date", "acq_time",
+    "satellite", "instrument", "confidence", "version", "bright_t31", "frp", "daynight",
+]
+
+
+def synthetic_era5(hours, n_lat=21, n_lon=15, start="2023-01-01", seed=0, time_dim="valid_time"):
+    """Hourly cube of the six merged ERA5 variables with plausible magnitudes and cycles.
+
+    t2m/d2m in K with seasonal and diurnal cycles, u10/v10 in m/s, tp in m (mostly dry hours),
+    sp in Pa falling towards the inland east. All float32, like the CDS NetCDF files.
+    """
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(start, periods=hours, freq="h")
+    lats = NORTH - GRID_STEP * np.arange(n_lat)
+    lons = WEST + GRID_STEP * np.arange(n_lon)
+    shape = (hours, n_lat, n_lon)
+
+    day_of_year = times.dayofyear.to_numpy()[:, None, None]
+    hour = times.hour.to_numpy()[:, None, None]
+    seasonal = -8 * np.cos(2 * np.pi * (day_of_year - 15) / 365)
+    diurnal = -5 * np.cos(2 * np.pi * (hour - 3) / 24)
+    inland = np.linspace(0, 3, n_lon)[None, None, :]
+
+    t2m = 288 + seasonal + diurnal + inland + rng.normal(0, 1.5, shape)
+    d2m = t2m - rng.gamma(2.0, 3.0, shape)
+    wet = rng.random(shape) < 0.08
+    tp = np.where(wet, rng.exponential(0.001, shape), 0.0)
+    sp = 101_300 - 1_500 * inland / 3 + rng.normal(0, 300, shape)
+
+    variables = {
+        "t2m": t2m,
+        "d2m": d2m,
+        "u10": rng.normal(1.0, 3.0, shape),
+        "v10": rng.normal(-0.5, 3.0, shape),
+        "tp": tp,
+        "sp": sp,
+    }
+    return xr.Dataset(
+        {name: ((time_dim, "latitude", "longitude"), values.astype(np.float32)) for name, values in variables.items()},
+        coords={time_dim: times, "latitude": lats, "longitude": lons},
+    )
+
+
+def write_era5_months(ds, directory, per_variable=True):
+    """Writes `ds` as monthly NetCDF files named like the downloads.
+
+    per_variable=True: era5_<cds name>_YYYY_MM.nc per variable (merge_era5_data_into_dataset.py input);
+    otherwise t2m alone as era5_temperature_YYYY_MM.nc (load_era5_dataset input). Returns the paths.
+    """
+    os.makedirs(directory, exist_ok=True)
+    time_dim = "valid_time" if "valid_time" in ds.dims else "time"
+    months = pd.DatetimeIndex(ds[time_dim].values).to_period("M")
+    names = {short: long for long, short in ERA5_SHORT_NAMES.items()} if per_variable else {"t2m": "temperature"}
+
+    paths = []
+    for month in months.unique():
+        month_ds = ds.isel({time_dim: months == month})
+        for short_name, file_name in names.items():
+            path = os.path.join(directory, f"era5_{file_name}_{month.year}_{month.month:02d}.nc")
+            month_ds[[short_name]].to_netcdf(path)
+            paths.append(path)
+    return paths
+
+
+def synthetic_firms(n_rows, start="2023-01-01", end="2023-12-31", bbox=PORTUGAL_BBOX,
+                    outside_fraction=0.3, seed=0):
+    """FIRMS MODIS archive rows in the real column order.
+
+    `outside_fraction` of the rows are scattered over a box 3° wider than `bbox`, so the
+    Portugal filter has something to drop; detections cluster in summer.
+    """
+    rng = np.random.default_rng(seed)
+    lat_min, lat_max, lon_min, lon_max = bbox
+    outside = rng.random(n_rows) < outside_fraction
+    latitudes = np.where(outside, rng.uniform(lat_min - 3, lat_max + 3, n_rows), rng.uniform(lat_min, lat_max, n_rows))
+    longitudes = np.where(outside, rng.uniform(lon_min - 3, lon_max + 3, n_rows), rng.uniform(lon_min, lon_max, n_rows))
+
+    days = pd.date_range(start, end, freq="D")
+    summer = np.exp(-0.5 * ((days.dayofyear.to_numpy() - 215) / 35) ** 2) + 0.05
+    dates = days[rng.choice(len(days), n_rows, p=summer / summer.sum())]
+    acq_time = rng.integers(0, 24, n_rows) * 100 + rng.integers(0, 60, n_rows)
+
+    return pd.DataFrame({
+        "latitude": latitudes.round(4),
+        "longitude": longitudes.round(4),
+        "brightness": rng.uniform(300, 400, n_rows).round(1),
+        "scan": rng.uniform(1.0, 2.5, n_rows).round(1),
+        "track": rng.uniform(1.0, 1.6, n_rows).round(1),
+        "acq_date": dates.strftime("%Y-%m-%d"),
+        "acq_time": acq_time,
+        "satellite": rng.choice(["Terra", "Aqua"], n_rows),
+        "instrument": "MODIS",
+        "confidence": rng.integers(0, 101, n_rows),
+        "version": "6.1NRT",
+        "bright_t31": rng.uniform(280, 310, n_rows).round(1),
+        "frp": rng.gamma(1.5, 15, n_rows).round(1),
+        "daynight": np.where((acq_time >= 700) & (acq_time < 1900), "D", "N"),
+    }, columns=FIRMS_COLUMNS)
+
+
+def synthetic_fire_events(n_events, times, bbox=PORTUGAL_BBOX, seed=0):
+    """Cleaned fire events (datetime, latitude, longitude), as prepare_fire_data.py writes them."""
+    rng = np.random.default_rng(seed)
+    times = pd.DatetimeIndex(times)
+    lat_min, lat_max, lon_min, lon_max = bbox
+    offsets = rng.uniform(0, (times[-1] - times[0]).total_seconds(), n_events)
+    return pd.DataFrame({
+        "datetime": times[0] + pd.to_timedelta(offsets, unit="s"),
+        "latitude": rng.uniform(lat_min, lat_max, n_events),
+        "longitude": rng.uniform(lon_min, lon_max, n_events),
+    })
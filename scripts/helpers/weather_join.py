@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+def nearest_index(coords, values):
+    """Vectorized nearest-neighbour lookup of `values` into a 1-D coordinate array (any order).
+
+    Ties go to the larger coordinate, matching `ds.sel(..., method="nearest")`.
+    """
+    coords = np.asarray(coords)
+    if len(coords) == 1:
+        return np.zeros(len(values), dtype=np.intp)
+
+    order = np.argsort(coords, kind="stable")
+    sorted_coords = coords[order]
+    right = np.clip(np.searchsorted(sorted_coords, values, side="left"), 1, len(coords) - 1)
+    left = right - 1
+    take_left = np.abs(values - sorted_coords[left]) < np.abs(sorted_coords[right] - values)
+    return order[np.where(take_left, left, right)]
+
+
+def join_weather(ds, latitudes, longitudes, times, variables=None):
+    """Returns the nearest-grid ERA5 values for every (lat, lon, time) point in one call.
+
+    All grid indices are resolved up front with `nearest_index` and the cube is read with a
+    single pointwise `isel`, so the cost is independent of how many points share a cell.
+    Rows with a missing time or coordinate come back as NaN.
+    """
+    time_dim = "valid_time" if "valid_time" in ds.dims else "time"
+    if variables is None:
+        variables = list(ds.data_vars)
+
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    times = pd.to_datetime(pd.Series(times), utc=True).dt.tz_localize(None).values.astype("datetime64[ns]")
+
+    valid = ~(np.isnan(latitudes) | np.isnan(longitudes) | np.isnat(times))
+
+    grid_times = ds[time_dim].values.astype("datetime64[ns]").astype(np.int64)
+    indexers = {
+        time_dim: nearest_index(grid_times, times[valid].astype(np.int64)),
+        "latitude": nearest_index(ds["latitude"].values, latitudes[valid]),
+        "longitude": nearest_index(ds["longitude"].values, longitudes[valid]),
+    }
+    points = ds[variables].isel(
+        {dim: xr.DataArray(idx, dims="points") for dim, idx in indexers.items()}
+    ).compute()
+
+    weather = {}
+    for var in variables:
+        column = np.full(len(latitudes), np.nan)
+        column[valid] = points[var].values
+        weather[var] = column
+    return pd.DataFrame(weather)
@@ -1,56 +1,40 @@
 import pandas as pd
 import xarray as xr
 import numpy as np
-from datetime import datetime, timedelta
-from tqdm import tqdm
+
+from helpers.dtype_policy import compact_frame, read_fire_csv
+from helpers.fire_timestamps import fire_datetimes
+from helpers.profiling import profile_stage
+from helpers.weather_join import join_weather
 
 # Load fire data
-fires = pd.read_csv("data/portugal_fires.csv")
+fires = read_fire_csv("data/portugal_fires.csv")
 
 # Convert date + time to full datetime
-fires["acq_time"] = fires["acq_time"].apply(lambda x: f"{int(x):04d}")
-fires["datetime"] = pd.to_datetime(fires["acq_date"] + fires["acq_time"], format="%Y-%m%d%H%M", errors='coerce')
-fires["datetime_hour"] = fires["datetime"].dt.floor("H")  # round to nearest hour
+fires["datetime"] = fire_datetimes(fires["acq_date"], fires["acq_time"], utc=False)
+fires["datetime_hour"] = fires["datetime"].dt.floor("h")  # round down to the hour
 
 # Load ERA5 data
 ds = xr.open_dataset("data/era5/portugal_2023-08-01.nc")
 
-# Get valid time values (make sure this matches your file!)
-time_coord = "valid_time" if "valid_time" in ds.coords else "time"
-
-# Function to get closest weather values
-def get_weather_at_point(lat, lon, time):
-    try:
-        # Select nearest time, lat, lon
-        weather = ds.sel(
-            **{
-                time_coord: time,
-                "latitude": lat,
-                "longitude": lon
-            },
-            method="nearest"
-        )
-        return {
-            "temp_c": float(weather["t2m"].values - 273.15),
-            "humidity": float(weather["r"].values) if "r" in weather else None,
-            "wind_u": float(weather["u10"].values),
-            "wind_v": float(weather["v10"].values)
-        }
-    except Exception as e:
-        return {"temp_c": None, "humidity": None, "wind_u": None, "wind_v": None}
+WEATHER_VARIABLES = ["t2m", "r", "u10", "v10"]
 
-# Apply to first 50 fires (keep it fast while testing)
-sample = fires.head(50).copy()
-weather_features = []
+# Join every fire in one vectorized lookup. This needs a weather row per detection, so it
+# doesn't go through the shared FireIndex, which only keeps one entry per occupied cell.
+print(f"🔗 Matching weather to {len(fires)} fire points...")
+variables = [var for var in WEATHER_VARIABLES if var in ds.data_vars]
+with profile_stage("join_weather", rows_in=len(fires)) as stage:
+    weather_df = join_weather(ds, fires["latitude"], fires["longitude"], fires["datetime_hour"], variables)
+    stage.rows_out = len(weather_df)
 
-print("🔗 Matching weather to fire points...")
-for _, row in tqdm(sample.iterrows(), total=len(sample)):
-    weather = get_weather_at_point(row.latitude, row.longitude, row.datetime_hour)
-    weather_features.append(weather)
+weather_df = weather_df.rename(columns={"r": "humidity", "u10": "wind_u", "v10": "wind_v"})
+weather_df["temp_c"] = weather_df.pop("t2m") - 273.15
+if "humidity" not in weather_df:
+    weather_df["humidity"] = np.nan
+weather_df = weather_df[["temp_c", "humidity", "wind_u", "wind_v"]]
 
 # Combine
-weather_df = pd.DataFrame(weather_features)
-sample_with_weather = pd.concat([sample.reset_index(drop=True), weather_df], axis=1)
+sample_with_weather = compact_frame(pd.concat([fires.reset_index(drop=True), weather_df], axis=1))
 
 # Calculate wind speed
 sample_with_weather["wind_speed"] = np.sqrt(
@@ -61,5 +45,6 @@ sample_with_weather["wind_speed"] = np.sqrt(
 sample_with_weather.drop(columns=["wind_u", "wind_v"], inplace=True)
 
 # Save updated dataset
-sample_with_weather.to_csv("data/fires_with_weather.csv", index=False)
+with profile_stage("write_csv", rows_in=len(sample_with_weather)):
+    sample_with_weather.to_csv("data/fires_with_weather.csv", index=False)
 print("✅ Final enriched data with wind speed saved to data/fires_with_weather.csv")
@@ -1,10 +1,21 @@
 import os
+import re
+from glob import glob
+
+import numpy as np
 import xarray as xr
 
+from helpers.era5_store import append_to_store, stored_times
+
 input_dir = "data/era5/multi"
 output_path = "data/era5/era5_portugal_2023.nc"
+store_path = "data/era5/era5_portugal.zarr"
 os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
+# "netcdf": merge the whole year in memory and write one file (original behaviour)
+# "zarr":   stream month by month into a chunked, compressed, appendable Zarr store
+MERGE_MODE = "zarr"
+
 variables = {
     "2m_temperature": "t2m",
     "2m_dewpoint_temperature": "d2m",
@@ -14,19 +25,73 @@ variables = {
     "surface_pressure": "sp",
 }
 
-merged_datasets = []
 
-for var, short_name in variables.items():
-    pattern = os.path.join(input_dir, f"era5_{var}_2023_*.nc")
-    print(f"📦 Merging files for: {var}")
-    ds = xr.open_mfdataset(pattern, combine="by_coords")
-    
-    # Rename to standard short variable name
-    ds = ds.rename({list(ds.data_vars)[0]: short_name})
-    merged_datasets.append(ds[[short_name]])
+def monthly_files():
+    """Groups downloaded files by (year, month) -> {short_name: path}."""
+    months = {}
+    for var, short_name in variables.items():
+        for path in glob(os.path.join(input_dir, f"era5_{var}_*.nc")):
+            match = re.search(r"_(\d{4})_(\d{2})\.nc$", path)
+            if match:
+                months.setdefault(match.groups(), {})[short_name] = path
+    return dict(sorted(months.items()))
+
+
+def merge_to_netcdf():
+    merged_datasets = []
+
+    for var, short_name in variables.items():
+        pattern = os.path.join(input_dir, f"era5_{var}_2023_*.nc")
+        print(f"📦 Merging files for: {var}")
+        ds = xr.open_mfdataset(pattern, combine="by_coords")
+
+        # Rename to standard short variable name
+        ds = ds.rename({list(ds.data_vars)[0]: short_name})
+        merged_datasets.append(ds[[short_name]])
+
+    # Merge all variables into a single Dataset
+    full_ds = xr.merge(merged_datasets)
+    full_ds.to_netcdf(output_path)
+
+    print(f"✅ Multi-variable dataset saved at: {output_path}")
+
+
+def merge_to_zarr():
+    existing = stored_times(store_path)
+
+    for (year, month), files in monthly_files().items():
+        missing = set(variables.values()) - set(files)
+        if missing:
+            print(f"⚠️  Skipping {year}-{month}: missing {sorted(missing)}")
+            continue
+
+        month_datasets = []
+        for short_name, path in files.items():
+            ds = xr.open_dataset(path, chunks={})
+            ds = ds.rename({list(ds.data_vars)[0]: short_name})
+            month_datasets.append(ds[[short_name]])
+        month_ds = xr.merge(month_datasets)
+
+        time_name = "valid_time" if "valid_time" in month_ds.dims else "time"
+        times = month_ds[time_name].values
+        if np.isin(times, existing).all():
+            print(f"✅ {year}-{month} already in store")
+            continue
+        # The store only grows at the end of the time axis, so earlier or partial months can't be filled in
+        if existing.size and times.min() <= existing.max():
+            raise ValueError(
+                f"❌ {year}-{month} is not fully in {store_path}, which already runs up to {existing.max()}; "
+                "delete the store and rerun to rebuild it in time order"
+            )
+
+        print(f"📦 Appending {year}-{month} to {store_path}")
+        append_to_store(month_ds, store_path)
+        existing = np.concatenate([existing, times])
+
+    print(f"✅ Multi-variable Zarr store updated at: {store_path}")
 
-# Merge all variables into a single Dataset
-full_ds = xr.merge(merged_datasets)
-full_ds.to_netcdf(output_path)
 
-print(f"✅ Multi-variable dataset saved at: {output_path}")
+if MERGE_MODE == "zarr":
+    merge_to_zarr()
+else:
+    merge_to_netcdf()
@@ -0,0 +1,50 @@
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+from tqdm import tqdm
+
+from helpers.era5_store import append_to_store, open_era5
+from helpers.preprocessing_artifact import load_artifact
+from helpers.risk_inference import load_model, predict_risk_block
+
+# === Configuration ===
+ERA5_PATH = Path("data/era5/era5_features.zarr")  # Same feature cube the labels were built on
+# Flat export of the forest; or random_forest_fire_model.pkl / logistic_fire_model.pkl for a pickled model
+MODEL_PATH = Path("randomForestResults/random_forest_fire_model.forest")
+PREPROCESSING_DIR = Path("preprocessed_data")
+OUTPUT_PATH = Path("data/risk/fire_risk_2023.zarr")
+
+TIME_BLOCK_HOURS = 24 * 7  # Hours of the cube scored at once
+N_JOBS = -1                # Cores used by predict_proba (forests only)
+
+# === Load model and preprocessing once ===
+print(f"📦 Loading model: {MODEL_PATH}")
+model = load_model(MODEL_PATH, n_jobs=N_JOBS)
+
+preprocessing = load_artifact(PREPROCESSING_DIR)
+scaler = preprocessing["scaler"]
+feature_cols = list(preprocessing["feature_cols"])
+print("🧪 Features:", feature_cols)
+
+print(f"📂 Opening ERA5 cube lazily: {ERA5_PATH}")
+ds = open_era5(ERA5_PATH)
+
+# === Score the cube block by block ===
+if OUTPUT_PATH.exists():
+    shutil.rmtree(OUTPUT_PATH)
+OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+started = time.perf_counter()
+n_cells = 0
+n_blocks = int(np.ceil(ds.sizes["time"] / TIME_BLOCK_HOURS))
+for start in tqdm(range(0, ds.sizes["time"], TIME_BLOCK_HOURS), total=n_blocks, desc="🔥 Scoring"):
+    block = ds.isel(time=slice(start, start + TIME_BLOCK_HOURS))
+    risk = predict_risk_block(model, scaler, feature_cols, block)
+    append_to_store(risk.to_dataset(), OUTPUT_PATH)
+    n_cells += risk.size
+
+elapsed = time.perf_counter() - started
+print(f"✅ Scored {n_cells:,} cells in {elapsed:.1f}s ({n_cells / elapsed:,.0f} cells/s)")
+print(f"💾 Risk cube saved to: {OUTPUT_PATH}")
@@ -1,6 +1,8 @@
-import pandas as pd
 from pathlib import Path
-from datetime import datetime
+
+from helpers.dtype_policy import read_fire_csv
+from helpers.fire_timestamps import fire_datetimes
+from helpers.profiling import profile_stage
 
 # 📁 Config
 input_file = Path("data/fires/modis_2023_Portugal.csv")
@@ -9,24 +11,24 @@ confidence_threshold = 50  # You can raise to 70–80 if you want high-confidenc
 
 # 📥 Load
 print(f"📂 Reading {input_file}...")
-df = pd.read_csv(input_file)
+with profile_stage("read_csv") as stage:
+    df = read_fire_csv(input_file)  # float32 coords, int8 confidence, categorical satellite/instrument
+    stage.rows_out = len(df)
 
 # 🧼 Filter confidence
 df = df[df["confidence"] >= confidence_threshold]
 
 # 🕒 Combine date + time into UTC datetime
-def parse_datetime(row):
-    time_str = f"{int(row['acq_time']):04d}"  # Ensure 4-digit time like "0930"
-    return pd.to_datetime(f"{row['acq_date']} {time_str[:2]}:{time_str[2:]}", utc=True)
-
 print("🛠️  Parsing timestamps...")
-df["datetime"] = df.apply(parse_datetime, axis=1)
+with profile_stage("parse_timestamps", rows_in=len(df)):
+    df["datetime"] = fire_datetimes(df["acq_date"], df["acq_time"])
 
 # 🧹 Keep relevant columns only
 df_clean = df[["datetime", "latitude", "longitude", "confidence", "satellite", "instrument"]]
 
 # 💾 Save
 output_file.parent.mkdir(parents=True, exist_ok=True)
-df_clean.to_csv(output_file, index=False)
+with profile_stage("write_csv", rows_in=len(df_clean)):
+    df_clean.to_csv(output_file, index=False)
 
 print(f"✅ Saved {len(df_clean)} fire events to {output_file}")
@@ -1,99 +1,128 @@
-import xarray as xr
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from pathlib import Path
+from tqdm import tqdm
+
+from helpers.augmentation import augment
+from helpers.dtype_policy import compact_frame
+from helpers.era5_store import open_era5
+from helpers.labeled_cells import ReservoirSample, feature_columns, iter_labeled_blocks
+from helpers.preprocessing_artifact import BUNDLE_NAME, is_cache_hit, save_artifact
+from helpers.profiling import profile_stage
 
 # === Configuration ===
 INPUT_FILE = Path("data/dataset/labeled_era5_2023.nc").resolve()
 FIRE_TARGET = 10_000
 NO_FIRE_TARGET = 10_000
+# "noise": resample fires with Gaussian jitter, "smote": interpolate between neighbouring fires,
+# "class_weight": keep the real fires only and let the models' class_weight="balanced" compensate
+AUGMENT_STRATEGY = "noise"
 NOISE_STD_FRACTION = 0.05  # 5% of std dev for augmentation
+SMOTE_K_NEIGHBORS = 5
 OUTPUT_DIR = Path("preprocessed_data")
+TIME_BLOCK_HOURS = 24 * 7  # Hours of the cube held in memory at once
+RANDOM_STATE = 42
+
+# Everything that changes the outputs for the same input; part of the cache key
+CONFIG = {
+    "fire_target": FIRE_TARGET,
+    "no_fire_target": NO_FIRE_TARGET,
+    "augment_strategy": AUGMENT_STRATEGY,
+    "noise_std_fraction": NOISE_STD_FRACTION,
+    "smote_k_neighbors": SMOTE_K_NEIGHBORS,
+    "time_block_hours": TIME_BLOCK_HOURS,  # reservoir draws depend on the block layout
+    "test_size": 0.2,
+    "random_state": RANDOM_STATE,
+}
 
 # === Confirm file path ===
 print(f"📁 Resolved path: {INPUT_FILE}")
 print(f"📦 File exists: {INPUT_FILE.exists()}")
 
-# === Load and convert to DataFrame ===
-print("📦 Loading NetCDF file...")
-ds = xr.open_dataset(INPUT_FILE)
-df = ds.to_dataframe().reset_index()
-
-print(f"📊 Initial shape: {df.shape}")
-df = df.dropna()
-print(f"✅ After dropping NaNs: {df.shape}")
-
-# === Rename fire_label to fire ===
-df = df.rename(columns={"fire_label": "fire"})
-
-# === Separate fire vs no-fire classes ===
-fire_df = df[df["fire"] == 1]
-no_fire_df = df[df["fire"] == 0]
-
-print(f"🔥 Fire samples: {len(fire_df)}")
-print(f"❄️  No-fire samples: {len(no_fire_df)}")
-
-# === Smart Oversampling of Fire Samples ===
-print(f"🧪 Augmenting fire samples to {FIRE_TARGET}...")
-
-# Sample fire samples with replacement
-fire_oversampled = fire_df.sample(n=FIRE_TARGET, replace=True, random_state=42)
-
-# Define which columns are features (drop time/location/label)
-drop_cols = ["fire", "time", "latitude", "longitude"]
-fire_features = fire_oversampled.drop(columns=drop_cols)
+if is_cache_hit(OUTPUT_DIR, INPUT_FILE, CONFIG):
+    print(f"✅ Input and config unchanged since the last run; reusing {OUTPUT_DIR}")
+    raise SystemExit(0)
 
-# Filter numeric columns only
-numeric_feature_cols = fire_features.select_dtypes(include=[np.number]).columns
-print("🧪 Injecting noise into columns:", list(numeric_feature_cols))
+# === Stream the labeled cube in time blocks ===
+print("📦 Opening labeled dataset lazily...")
+ds = open_era5(INPUT_FILE)
+numeric_feature_cols = feature_columns(ds)
+print("🧪 Feature columns:", numeric_feature_cols)
 
-# Compute std dev from original fire samples
-feature_stds = fire_df[numeric_feature_cols].std()
-
-# Apply Gaussian noise
-for col in numeric_feature_cols:
-    noise_std = feature_stds[col] * NOISE_STD_FRACTION
-    noise = np.random.normal(loc=0.0, scale=noise_std, size=len(fire_oversampled))
-    fire_oversampled[col] += noise
-
-# === Undersample No-Fire Samples ===
-print(f"📉 Sampling no-fire samples to {NO_FIRE_TARGET}...")
-no_fire_undersampled = no_fire_df.sample(n=NO_FIRE_TARGET, replace=False, random_state=42)
-
-# === Merge and Shuffle ===
-balanced_df = pd.concat([fire_oversampled, no_fire_undersampled])
-balanced_df = balanced_df.sample(frac=1.0, random_state=42).reset_index(drop=True)
-print(f"📦 Final balanced dataset: {balanced_df.shape}")
-
-# === Extract features and labels ===
-X = balanced_df[numeric_feature_cols]
-y = balanced_df["fire"]
+scaler = StandardScaler()
+fire_blocks = []
+no_fire_reservoir = ReservoirSample(NO_FIRE_TARGET, len(numeric_feature_cols), seed=RANDOM_STATE)
+
+n_blocks = int(np.ceil(ds.sizes["time"] / TIME_BLOCK_HOURS))
+with profile_stage("stream_cube") as stage:
+    for X_block, y_block in tqdm(iter_labeled_blocks(ds, numeric_feature_cols, TIME_BLOCK_HOURS), total=n_blocks):
+        # Scaler statistics come from every valid cell, not just the sampled ones
+        if len(X_block):
+            scaler.partial_fit(X_block)
+        fire_blocks.append(X_block[y_block == 1])
+        no_fire_reservoir.add(X_block[y_block == 0])
+        stage.add_rows(rows_in=len(X_block))
+
+    fire_rows = np.concatenate(fire_blocks)
+    no_fire_rows = no_fire_reservoir.sample()
+    stage.rows_out = len(fire_rows) + len(no_fire_rows)
+
+print(f"🔥 Fire samples: {len(fire_rows)}")
+print(f"❄️  No-fire samples: {no_fire_reservoir.seen} (reservoir kept {len(no_fire_rows)})")
+
+# === Balance classes (seeded, vectorized) ===
+print(f"🧪 Augmenting fire samples to {FIRE_TARGET} with the '{AUGMENT_STRATEGY}' strategy...")
+with profile_stage("augment", rows_in=len(fire_rows) + len(no_fire_rows)) as stage:
+    X, y = augment(
+        np.concatenate([fire_rows, no_fire_rows]),
+        np.concatenate([np.ones(len(fire_rows), np.int8), np.zeros(len(no_fire_rows), np.int8)]),
+        strategy=AUGMENT_STRATEGY,
+        fire_target=FIRE_TARGET,
+        no_fire_target=NO_FIRE_TARGET,
+        seed=RANDOM_STATE,
+        noise_std_fraction=NOISE_STD_FRACTION,
+        k_neighbors=SMOTE_K_NEIGHBORS,
+    )
+    stage.rows_out = len(X)
+y = pd.Series(y, name="fire")
+print(f"📦 Final balanced dataset: {len(y)} rows ({int(y.sum())} fire / {int((y == 0).sum())} no-fire)")
 
 # === Normalize features ===
-print("📐 Normalizing features...")
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
+print("📐 Normalizing features with the streamed scaler...")
+X_scaled = scaler.transform(X)
 
 # === Train/Test Split ===
 print("🔀 Splitting train/test sets...")
 X_train, X_test, y_train, y_test = train_test_split(
-    X_scaled, y, test_size=0.2, random_state=42, stratify=y
+    X_scaled, y, test_size=CONFIG["test_size"], random_state=RANDOM_STATE, stratify=y
 )
 
 # === Save Outputs ===
 print("💾 Saving to disk...")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
-train_df = pd.DataFrame(X_train, columns=numeric_feature_cols)
-train_df["fire"] = y_train.values
-train_df.to_parquet(OUTPUT_DIR / "train.parquet")
-
-test_df = pd.DataFrame(X_test, columns=numeric_feature_cols)
-test_df["fire"] = y_test.values
-test_df.to_parquet(OUTPUT_DIR / "test.parquet")
+with profile_stage("write_parquet", rows_in=len(X_scaled)):
+    train_df = pd.DataFrame(X_train, columns=numeric_feature_cols)
+    train_df["fire"] = y_train.values
+    compact_frame(train_df).to_parquet(OUTPUT_DIR / "train.parquet")
+
+    test_df = pd.DataFrame(X_test, columns=numeric_feature_cols)
+    test_df["fire"] = y_test.values
+    compact_frame(test_df).to_parquet(OUTPUT_DIR / "test.parquet")
+
+# Inference must scale features exactly as training did; written last so it marks a complete run
+save_artifact(
+    OUTPUT_DIR,
+    scaler,
+    numeric_feature_cols,
+    {col: ds[col].dtype for col in numeric_feature_cols},
+    INPUT_FILE,
+    CONFIG,
+)
 
 print("✅ Preprocessing complete.")
 print(f"📁 Train saved to: {OUTPUT_DIR / 'train.parquet'}")
 print(f"📁 Test saved to: {OUTPUT_DIR / 'test.parquet'}")
+print(f"📁 Scaler and feature schema saved to: {OUTPUT_DIR / BUNDLE_NAME}")
@@ -0,0 +1,60 @@
+import os
+
+import pandas as pd
+
+from helpers.dtype_policy import (
+    dataset_frame_bytes, frame_bytes, memory_report, naive_frame, read_fire_csv
+)
+from helpers.era5_store import open_era5
+
+# Artifacts of the 2023 pipeline, in stage order; missing ones are left out of the report
+CSV_STAGES = {
+    "filter → portugal_fires.csv": "data/portugal_fires.csv",
+    "prepare → cleaned_fire_events_2023.csv": "data/fires/cleaned_fire_events_2023.csv",
+}
+CUBE_STAGES = {
+    "merge → era5_portugal.zarr": "data/era5/era5_portugal.zarr",
+    "features → era5_features.zarr": "data/era5/era5_features.zarr",
+    "label → labeled_era5_2023.nc": "data/dataset/labeled_era5_2023.nc",
+}
+PARQUET_STAGES = {
+    "generate → fire_risk_training_data.parquet": "data/fire_risk_training_data.parquet",
+    "preprocess → train.parquet": "preprocessed_data/train.parquet",
+    "preprocess → test.parquet": "preprocessed_data/test.parquet",
+}
+OUTPUT_PATH = "outputs/dtype_memory_report.csv"
+
+stages = {}
+
+# CSVs: pandas' default read vs the policy read
+for name, path in CSV_STAGES.items():
+    if os.path.exists(path):
+        print(f"📄 Measuring {path}...")
+        compact = read_fire_csv(path)
+        stages[name] = (len(compact), frame_bytes(pd.read_csv(path)), frame_bytes(compact))
+
+# Cubes: one row per (time, lat, lon) cell, counted from shapes without loading the data
+for name, path in CUBE_STAGES.items():
+    if os.path.exists(path):
+        print(f"🧊 Measuring {path}...")
+        ds = open_era5(path)
+        n_cells = ds.sizes["time"] * ds.sizes["latitude"] * ds.sizes["longitude"]
+        stages[name] = (n_cells, dataset_frame_bytes(ds, compact=False), dataset_frame_bytes(ds))
+
+# Parquet: written with the policy already, compared with the same frame at default dtypes
+for name, path in PARQUET_STAGES.items():
+    if os.path.exists(path):
+        print(f"📦 Measuring {path}...")
+        df = pd.read_parquet(path)
+        stages[name] = (len(df), frame_bytes(naive_frame(df)), frame_bytes(df))
+
+report = memory_report(stages)
+os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+report.to_csv(OUTPUT_PATH, index=False)
+
+print("\n📊 Memory per stage (naive dtypes → policy dtypes):\n")
+print(report.to_string(index=False, float_format=lambda v: f"{v:,.1f}"))
+total_naive, total_compact = report["naive_mb"].sum(), report["compact_mb"].sum()
+print(f"\n✅ Total: {total_naive:,.1f} MB → {total_compact:,.1f} MB "
+      f"({100 * (1 - total_compact / total_naive):.0f}% less)")
+print(f"💾 Report saved to: {OUTPUT_PATH}")
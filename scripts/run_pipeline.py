@@ -0,0 +1,83 @@
+import os
+
+from helpers.pipeline import Pipeline, Stage
+
+# === Configuration ===
+MANIFEST_PATH = ".pipeline/manifest.json"  # Cache keys, output signatures and per-stage logs live here
+MAX_PARALLEL_STAGES = 3
+
+# Set PIPELINE_STAGES=label,preprocess to run only those stages (and anything upstream of them),
+# PIPELINE_FORCE=1 to ignore the cache and PIPELINE_DRY_RUN=1 to only report what would run.
+TARGETS = [s for s in os.environ.get("PIPELINE_STAGES", "").split(",") if s]
+FORCE = os.environ.get("PIPELINE_FORCE") == "1"
+DRY_RUN = os.environ.get("PIPELINE_DRY_RUN") == "1"
+
+# Inputs written by another stage make it a dependency; everything else runs concurrently
+STAGES = [
+    Stage(
+        "filter", "filter_portugal_fires.py",
+        inputs=["data/fire_nrt_*.csv"],
+        outputs=["data/portugal_fires.csv"],
+    ),
+    Stage(
+        "prepare", "prepare_fire_data.py",
+        inputs=["data/fires/modis_2023_Portugal.csv"],
+        outputs=["data/fires/cleaned_fire_events_2023.csv"],
+    ),
+    Stage(
+        "merge", "merge_era5_data_into_dataset.py",
+        inputs=["data/era5/multi"],
+        outputs=["data/era5/era5_portugal.zarr"],
+    ),
+    Stage(
+        "features", "engineer_era5_features.py",
+        inputs=["data/era5/era5_portugal.zarr"],
+        outputs=["data/era5/era5_features.zarr"],
+    ),
+    Stage(
+        "label", "label_fire_events_from_modis.py",
+        inputs=["data/era5/era5_features.zarr", "data/fires/cleaned_fire_events_2023.csv"],
+        outputs=["data/dataset/labeled_era5_2023.nc"],
+    ),
+    Stage(
+        "preprocess", "preprocess_wildfire_data.py",
+        inputs=["data/dataset/labeled_era5_2023.nc"],
+        outputs=["preprocessed_data/train.parquet", "preprocessed_data/test.parquet",
+                 "preprocessed_data/preprocessing.joblib"],
+    ),
+    Stage(
+        "train_random_forest", "training_algorithms/train_random_forest.py",
+        inputs=["preprocessed_data/train.parquet", "preprocessed_data/test.parquet",
+                "preprocessed_data/preprocessing.joblib"],
+        outputs=["randomForestResults/random_forest_fire_model.pkl",
+                 "randomForestResults/random_forest_fire_model.metrics.json",
+                 "randomForestResults/random_forest_fire_model.forest"],
+    ),
+    Stage(
+        "train_logistic", "training_algorithms/train_fire_classifier.py",
+        inputs=["preprocessed_data/train.parquet", "preprocessed_data/test.parquet",
+                "preprocessed_data/preprocessing.joblib"],
+        outputs=["logistic_fire_model.pkl", "logistic_fire_model.metrics.json"],
+    ),
+    Stage(
+        "risk_map", "predict_fire_risk_map.py",
+        inputs=["data/era5/era5_features.zarr", "randomForestResults/random_forest_fire_model.forest",
+                "preprocessed_data/preprocessing.joblib"],
+        outputs=["data/risk/fire_risk_2023.zarr"],
+    ),
+    Stage(
+        "fire_map", "map_portugal_fires.py",
+        inputs=["data/portugal_fires.csv"],
+        outputs=["outputs/portugal_fires_map.html"],
+    ),
+]
+
+pipeline = Pipeline(STAGES, manifest_path=MANIFEST_PATH, max_workers=MAX_PARALLEL_STAGES)
+print(f"🧭 Pipeline: {len(STAGES)} stages, up to {MAX_PARALLEL_STAGES} at once"
+      + (" (dry run)" if DRY_RUN else ""))
+status = pipeline.run(TARGETS, force=FORCE, dry_run=DRY_RUN)
+
+counts = {s: list(status.values()).count(s) for s in sorted(set(status.values()))}
+print("📊 " + ", ".join(f"{n} {s}" for s, n in counts.items()))
+if any(s in ("failed", "blocked") for s in status.values()):
+    raise SystemExit(1)
@@ -0,0 +1,47 @@
+import asyncio
+from pathlib import Path
+
+from helpers.feature_grid import FeatureGrid
+from helpers.preprocessing_artifact import load_artifact
+from helpers.risk_inference import load_model
+from helpers.risk_service import RiskService
+
+# === Configuration ===
+HOST = "127.0.0.1"
+PORT = 8765
+FEATURES_PATH = Path("data/era5/era5_features.zarr")
+GRID_CACHE_DIR = Path("data/risk/feature_grid")  # Memory-mapped copy of the features, rebuilt when the store changes
+MODEL_PATH = Path("randomForestResults/random_forest_fire_model.forest")  # or a .pkl model
+PREPROCESSING_DIR = Path("preprocessed_data")
+
+MAX_BATCH_ROWS = 4096  # Rows scored per predict_proba call
+MAX_WAIT_MS = 2.0      # How long the first request of a batch waits for others to join
+N_JOBS = 1             # Forest threads per batch; batches are small, so threading rarely pays off
+
+# === Load everything once ===
+print(f"📦 Loading model: {MODEL_PATH}")
+model = load_model(MODEL_PATH, n_jobs=N_JOBS)
+
+preprocessing = load_artifact(PREPROCESSING_DIR)
+feature_cols = list(preprocessing["feature_cols"])
+grid = FeatureGrid.load_or_build(FEATURES_PATH, GRID_CACHE_DIR, feature_cols)
+print(f"🗺️  Grid: {len(grid.times)} hours × {len(grid.latitudes)}×{len(grid.longitudes)} cells, "
+      f"{grid.times[0]} → {grid.times[-1]}")
+
+service = RiskService(model, preprocessing["scaler"], feature_cols, grid, MAX_BATCH_ROWS, MAX_WAIT_MS)
+
+
+async def main():
+    server = await service.start(HOST, PORT)
+    print(f"🔥 Serving fire risk on http://{HOST}:{PORT}")
+    print("   GET /risk?lat=40.2&lon=-8.4&time=2023-08-01T14:00")
+    print("   GET /risk/bbox?lat_min=39&lat_max=41&lon_min=-9&lon_max=-7&time=2023-08-01T14:00")
+    print("   GET /health")
+    async with server:
+        await server.serve_forever()
+
+
+try:
+    asyncio.run(main())
+except KeyboardInterrupt:
+    print("\n👋 Stopped.")
@@ -1,3 +1,5 @@
+import sys
+import time
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -10,20 +12,30 @@ import joblib
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.model_benchmark import save_metrics
+from helpers.preprocessing_artifact import read_feature_cols
+
 # === Load Data ===
 data_dir = Path("preprocessed_data")
 train_df = pd.read_parquet(data_dir / "train.parquet")
 test_df = pd.read_parquet(data_dir / "test.parquet")
 
-X_train = train_df.drop(columns=["fire"])
+# Column order recorded by preprocessing, so the model sees features in the order inference uses
+feature_cols = read_feature_cols(data_dir)
+print("🧪 Features:", feature_cols)
+
+X_train = train_df[feature_cols]
 y_train = train_df["fire"]
-X_test = test_df.drop(columns=["fire"])
+X_test = test_df[feature_cols]
 y_test = test_df["fire"]
 
 # === Train Model ===
 print("🚂 Training logistic regression...")
 model = LogisticRegression(max_iter=1000, class_weight="balanced", random_state=42)
+started = time.perf_counter()
 model.fit(X_train, y_train)
+fit_seconds = time.perf_counter() - started
 
 # === Predict ===
 print("🔍 Evaluating...")
@@ -65,5 +77,6 @@ plt.close()
 
 # === Save Model ===
 joblib.dump(model, "logistic_fire_model.pkl")
+save_metrics("logistic_fire_model.pkl", fit_seconds=fit_seconds, roc_auc=roc_auc_score(y_test, y_prob))
 print("\n💾 Model saved as 'logistic_fire_model.pkl'")
 print("📈 Plots saved: confusion_matrix.png, feature_importance.png")
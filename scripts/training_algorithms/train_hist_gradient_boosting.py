@@ -0,0 +1,130 @@
+import sys
+import time
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.inspection import permutation_importance
+from sklearn.metrics import (
+    classification_report, confusion_matrix, roc_auc_score,
+    precision_score, recall_score, f1_score, accuracy_score
+)
+import matplotlib.pyplot as plt
+import seaborn as sns
+import joblib
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.model_benchmark import compare_models, read_metrics, save_metrics
+from helpers.preprocessing_artifact import read_feature_cols
+
+# === Paths ===
+data_dir = Path("preprocessed_data")
+output_dir = Path("histGradientBoostingResults")
+output_dir.mkdir(parents=True, exist_ok=True)
+
+# Existing models to compare against, when they have been trained
+OTHER_MODELS = {
+    "random_forest": Path("randomForestResults/random_forest_fire_model.pkl"),
+    "logistic": Path("logistic_fire_model.pkl"),
+}
+THROUGHPUT_ROWS = 1_000_000  # Rows scored per model when measuring predict speed
+
+# === Load Data ===
+train_df = pd.read_parquet(data_dir / "train.parquet")
+test_df = pd.read_parquet(data_dir / "test.parquet")
+
+feature_cols = read_feature_cols(data_dir)
+print("🧪 Features:", feature_cols)
+
+X_train = train_df[feature_cols]
+y_train = train_df["fire"]
+X_test = test_df[feature_cols]
+y_test = test_df["fire"]
+
+# === Train Histogram Gradient Boosting ===
+# Missing values are routed natively at each split, so NaN cells need no imputation;
+# boosting stops once 10 rounds pass without improving the held-out 10% validation loss.
+print("🚀 Training Histogram Gradient Boosting Classifier...")
+hgb_model = HistGradientBoostingClassifier(
+    learning_rate=0.1,
+    max_iter=500,
+    max_leaf_nodes=31,
+    min_samples_leaf=20,
+    class_weight="balanced",
+    early_stopping=True,
+    validation_fraction=0.1,
+    n_iter_no_change=10,
+    random_state=42,
+)
+started = time.perf_counter()
+hgb_model.fit(X_train, y_train)
+fit_seconds = time.perf_counter() - started
+print(f"✅ Fitted {hgb_model.n_iter_} boosting rounds in {fit_seconds:.1f}s")
+
+# === Predict & Evaluate ===
+y_pred = hgb_model.predict(X_test)
+y_prob = hgb_model.predict_proba(X_test)[:, 1]
+
+print("\n📊 Classification Report:\n")
+print(classification_report(y_test, y_pred))
+
+print("🔥 ROC AUC:", roc_auc_score(y_test, y_prob))
+print("✅ Accuracy:", accuracy_score(y_test, y_pred))
+print("🎯 Precision:", precision_score(y_test, y_pred))
+print("🔁 Recall:", recall_score(y_test, y_pred))
+print("📦 F1 Score:", f1_score(y_test, y_pred))
+
+# === Confusion Matrix ===
+cm = confusion_matrix(y_test, y_pred)
+sns.heatmap(cm, annot=True, fmt="d", cmap="Oranges")
+plt.title("Hist Gradient Boosting - Confusion Matrix")
+plt.xlabel("Predicted")
+plt.ylabel("Actual")
+plt.tight_layout()
+plt.savefig(output_dir / "confusion_matrix_hgb.png")
+plt.close()
+
+# === Feature Importance Plot ===
+# Boosted trees have no impurity importances; use the drop in test ROC AUC when a feature is shuffled
+importances = permutation_importance(
+    hgb_model, X_test, y_test, scoring="roc_auc", n_repeats=5, random_state=42
+).importances_mean
+features = X_train.columns
+indices = np.argsort(importances)[::-1]
+
+plt.figure(figsize=(10, 6))
+sns.barplot(x=importances[indices], y=features[indices])
+plt.title("🔍 Hist Gradient Boosting Permutation Importance")
+plt.xlabel("Mean ROC AUC Decrease")
+plt.tight_layout()
+plt.savefig(output_dir / "feature_importance_hgb.png")
+plt.close()
+
+# === Save Model ===
+model_path = output_dir / "hist_gradient_boosting_fire_model.pkl"
+joblib.dump(hgb_model, model_path)
+save_metrics(model_path, fit_seconds=fit_seconds, roc_auc=roc_auc_score(y_test, y_prob))
+print(f"\n💾 Model saved as: {model_path}")
+print(f"📈 Plots saved to: {output_dir}")
+
+# === Compare against the existing models ===
+# Fit times are the ones each trainer recorded, so the other models are not refitted here
+models = {"hist_gradient_boosting": hgb_model}
+fit_times = {"hist_gradient_boosting": fit_seconds}
+for name, path in OTHER_MODELS.items():
+    if not path.exists():
+        print(f"⚠️  {path} not found, leaving {name} out of the comparison")
+        continue
+    models[name] = joblib.load(path)
+    recorded = read_metrics(path).get("fit_seconds")
+    if recorded is None:
+        print(f"⚠️  No recorded fit time for {name}; retrain it to fill in fit_seconds")
+    else:
+        fit_times[name] = recorded
+
+report = compare_models(models, X_test, y_test, fit_seconds=fit_times, n_rows=THROUGHPUT_ROWS)
+report_path = output_dir / "model_comparison.csv"
+report.to_csv(report_path, index=False)
+print("\n📊 Model comparison:\n")
+print(report.to_string(index=False, float_format=lambda v: f"{v:,.4f}"))
+print(f"\n💾 Comparison saved to: {report_path}")
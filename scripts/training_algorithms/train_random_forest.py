@@ -1,3 +1,6 @@
+import os
+import sys
+import time
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -10,6 +13,18 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import joblib
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from helpers.flat_forest import FlatForest
+from helpers.hyperparameter_search import SEARCH_SPACES, leaderboard, run_search, write_leaderboard
+from helpers.model_benchmark import save_metrics
+from helpers.preprocessing_artifact import read_feature_cols
+
+# RF_SEARCH=1: successive-halving search over forest and logistic parameters instead of the
+# fixed forest below; the best forest is then evaluated and saved as usual.
+SEARCH_MODE = os.environ.get("RF_SEARCH") == "1"
+SEARCH_CANDIDATES = 32  # Configs sampled per model; each round keeps the best third
+SEARCH_CV_FOLDS = 3
+
 # === Paths ===
 data_dir = Path("preprocessed_data")
 output_dir = Path("randomForestResults")
@@ -19,22 +34,48 @@ output_dir.mkdir(parents=True, exist_ok=True)
 train_df = pd.read_parquet(data_dir / "train.parquet")
 test_df = pd.read_parquet(data_dir / "test.parquet")
 
-X_train = train_df.drop(columns=["fire"])
+# Column order recorded by preprocessing, so the model sees features in the order inference uses
+feature_cols = read_feature_cols(data_dir)
+print("🧪 Features:", feature_cols)
+
+X_train = train_df[feature_cols]
 y_train = train_df["fire"]
-X_test = test_df.drop(columns=["fire"])
+X_test = test_df[feature_cols]
 y_test = test_df["fire"]
 
 # === Train Random Forest ===
-print("🌳 Training Random Forest Classifier...")
-rf_model = RandomForestClassifier(
-    n_estimators=200,
-    max_depth=12,
-    min_samples_leaf=5,
-    class_weight="balanced",
-    random_state=42,
-    n_jobs=-1
-)
-rf_model.fit(X_train, y_train)
+if SEARCH_MODE:
+    boards = []
+    for model_name in SEARCH_SPACES:
+        print(f"🔎 Searching {model_name} ({SEARCH_CANDIDATES} candidates, {SEARCH_CV_FOLDS}-fold CV)...")
+        search = run_search(model_name, X_train, y_train, n_candidates=SEARCH_CANDIDATES, cv=SEARCH_CV_FOLDS)
+        print(f"🏅 Best {model_name}: ROC AUC {search.best_score_:.4f} with {search.best_params_}")
+        boards.append(leaderboard(search, model_name))
+        if model_name == "random_forest":
+            best_rf_params = search.best_params_  # Includes the n_estimators it was scored with
+
+    leaderboard_path = output_dir / "leaderboard.csv"
+    write_leaderboard(boards, leaderboard_path)
+    print(f"📋 Leaderboard saved to: {leaderboard_path}")
+
+    print("🌳 Refitting the best Random Forest on the full training set...")
+    rf_model = RandomForestClassifier(**best_rf_params, random_state=42, n_jobs=-1)
+    started = time.perf_counter()
+    rf_model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+else:
+    print("🌳 Training Random Forest Classifier...")
+    rf_model = RandomForestClassifier(
+        n_estimators=200,
+        max_depth=12,
+        min_samples_leaf=5,
+        class_weight="balanced",
+        random_state=42,
+        n_jobs=-1
+    )
+    started = time.perf_counter()
+    rf_model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
 
 # === Predict & Evaluate ===
 y_pred = rf_model.predict(X_test)
@@ -75,5 +116,13 @@ plt.close()
 # === Save Model ===
 model_path = output_dir / "random_forest_fire_model.pkl"
 joblib.dump(rf_model, model_path)
+save_metrics(model_path, fit_seconds=fit_seconds, roc_auc=roc_auc_score(y_test, y_prob))
 print(f"\n💾 Model saved as: {model_path}")
+
+# Node arrays for fast loading and batch scoring (predict_fire_risk_map.py, serve_fire_risk.py)
+flat_path = output_dir / "random_forest_fire_model.forest"
+flat_model = FlatForest.from_sklearn(rf_model, feature_cols=list(X_train.columns))
+flat_model.save(flat_path)
+max_diff = np.abs(FlatForest.load(flat_path).predict_proba(X_test) - rf_model.predict_proba(X_test)).max()
+print(f"💾 Flat forest export saved as: {flat_path} (max probability difference {max_diff:.1e})")
 print(f"📈 Plots saved to: {output_dir}")